@@ -17,6 +17,8 @@ import frappe
 from frappe import _
 from frappe.utils import add_days, add_months, getdate, nowdate
 
+from advanced_compliance.advanced_compliance.utils.cache import invalidate_graph_entity
+
 
 def setup_finance_accounting_data():
 	"""
@@ -62,9 +64,10 @@ def setup_finance_accounting_data():
 		# Re-enable graph sync and rebuild knowledge graph
 		frappe.flags.skip_graph_sync = False
 		print("\n=== Rebuilding Knowledge Graph ===")
-		from advanced_compliance.advanced_compliance.knowledge_graph.sync import rebuild_graph
+		from advanced_compliance.advanced_compliance.knowledge_graph.sync import rebuild_graph_job
 
-		graph_stats = rebuild_graph()
+		# Rebuild inline: the summary reports the rebuilt graph's size
+		graph_stats = rebuild_graph_job(user=frappe.session.user)
 		summary["graph_entities"] = graph_stats.get("entities", 0)
 		summary["graph_relationships"] = graph_stats.get("relationships", 0)
 
@@ -2173,6 +2176,7 @@ def clear_finance_accounting_data():
 	frappe.db.delete("Compliance Graph Path")
 	frappe.db.delete("Compliance Graph Relationship")
 	frappe.db.delete("Compliance Graph Entity")
+	invalidate_graph_entity()
 
 	# Compliance Alerts
 	for name in frappe.get_all("Compliance Alert", pluck="name"):
@@ -0,0 +1,82 @@
+"""
+Compliance Analysis Snapshot DocType Controller.
+
+Stores the latest full coverage analysis per company so dashboards read one
+row instead of re-scanning the knowledge graph on every request.
+"""
+
+import json
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import now_datetime
+
+# Snapshot key used for the analysis without a company filter
+ALL_COMPANIES_KEY = "__all__"
+
+
+class ComplianceAnalysisSnapshot(Document):
+	"""Controller for Compliance Analysis Snapshot DocType."""
+
+	def get_analysis(self):
+		"""Parse analysis_data JSON and return as dict."""
+		if not self.analysis_data:
+			return {}
+
+		try:
+			return json.loads(self.analysis_data)
+		except (json.JSONDecodeError, TypeError):
+			return {}
+
+	@staticmethod
+	def get_snapshot_key(company=None):
+		"""Return the snapshot key for a company filter."""
+		return company or ALL_COMPANIES_KEY
+
+	@staticmethod
+	def get_snapshot(company=None):
+		"""
+		Get the stored snapshot for a company.
+
+		Args:
+		    company: Optional company filter
+
+		Returns:
+		    Compliance Analysis Snapshot document, or None if not generated yet
+		"""
+		key = ComplianceAnalysisSnapshot.get_snapshot_key(company)
+		if not frappe.db.exists("Compliance Analysis Snapshot", key):
+			return None
+
+		return frappe.get_doc("Compliance Analysis Snapshot", key)
+
+	@staticmethod
+	def save_snapshot(company, analysis, graph_version=None):
+		"""
+		Create or replace the snapshot for a company.
+
+		Args:
+		    company: Optional company filter the analysis was run with
+		    analysis: Full coverage analysis dict
+		    graph_version: Graph version token the analysis was computed from
+
+		Returns:
+		    Compliance Analysis Snapshot document
+		"""
+		key = ComplianceAnalysisSnapshot.get_snapshot_key(company)
+		score = analysis.get("compliance_score") or {}
+
+		if frappe.db.exists("Compliance Analysis Snapshot", key):
+			snapshot = frappe.get_doc("Compliance Analysis Snapshot", key)
+		else:
+			snapshot = frappe.new_doc("Compliance Analysis Snapshot")
+			snapshot.snapshot_key = key
+			snapshot.company = company
+
+		snapshot.generated_at = now_datetime()
+		snapshot.graph_version = graph_version
+		snapshot.overall_score = score.get("overall_score")
+		snapshot.grade = score.get("grade")
+		snapshot.analysis_data = json.dumps(analysis, default=str)
+		snapshot.save(ignore_permissions=True)
+		return snapshot
@@ -190,6 +190,12 @@ class ComplianceGraphEntity(Document):
 				"Compliance Graph Entity", entity_name, {"is_active": 0, "modified_at": now_datetime()}
 			)
 
+		if entities:
+			# set_value skips doc events, so bump the graph version here
+			from advanced_compliance.advanced_compliance.utils.cache import bump_graph_version
+
+			bump_graph_version()
+
 	@staticmethod
 	def get_by_type(entity_type, active_only=True):
 		"""
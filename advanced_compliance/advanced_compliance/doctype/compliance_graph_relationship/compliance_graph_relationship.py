@@ -137,6 +137,35 @@ RELATIONSHIP_DEFINITIONS = {
 }
 
 
+def get_vis_edge(relationship):
+	"""
+	Convert relationship fields to vis.js edge format.
+
+	Works on a document or on a row from frappe.get_all, so bulk queries
+	can format edges without loading each document.
+
+	Args:
+	    relationship: Object with name, source_entity, target_entity,
+	        relationship_type and weight attributes
+
+	Returns:
+	    Dict suitable for vis.js network
+	"""
+	definition = RELATIONSHIP_DEFINITIONS.get(relationship.relationship_type, {})
+
+	return {
+		"id": relationship.name,
+		"from": relationship.source_entity,
+		"to": relationship.target_entity,
+		"label": relationship.relationship_type,
+		"arrows": "to",
+		"color": definition.get("edge_color", "#7f8c8d"),
+		"width": max(1, int(relationship.weight * 3)) if relationship.weight else 2,
+		"title": definition.get("description", relationship.relationship_type),
+		"relationship_type": relationship.relationship_type,
+	}
+
+
 class ComplianceGraphRelationship(Document):
 	"""Controller for Compliance Graph Relationship DocType."""
 
@@ -320,6 +349,11 @@ class ComplianceGraphRelationship(Document):
 			{"entity": entity_name, "now": now_datetime()},
 		)
 
+		# Raw UPDATE skips doc events, so bump the graph version here
+		from advanced_compliance.advanced_compliance.utils.cache import bump_graph_version
+
+		bump_graph_version()
+
 	def to_vis_edge(self):
 		"""
 		Convert relationship to vis.js edge format.
@@ -327,16 +361,4 @@ class ComplianceGraphRelationship(Document):
 		Returns:
 		    Dict suitable for vis.js network
 		"""
-		definition = RELATIONSHIP_DEFINITIONS.get(self.relationship_type, {})
-
-		return {
-			"id": self.name,
-			"from": self.source_entity,
-			"to": self.target_entity,
-			"label": self.relationship_type,
-			"arrows": "to",
-			"color": definition.get("edge_color", "#7f8c8d"),
-			"width": max(1, int(self.weight * 3)) if self.weight else 2,
-			"title": definition.get("description", self.relationship_type),
-			"relationship_type": self.relationship_type,
-		}
+		return get_vis_edge(self)
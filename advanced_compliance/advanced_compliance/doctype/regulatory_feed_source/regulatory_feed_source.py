@@ -19,6 +19,7 @@ class RegulatoryFeedSource(Document):
 		"""Validate feed source configuration."""
 		self.validate_url()
 		self.validate_user_agent()
+		self.reset_cache_validators()
 
 	def validate_url(self):
 		"""Validate URL format."""
@@ -49,6 +50,12 @@ class RegulatoryFeedSource(Document):
 				)
 			)
 
+	def reset_cache_validators(self):
+		"""Forget the stored ETag and Last-Modified when the feed URL changes."""
+		if self.has_value_changed("url"):
+			self.etag = None
+			self.last_modified = None
+
 	def sync_now(self):
 		"""
 		Manually trigger sync for this feed source.
@@ -65,9 +72,10 @@ class RegulatoryFeedSource(Document):
 			connector = get_connector(self)
 			count = connector.sync()
 
-			self.db_set("last_sync", now_datetime())
-			self.db_set("last_sync_status", "Success")
-			self.db_set("last_error", None)
+			self.db_set(
+				{"last_sync": now_datetime(), "last_sync_status": "Success", "last_error": None},
+				update_modified=False,
+			)
 
 			return {
 				"success": True,
@@ -75,9 +83,10 @@ class RegulatoryFeedSource(Document):
 				"message": _("{0} new updates synced").format(count),
 			}
 		except Exception as e:
-			self.db_set("last_sync", now_datetime())
-			self.db_set("last_sync_status", "Failed")
-			self.db_set("last_error", str(e)[:500])
+			self.db_set(
+				{"last_sync": now_datetime(), "last_sync_status": "Failed", "last_error": str(e)[:500]},
+				update_modified=False,
+			)
 
 			frappe.log_error(
 				message=frappe.get_traceback(), title=_("Feed Sync Error: {0}").format(self.source_name)
@@ -6,6 +6,14 @@ from frappe import _
 from frappe.model.document import Document
 from frappe.utils import nowdate
 
+# Assessment priority for each Regulatory Change severity
+SEVERITY_PRIORITY_MAP = {
+	"Critical": "Critical",
+	"Major": "High",
+	"Moderate": "Medium",
+	"Minor": "Low",
+}
+
 
 class RegulatoryImpactAssessment(Document):
 	"""
@@ -38,20 +46,7 @@ class RegulatoryImpactAssessment(Document):
 		"""
 		if not self.priority and self.regulatory_change:
 			severity = frappe.db.get_value("Regulatory Change", self.regulatory_change, "severity")
-
-			# Map severity to priority
-			severity_priority_map = {
-				"Critical": "Critical",
-				"Major": "High",
-				"Moderate": "Medium",
-				"Minor": "Low",
-			}
-
-			self.priority = severity_priority_map.get(severity, "Medium")
-
-			# Upgrade priority if gap identified
-			if self.gap_identified and self.priority in ("Medium", "Low"):
-				self.priority = "High"
+			self.priority = get_priority(severity, self.gap_identified)
 
 	def assign_to_control_owner(self):
 		"""
@@ -174,3 +169,23 @@ class RegulatoryImpactAssessment(Document):
 			fields=["name", "control_activity", "impact_type", "priority", "due_date", "confidence_score"],
 			order_by="due_date asc",
 		)
+
+
+def get_priority(severity, gap_identified=False):
+	"""
+	Get assessment priority for a change severity.
+
+	Args:
+		severity: Regulatory Change severity
+		gap_identified: Whether the assessment identified a control gap
+
+	Returns:
+		str: Priority
+	"""
+	priority = SEVERITY_PRIORITY_MAP.get(severity, "Medium")
+
+	# Upgrade priority if gap identified
+	if gap_identified and priority in ("Medium", "Low"):
+		priority = "High"
+
+	return priority
@@ -89,23 +89,9 @@ class RegulatoryUpdate(Document):
 		)
 
 		# Get all changes for this update
-		changes = frappe.get_all("Regulatory Change", filters={"regulatory_update": self.name}, pluck="name")
-
-		all_assessments = []
-
-		for change_name in changes:
-			# Skip if change was deleted (race condition safety)
-			if not frappe.db.exists("Regulatory Change", change_name):
-				frappe.log_error(
-					message=f"Regulatory Change {change_name} does not exist for update {self.name}",
-					title="Impact Analysis Skipped",
-				)
-				continue
-
-			change_doc = frappe.get_doc("Regulatory Change", change_name)
-			mapper = ImpactMapper(change_doc)
-			assessments = mapper.create_impact_assessments()
-			all_assessments.extend(assessments)
+		changes = frappe.get_all("Regulatory Change", filters={"regulatory_update": self.name}, fields=["*"])
+
+		all_assessments = ImpactMapper.create_impact_assessments_bulk(changes, regulatory_update=self)
 
 		if all_assessments:
 			self.status = "Action Required"
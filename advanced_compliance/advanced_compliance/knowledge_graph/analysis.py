@@ -5,11 +5,113 @@ Analyzes the compliance knowledge graph to identify gaps, coverage metrics,
 and orphaned entities. Provides insights for compliance improvement.
 """
 
-import json
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from heapq import nlargest
+from operator import itemgetter
 
 import frappe
 from frappe import _
-from frappe.utils import cint, flt
+from frappe.utils import cint, flt, now_datetime
+
+from advanced_compliance.advanced_compliance.doctype.compliance_analysis_snapshot.compliance_analysis_snapshot import (
+	ComplianceAnalysisSnapshot,
+)
+from advanced_compliance.advanced_compliance.utils.cache import get_cached, get_graph_version
+
+# Relationship types read by the coverage analyzers
+ANALYSIS_RELATIONSHIP_TYPES = ["MITIGATES", "TESTS", "OWNS", "DEPENDS_ON", "PRECEDED_BY"]
+DEPENDENCY_RELATIONSHIP_TYPES = ["DEPENDS_ON", "PRECEDED_BY"]
+
+# Weighted scoring: (score key, weight)
+SCORE_WEIGHTS = (("risk_coverage", 0.40), ("testing_coverage", 0.35), ("ownership_coverage", 0.25))
+
+# Grade lookup: score >= GRADE_THRESHOLDS[i] earns GRADES[i + 1]
+GRADE_THRESHOLDS = (60, 70, 80, 90)
+GRADES = ("F", "D", "C", "B", "A")
+
+# SQL condition matching entities tagged with %(company)s or with no company
+COMPANY_CONDITION = "AND IFNULL(JSON_UNQUOTE(JSON_EXTRACT(e.properties, '$.company')), '') IN ('', %(company)s)"
+
+# Safety-net TTL for cached analysis; graph changes invalidate via version
+ANALYSIS_CACHE_TTL = 600  # 10 minutes
+
+# Worker threads used by get_full_analysis(parallel=True)
+PARALLEL_ANALYSIS_WORKERS = 4
+
+# Entities scanned per batch when looking for orphans
+ORPHAN_SCAN_CHUNK_SIZE = 5000
+
+# Background job timeout for a snapshot refresh
+SNAPSHOT_REFRESH_TIMEOUT = 3600  # 1 hour
+
+
+def get_grade(score):
+	"""
+	Map a compliance score to its letter grade.
+
+	Args:
+	    score: Overall score (0-100)
+
+	Returns:
+	    Letter grade A-F
+	"""
+	return GRADES[bisect_right(GRADE_THRESHOLDS, score)]
+
+
+def _empty_risk_coverage():
+	"""Risk coverage result for a graph with no risks."""
+	return {
+		"total_risks": 0,
+		"fully_covered": 0,
+		"partially_covered": 0,
+		"uncovered": 0,
+		"coverage_percentage": 0.0,
+		"uncovered_risks": [],
+		"partially_covered_risks": [],
+	}
+
+
+def _empty_control_testing():
+	"""Control testing result for a graph with no controls."""
+	return {
+		"total_controls": 0,
+		"tested": 0,
+		"untested": 0,
+		"key_controls_untested": 0,
+		"testing_coverage_percentage": 0.0,
+		"untested_controls": [],
+		"critical_gaps": [],
+	}
+
+
+def _empty_ownership():
+	"""Ownership result for a graph with no controls."""
+	return {
+		"total_controls": 0,
+		"owned": 0,
+		"unowned": 0,
+		"ownership_coverage_percentage": 0.0,
+		"unowned_controls": [],
+		"owner_workload": [],
+	}
+
+
+def _run_analysis_in_thread(site, sites_path, user, method, args):
+	"""
+	Run a CoverageAnalyzer method on its own site connection.
+
+	Frappe connections are not thread-safe, so each worker initializes the
+	site, connects, runs the analyzer and tears the connection down again.
+	"""
+	frappe.init(site=site, sites_path=sites_path)
+	try:
+		frappe.connect()
+		frappe.set_user(user)
+		return getattr(CoverageAnalyzer(), method)(*args)
+	finally:
+		frappe.destroy()
 
 
 class CoverageAnalyzer:
@@ -21,60 +123,248 @@ class CoverageAnalyzer:
 
 		self.query_engine = GraphQueryEngine()
 
-	def analyze_risk_coverage(self, company=None):
+		# Per-instance memo of analyzer results keyed by (analysis, company, include_details).
+		# get_compliance_score and get_full_analysis both need the same
+		# sub-analyses, so each one only hits the database once per instance.
+		self._cache = {}
+
+		# Shared relationship scan (relationship_type -> target -> [sources]),
+		# populated by get_full_analysis so analyzers skip their own queries
+		self._relationships_by_type = None
+
+		# Entity -> company map, built lazily on the first company-filtered call
+		self._entity_company = None
+
+	def _prefetch_relationships(self):
 		"""
-		Analyze how well risks are covered by controls.
+		Load all active analysis relationships in a single query.
+
+		Partitions the rows by relationship type so risk, testing, ownership
+		and dependency analysis share one scan of the relationship table.
+		"""
+		rels = frappe.get_all(
+			"Compliance Graph Relationship",
+			filters={"relationship_type": ["in", ANALYSIS_RELATIONSHIP_TYPES], "is_active": 1},
+			fields=["source_entity", "target_entity", "relationship_type"],
+		)
+
+		relationships_by_type = {rel_type: {} for rel_type in ANALYSIS_RELATIONSHIP_TYPES}
+		for rel in rels:
+			sources_map = relationships_by_type[rel.relationship_type]
+			if rel.target_entity not in sources_map:
+				sources_map[rel.target_entity] = []
+			sources_map[rel.target_entity].append(rel.source_entity)
+
+		self._relationships_by_type = relationships_by_type
+
+	def _has_entities(self, entity_types=None, company=None):
+		"""
+		Check whether any active entity exists, optionally scoped.
 
 		Args:
+		    entity_types: Optional list of entity types to restrict to
 		    company: Optional company filter
 
 		Returns:
-		    Dict with coverage metrics and gap details
+		    True if at least one matching active entity exists
 		"""
-		# Get all risks
-		risk_filters = {"is_active": 1, "entity_type": "Risk"}
-		risks = frappe.get_all(
-			"Compliance Graph Entity",
-			filters=risk_filters,
-			fields=["name", "entity_id", "entity_label", "properties"],
+		conditions = COMPANY_CONDITION if company else ""
+		if entity_types:
+			conditions += " AND e.entity_type IN %(entity_types)s"
+
+		return bool(
+			frappe.db.sql(
+				f"""
+				SELECT 1 FROM `tabCompliance Graph Entity` e
+				WHERE e.is_active = 1 {conditions}
+				LIMIT 1
+			""",
+				{"company": company, "entity_types": tuple(entity_types or ())},
+			)
 		)
 
-		# MEDIUM PRIORITY FIX: Batch load all MITIGATES relationships to avoid N+1 queries
-		# Before: N queries (one per risk), After: 1 query total
-		all_mitigates = frappe.get_all(
+	def _cached(self, analysis, impl, company, include_details=True):
+		"""Return memoized result of an analyzer, computing it on first use."""
+		# A detailed result also satisfies a summary-only request
+		detailed_key = (analysis, company, True)
+		if not include_details and detailed_key in self._cache:
+			return self._cache[detailed_key]
+
+		key = (analysis, company, include_details)
+		if key not in self._cache:
+			self._cache[key] = impl(company, include_details)
+		return self._cache[key]
+
+	def _get_entity_companies(self):
+		"""
+		Map entity name -> company for entities tagged with a company.
+
+		The company property is extracted from the properties JSON in one
+		query per analyzer instance and reused by every analyzer, instead of
+		each analyzer's query decoding it again.
+
+		Returns:
+		    Dict of entity name -> company
+		"""
+		if self._entity_company is None:
+			self._entity_company = dict(
+				frappe.db.sql(
+					"""
+					SELECT name, JSON_UNQUOTE(JSON_EXTRACT(properties, '$.company'))
+					FROM `tabCompliance Graph Entity`
+					WHERE is_active = 1
+						AND JSON_EXTRACT(properties, '$.company') IS NOT NULL
+				"""
+				)
+			)
+		return self._entity_company
+
+	def _get_entities_with_counts(self, entity_type, relationship_type, company=None):
+		"""
+		Fetch active entities of a type with their incoming relationship count.
+
+		Counting is done by the database so only one row per entity is
+		transferred instead of every relationship row.
+
+		Args:
+		    entity_type: Entity type to fetch (Risk, Control, ...)
+		    relationship_type: Incoming relationship type to count
+		    company: Optional company filter; entities without a company match any
+
+		Returns:
+		    List of dicts with name, entity_id, entity_label, rel_count
+		"""
+		params = {"entity_type": entity_type, "relationship_type": relationship_type}
+
+		if self._relationships_by_type is not None:
+			# Count from the shared relationship scan instead of joining again
+			sources_map = self._relationships_by_type[relationship_type]
+			entities = frappe.db.sql(
+				"""
+				SELECT e.name, e.entity_id, e.entity_label
+				FROM `tabCompliance Graph Entity` e
+				WHERE e.entity_type = %(entity_type)s
+					AND e.is_active = 1
+			""",
+				params,
+				as_dict=True,
+			)
+			for entity in entities:
+				entity.rel_count = len(sources_map.get(entity.name, ()))
+		else:
+			entities = frappe.db.sql(
+				"""
+				SELECT
+					e.name,
+					e.entity_id,
+					e.entity_label,
+					COUNT(r.name) AS rel_count
+				FROM `tabCompliance Graph Entity` e
+				LEFT JOIN `tabCompliance Graph Relationship` r
+					ON r.target_entity = e.name
+					AND r.relationship_type = %(relationship_type)s
+					AND r.is_active = 1
+				WHERE e.entity_type = %(entity_type)s
+					AND e.is_active = 1
+				GROUP BY e.name
+			""",
+				params,
+				as_dict=True,
+			)
+
+		if company:
+			entity_company = self._get_entity_companies()
+			entities = [e for e in entities if entity_company.get(e.name) in (None, "", company)]
+
+		return entities
+
+	def _get_relationship_sources(self, relationship_type, targets):
+		"""
+		Map target entities to the sources of their incoming relationships.
+
+		Args:
+		    relationship_type: Relationship type to load
+		    targets: Target entity names to load sources for
+
+		Returns:
+		    Dict of target entity -> list of source entities
+		"""
+		if not targets:
+			return {}
+
+		if self._relationships_by_type is not None:
+			sources_map = self._relationships_by_type[relationship_type]
+			return {target: sources_map[target] for target in targets if target in sources_map}
+
+		rels = frappe.get_all(
 			"Compliance Graph Relationship",
-			filters={"relationship_type": "MITIGATES", "is_active": 1},
+			filters={
+				"relationship_type": relationship_type,
+				"is_active": 1,
+				"target_entity": ["in", list(targets)],
+			},
 			fields=["source_entity", "target_entity"],
 		)
 
-		# Build map: risk_entity -> [control_entities]
-		risk_controls_map = {}
-		for rel in all_mitigates:
-			if rel.target_entity not in risk_controls_map:
-				risk_controls_map[rel.target_entity] = []
-			risk_controls_map[rel.target_entity].append(rel.source_entity)
+		sources_map = {}
+		for rel in rels:
+			if rel.target_entity not in sources_map:
+				sources_map[rel.target_entity] = []
+			sources_map[rel.target_entity].append(rel.source_entity)
+
+		return sources_map
+
+	def analyze_risk_coverage(self, company=None, include_details=True):
+		"""
+		Analyze how well risks are covered by controls.
+
+		Args:
+		    company: Optional company filter
+		    include_details: Include per-risk lists; when False only counts are returned
+
+		Returns:
+		    Dict with coverage metrics and gap details
+		"""
+		return self._cached("risk", self._analyze_risk_coverage_impl, company, include_details)
+
+	def _analyze_risk_coverage_impl(self, company=None, include_details=True):
+		"""Compute risk coverage metrics (uncached)."""
+		# Get all risks with their MITIGATES count in one aggregated query
+		risks = self._get_entities_with_counts("Risk", "MITIGATES", company)
+		if not risks:
+			return _empty_risk_coverage()
+
+		if not include_details:
+			# Summary only: count coverage buckets without building per-risk dicts
+			uncovered = partially = 0
+			for risk in risks:
+				control_count = cint(risk.rel_count)
+				if control_count == 0:
+					uncovered += 1
+				elif control_count == 1:
+					partially += 1
+
+			total_risks = len(risks)
+			return {
+				"total_risks": total_risks,
+				"fully_covered": total_risks - uncovered - partially,
+				"partially_covered": partially,
+				"uncovered": uncovered,
+				"coverage_percentage": flt((total_risks - uncovered) / total_risks * 100, 2),
+			}
 
 		covered_risks = []
 		uncovered_risks = []
 		partially_covered = []
 
 		for risk in risks:
-			# Check if company filter applies
-			if company:
-				props = json.loads(risk.properties or "{}")
-				if props.get("company") and props.get("company") != company:
-					continue
-
-			# Get mitigating controls from map (no query!)
-			mitigating_controls = risk_controls_map.get(risk.name, [])
-			control_count = len(mitigating_controls)
+			control_count = cint(risk.rel_count)
 
 			risk_info = {
 				"entity": risk.name,
 				"risk_id": risk.entity_id,
 				"label": risk.entity_label,
 				"control_count": control_count,
-				"controls": mitigating_controls,
 			}
 
 			if control_count == 0:
@@ -84,6 +374,13 @@ class CoverageAnalyzer:
 			else:
 				covered_risks.append(risk_info)
 
+		# Only covered risks have controls to list
+		controls_map = self._get_relationship_sources(
+			"MITIGATES", [r["entity"] for r in covered_risks + partially_covered]
+		)
+		for risk_info in covered_risks + partially_covered + uncovered_risks:
+			risk_info["controls"] = controls_map.get(risk_info["entity"], [])
+
 		total_risks = len(covered_risks) + len(uncovered_risks) + len(partially_covered)
 		coverage_percentage = 0.0
 		if total_risks > 0:
@@ -99,71 +396,70 @@ class CoverageAnalyzer:
 			"partially_covered_risks": partially_covered,
 		}
 
-	def analyze_control_testing(self, company=None):
+	def analyze_control_testing(self, company=None, include_details=True):
 		"""
 		Analyze how well controls are tested.
 
 		Args:
 		    company: Optional company filter
+		    include_details: Include per-control lists; when False only counts are returned
 
 		Returns:
 		    Dict with testing coverage metrics
 		"""
-		# Get all controls
-		control_filters = {"is_active": 1, "entity_type": "Control"}
-		controls = frappe.get_all(
-			"Compliance Graph Entity",
-			filters=control_filters,
-			fields=["name", "entity_id", "entity_label", "properties"],
-		)
-
-		# MEDIUM PRIORITY FIX: Batch load all TESTS relationships to avoid N+1 queries
-		# Before: N queries (one per control), After: 1 query total
-		all_tests = frappe.get_all(
-			"Compliance Graph Relationship",
-			filters={"relationship_type": "TESTS", "is_active": 1},
-			fields=["source_entity", "target_entity"],
-		)
-
-		# Build map: control_entity -> [test_entities]
-		control_tests_map = {}
-		for rel in all_tests:
-			if rel.target_entity not in control_tests_map:
-				control_tests_map[rel.target_entity] = []
-			control_tests_map[rel.target_entity].append(rel.source_entity)
+		return self._cached("testing", self._analyze_control_testing_impl, company, include_details)
+
+	def _analyze_control_testing_impl(self, company=None, include_details=True):
+		"""Compute control testing metrics (uncached)."""
+		# Get all controls with their TESTS count in one aggregated query
+		controls = self._get_entities_with_counts("Control", "TESTS", company)
+		if not controls:
+			return _empty_control_testing()
+
+		if not include_details:
+			# Summary only: count without building per-control dicts
+			untested = [control.name for control in controls if not cint(control.rel_count)]
+			key_flags = self._get_key_control_flags(untested)
+			total_controls = len(controls)
+			return {
+				"total_controls": total_controls,
+				"tested": total_controls - len(untested),
+				"untested": len(untested),
+				"key_controls_untested": sum(1 for name in untested if key_flags.get(name)),
+				"testing_coverage_percentage": flt((total_controls - len(untested)) / total_controls * 100, 2),
+			}
 
 		tested_controls = []
 		untested_controls = []
-		key_controls_untested = []
 
 		for control in controls:
-			# Check company filter
-			if company:
-				props = json.loads(control.properties or "{}")
-				if props.get("company") and props.get("company") != company:
-					continue
-
-			# Get testing evidence from map (no query!)
-			testing_evidence = control_tests_map.get(control.name, [])
-
-			props = json.loads(control.properties or "{}")
-			is_key = props.get("is_key_control", False)
+			evidence_count = cint(control.rel_count)
 
 			control_info = {
 				"entity": control.name,
 				"control_id": control.entity_id,
 				"label": control.entity_label,
-				"is_key_control": is_key,
-				"evidence_count": len(testing_evidence),
-				"evidence": testing_evidence,
+				"is_key_control": False,
+				"evidence_count": evidence_count,
 			}
 
-			if len(testing_evidence) > 0:
+			if evidence_count > 0:
 				tested_controls.append(control_info)
 			else:
 				untested_controls.append(control_info)
-				if is_key:
-					key_controls_untested.append(control_info)
+
+		# Only untested controls need the key-control flag
+		key_flags = self._get_key_control_flags([c["entity"] for c in untested_controls])
+		key_controls_untested = []
+		for control_info in untested_controls:
+			control_info["is_key_control"] = key_flags.get(control_info["entity"], False)
+			if control_info["is_key_control"]:
+				key_controls_untested.append(control_info)
+
+		# Only tested controls have evidence to list
+		evidence_map = self._get_relationship_sources("TESTS", [c["entity"] for c in tested_controls])
+		for control_info in tested_controls + untested_controls:
+			control_info["evidence"] = evidence_map.get(control_info["entity"], [])
 
 		total_controls = len(tested_controls) + len(untested_controls)
 		testing_coverage = 0.0
@@ -180,53 +476,51 @@ class CoverageAnalyzer:
 			"critical_gaps": key_controls_untested,
 		}
 
-	def analyze_ownership(self, company=None):
+	def analyze_ownership(self, company=None, include_details=True):
 		"""
 		Analyze control ownership coverage.
 
 		Args:
 		    company: Optional company filter
+		    include_details: Include per-control lists and owner workload;
+		        when False only counts are returned
 
 		Returns:
 		    Dict with ownership metrics
 		"""
-		# Get all controls
-		control_filters = {"is_active": 1, "entity_type": "Control"}
-		controls = frappe.get_all(
-			"Compliance Graph Entity",
-			filters=control_filters,
-			fields=["name", "entity_id", "entity_label", "properties"],
-		)
+		return self._cached("ownership", self._analyze_ownership_impl, company, include_details)
+
+	def _analyze_ownership_impl(self, company=None, include_details=True):
+		"""Compute control ownership metrics (uncached)."""
+		# Get all controls with their OWNS count in one aggregated query
+		controls = self._get_entities_with_counts("Control", "OWNS", company)
+		if not controls:
+			return _empty_ownership()
+
+		if not include_details:
+			# Summary only: count without building per-control dicts
+			owned = sum(1 for control in controls if cint(control.rel_count))
+			total_controls = len(controls)
+			return {
+				"total_controls": total_controls,
+				"owned": owned,
+				"unowned": total_controls - owned,
+				"ownership_coverage_percentage": flt(owned / total_controls * 100, 2),
+			}
 
 		owned_controls = []
 		unowned_controls = []
-		owner_workload = {}
 
 		for control in controls:
-			# Check company filter
-			if company:
-				props = json.loads(control.properties or "{}")
-				if props.get("company") and props.get("company") != company:
-					continue
-
-			# Get ownership relationships
-			ownership = frappe.get_all(
-				"Compliance Graph Relationship",
-				filters={"target_entity": control.name, "relationship_type": "OWNS", "is_active": 1},
-				fields=["source_entity"],
-			)
-
 			control_info = {
 				"entity": control.name,
 				"control_id": control.entity_id,
 				"label": control.entity_label,
-				"owner_count": len(ownership),
+				"owner_count": cint(control.rel_count),
 			}
 
-			if len(ownership) > 0:
+			if control_info["owner_count"] > 0:
 				owned_controls.append(control_info)
-				for own in ownership:
-					owner_workload[own.source_entity] = owner_workload.get(own.source_entity, 0) + 1
 			else:
 				unowned_controls.append(control_info)
 
@@ -235,11 +529,7 @@ class CoverageAnalyzer:
 		if total_controls > 0:
 			ownership_coverage = flt(len(owned_controls) / total_controls * 100, 2)
 
-		# Convert workload to list
-		workload_list = [
-			{"owner": k, "control_count": v}
-			for k, v in sorted(owner_workload.items(), key=lambda x: x[1], reverse=True)
-		]
+		workload_list = self._get_owner_workload([c["entity"] for c in owned_controls])
 
 		return {
 			"total_controls": total_controls,
@@ -250,6 +540,64 @@ class CoverageAnalyzer:
 			"owner_workload": workload_list,
 		}
 
+	def _get_key_control_flags(self, controls):
+		"""
+		Decode the is_key_control property for a subset of controls.
+
+		Args:
+		    controls: Control entity names to look up
+
+		Returns:
+		    Dict of entity name -> is_key_control flag
+		"""
+		if not controls:
+			return {}
+
+		return {
+			row.name: frappe.parse_json(row.properties or "{}").get("is_key_control", False)
+			for row in frappe.get_all(
+				"Compliance Graph Entity",
+				filters={"name": ["in", controls]},
+				fields=["name", "properties"],
+			)
+		}
+
+	def _get_owner_workload(self, controls):
+		"""
+		Count owned controls per owner, busiest owner first.
+
+		Args:
+		    controls: Control entity names to count ownership for
+
+		Returns:
+		    List of dicts with owner and control_count
+		"""
+		if not controls:
+			return []
+
+		if self._relationships_by_type is not None:
+			owners_map = self._relationships_by_type["OWNS"]
+			owner_workload = Counter(
+				owner for control in controls for owner in owners_map.get(control, ())
+			)
+
+			return [{"owner": k, "control_count": v} for k, v in owner_workload.most_common()]
+
+		# Let the database group and rank owners
+		return frappe.db.sql(
+			"""
+			SELECT source_entity AS owner, COUNT(*) AS control_count
+			FROM `tabCompliance Graph Relationship`
+			WHERE relationship_type = 'OWNS'
+				AND is_active = 1
+				AND target_entity IN %(controls)s
+			GROUP BY source_entity
+			ORDER BY control_count DESC
+		""",
+			{"controls": tuple(controls)},
+			as_dict=True,
+		)
+
 	def find_orphaned_entities(self):
 		"""
 		Find entities with no relationships.
@@ -259,32 +607,71 @@ class CoverageAnalyzer:
 		"""
 		orphaned = {}
 
-		# Get all active entities
-		entities = frappe.get_all(
-			"Compliance Graph Entity",
-			filters={"is_active": 1},
-			fields=["name", "entity_type", "entity_id", "entity_label"],
-		)
+		for orphan in self.iter_orphaned_entities():
+			entity_type = orphan.pop("entity_type")
+			if entity_type not in orphaned:
+				orphaned[entity_type] = []
+			orphaned[entity_type].append(orphan)
 
-		for entity in entities:
-			# Check for any relationships
-			has_outgoing = frappe.db.exists(
-				"Compliance Graph Relationship", {"source_entity": entity.name, "is_active": 1}
-			)
-			has_incoming = frappe.db.exists(
-				"Compliance Graph Relationship", {"target_entity": entity.name, "is_active": 1}
-			)
+		return {"orphaned_by_type": orphaned, "total_orphaned": sum(len(v) for v in orphaned.values())}
 
-			if not has_outgoing and not has_incoming:
-				entity_type = entity.entity_type
-				if entity_type not in orphaned:
-					orphaned[entity_type] = []
+	def iter_orphaned_entities(self, chunk_size=ORPHAN_SCAN_CHUNK_SIZE):
+		"""
+		Yield entities with no active relationships, one chunk at a time.
 
-				orphaned[entity_type].append(
-					{"entity": entity.name, "id": entity.entity_id, "label": entity.entity_label}
-				)
+		Connected entities are loaded once into a set; active entities are then
+		scanned in fixed-size pages so peak memory stays bounded and callers
+		can start consuming orphans before the scan completes.
 
-		return {"orphaned_by_type": orphaned, "total_orphaned": sum(len(v) for v in orphaned.values())}
+		Args:
+		    chunk_size: Number of entities fetched per page
+
+		Yields:
+		    Dict with entity, id, label and entity_type for each orphan
+		"""
+		connected = set(
+			frappe.db.sql_list(
+				"""
+				SELECT source_entity FROM `tabCompliance Graph Relationship` WHERE is_active = 1
+				UNION
+				SELECT target_entity FROM `tabCompliance Graph Relationship` WHERE is_active = 1
+			"""
+			)
+		)
+
+		start = 0
+		while True:
+			# Labels are only needed for orphans, so page through names first
+			entities = frappe.get_all(
+				"Compliance Graph Entity",
+				filters={"is_active": 1},
+				fields=["name"],
+				order_by="name",
+				limit_start=start,
+				limit_page_length=chunk_size,
+			)
+			if not entities:
+				break
+
+			orphan_names = [e.name for e in entities if e.name not in connected]
+			if orphan_names:
+				# Re-fetch display fields for the (usually small) orphan subset
+				for entity in frappe.get_all(
+					"Compliance Graph Entity",
+					filters={"name": ["in", orphan_names]},
+					fields=["name", "entity_type", "entity_id", "entity_label"],
+					order_by="name",
+				):
+					yield {
+						"entity": entity.name,
+						"id": entity.entity_id,
+						"label": entity.entity_label,
+						"entity_type": entity.entity_type,
+					}
+
+			if len(entities) < chunk_size:
+				break
+			start += chunk_size
 
 	def get_compliance_score(self, company=None):
 		"""
@@ -296,12 +683,10 @@ class CoverageAnalyzer:
 		Returns:
 		    Dict with compliance score and breakdown
 		"""
-		risk_coverage = self.analyze_risk_coverage(company)
-		testing_coverage = self.analyze_control_testing(company)
-		ownership = self.analyze_ownership(company)
-
-		# Weighted scoring
-		weights = {"risk_coverage": 0.40, "testing_coverage": 0.35, "ownership_coverage": 0.25}
+		# Scores only need the counts, so skip detail hydration
+		risk_coverage = self.analyze_risk_coverage(company, include_details=False)
+		testing_coverage = self.analyze_control_testing(company, include_details=False)
+		ownership = self.analyze_ownership(company, include_details=False)
 
 		scores = {
 			"risk_coverage": risk_coverage["coverage_percentage"],
@@ -309,25 +694,13 @@ class CoverageAnalyzer:
 			"ownership_coverage": ownership["ownership_coverage_percentage"],
 		}
 
-		overall_score = sum(scores[k] * weights[k] for k in weights)
-
-		# Determine grade
-		if overall_score >= 90:
-			grade = "A"
-		elif overall_score >= 80:
-			grade = "B"
-		elif overall_score >= 70:
-			grade = "C"
-		elif overall_score >= 60:
-			grade = "D"
-		else:
-			grade = "F"
+		overall_score = sum(scores[key] * weight for key, weight in SCORE_WEIGHTS)
 
 		return {
 			"overall_score": flt(overall_score, 2),
-			"grade": grade,
+			"grade": get_grade(overall_score),
 			"breakdown": scores,
-			"weights": weights,
+			"weights": dict(SCORE_WEIGHTS),
 			"recommendations": self._get_recommendations(scores),
 		}
 
@@ -372,99 +745,208 @@ class CoverageAnalyzer:
 		    Dict with dependency analysis
 		"""
 		# Get all control dependency relationships
-		dependencies = frappe.get_all(
-			"Compliance Graph Relationship",
-			filters={"relationship_type": ["in", ["DEPENDS_ON", "PRECEDED_BY"]], "is_active": 1},
-			fields=["source_entity", "target_entity", "relationship_type"],
-		)
+		if self._relationships_by_type is not None:
+			dependencies = [
+				frappe._dict(source_entity=source, target_entity=target)
+				for rel_type in DEPENDENCY_RELATIONSHIP_TYPES
+				for target, sources in self._relationships_by_type[rel_type].items()
+				for source in sources
+			]
+		else:
+			dependencies = frappe.get_all(
+				"Compliance Graph Relationship",
+				filters={"relationship_type": ["in", DEPENDENCY_RELATIONSHIP_TYPES], "is_active": 1},
+				fields=["source_entity", "target_entity"],
+			)
 
-		# Build dependency graph
+		# Build dependency graph: source -> [targets]
 		dependency_map = {}
 		for dep in dependencies:
-			source = dep.source_entity
-			if source not in dependency_map:
-				dependency_map[source] = []
-			dependency_map[source].append({"depends_on": dep.target_entity, "type": dep.relationship_type})
+			if dep.source_entity not in dependency_map:
+				dependency_map[dep.source_entity] = []
+			dependency_map[dep.source_entity].append(dep.target_entity)
 
 		# Find critical controls (most dependents)
-		dependent_count = {}
-		for deps in dependency_map.values():
-			for dep in deps:
-				target = dep["depends_on"]
-				dependent_count[target] = dependent_count.get(target, 0) + 1
+		dependent_count = Counter(target for targets in dependency_map.values() for target in targets)
 
+		# Top 10 only: partial selection instead of sorting every control
 		critical_controls = [
 			{"entity": k, "dependent_count": v}
-			for k, v in sorted(dependent_count.items(), key=lambda x: x[1], reverse=True)[:10]
+			for k, v in nlargest(10, dependent_count.items(), key=itemgetter(1))
 		]
 
-		# Find longest dependency chains
-		max_chain_length = 0
-		for control in dependency_map:
-			chain_length = self._get_dependency_chain_length(control, dependency_map, set())
-			max_chain_length = max(max_chain_length, chain_length)
-
 		return {
 			"total_dependencies": len(dependencies),
 			"controls_with_dependencies": len(dependency_map),
 			"critical_controls": critical_controls,
-			"max_chain_length": max_chain_length,
+			"max_chain_length": self._get_max_dependency_chain_length(dependency_map),
 		}
 
-	def _get_dependency_chain_length(self, entity, dependency_map, visited):
+	def _get_max_dependency_chain_length(self, dependency_map):
 		"""
-		Recursively calculate dependency chain length.
+		Calculate the longest dependency chain in the graph.
 
-		HIGH PRIORITY FIX: Uses global visited set to detect all circular dependencies,
-		not just local cycles. Implements backtracking to avoid false positives.
+		Iterative three-color DFS with memoized chain lengths, so every entity
+		is expanded once (O(V + E)) instead of re-walking shared sub-chains.
+		An edge back into the current path is a circular dependency; it is
+		logged and counts as a single hop.
 
 		Args:
-		    entity: Current entity being explored
-		    dependency_map: Map of entity dependencies
-		    visited: Set of entities in current recursion path
+		    dependency_map: Map of entity -> list of entities it depends on
 
 		Returns:
-		    Maximum dependency chain length, or 0 if circular dependency detected
+		    Maximum dependency chain length
 		"""
-		if entity in visited:
-			# Circular dependency detected - log warning
-			frappe.logger("compliance").warning(f"Circular dependency detected in entity: {entity}")
-			return 0
-
-		# Add to visited set for this recursion path
-		visited.add(entity)
-		max_depth = 0
-
-		if entity in dependency_map:
-			for dep in dependency_map[entity]:
-				# Use same visited set (not copy) to detect global cycles
-				depth = self._get_dependency_chain_length(dep["depends_on"], dependency_map, visited)
-				max_depth = max(max_depth, depth + 1)
-
-		# Backtrack: remove from visited to allow other paths to visit this entity
-		visited.remove(entity)
-
-		return max_depth
-
-	def get_full_analysis(self, company=None):
+		white, gray, black = 0, 1, 2
+		color = {}
+		longest = {}
+
+		for root in dependency_map:
+			if color.get(root, white) != white:
+				continue
+
+			color[root] = gray
+			stack = [(root, iter(dependency_map[root]))]
+
+			while stack:
+				entity, targets = stack[-1]
+
+				# Descend into the next unvisited dependency, if any
+				for target in targets:
+					state = color.get(target, white)
+					if state == white:
+						color[target] = gray
+						stack.append((target, iter(dependency_map.get(target, ()))))
+						break
+					if state == gray:
+						frappe.logger("compliance").warning(f"Circular dependency detected in entity: {target}")
+				else:
+					# All dependencies done: post-order, compute chain length
+					stack.pop()
+					color[entity] = black
+					longest[entity] = max(
+						(
+							longest[target] + 1 if color.get(target) == black else 1
+							for target in dependency_map.get(entity, ())
+						),
+						default=0,
+					)
+
+		return max(longest.values(), default=0)
+
+	def get_full_analysis(self, company=None, parallel=False):
 		"""
 		Get complete coverage analysis.
 
 		Args:
 		    company: Optional company filter
+		    parallel: Run the independent analyzers concurrently, each on its
+		        own database connection. Workers only see committed data.
 
 		Returns:
 		    Dict with all analysis results
 		"""
+		if parallel:
+			return self._get_full_analysis_parallel(company)
+
+		if not self._has_entities(["Risk", "Control"], company):
+			# Nothing to cover (e.g. a freshly onboarded company): seed the
+			# memo with zeroed results so no relationship queries run
+			self._cache[("risk", company, True)] = _empty_risk_coverage()
+			self._cache[("testing", company, True)] = _empty_control_testing()
+			self._cache[("ownership", company, True)] = _empty_ownership()
+
+			# Orphan and dependency scans are not company-scoped, so they
+			# can only be skipped when the whole graph is empty
+			if not self._has_entities():
+				return {
+					"compliance_score": self.get_compliance_score(company),
+					"risk_coverage": self._cache[("risk", company, True)],
+					"control_testing": self._cache[("testing", company, True)],
+					"ownership": self._cache[("ownership", company, True)],
+					"orphaned_entities": {"orphaned_by_type": {}, "total_orphaned": 0},
+					"dependencies": {
+						"total_dependencies": 0,
+						"controls_with_dependencies": 0,
+						"critical_controls": [],
+						"max_chain_length": 0,
+					},
+				}
+
+		elif self._relationships_by_type is None:
+			# One relationship scan shared by all analyzers below
+			self._prefetch_relationships()
+
+		# Run detailed analyzers first so the score reuses their memoized results
+		risk_coverage = self.analyze_risk_coverage(company)
+		control_testing = self.analyze_control_testing(company)
+		ownership = self.analyze_ownership(company)
+
 		return {
 			"compliance_score": self.get_compliance_score(company),
-			"risk_coverage": self.analyze_risk_coverage(company),
-			"control_testing": self.analyze_control_testing(company),
-			"ownership": self.analyze_ownership(company),
+			"risk_coverage": risk_coverage,
+			"control_testing": control_testing,
+			"ownership": ownership,
 			"orphaned_entities": self.find_orphaned_entities(),
 			"dependencies": self.analyze_control_dependencies(),
 		}
 
+	def _get_full_analysis_parallel(self, company=None):
+		"""
+		Run the independent analyzers concurrently and assemble the full analysis.
+
+		Each analyzer is DB-bound, so overlapping their queries brings wall
+		clock time down to the slowest one. The shared relationship scan is
+		skipped since every worker queries on its own connection.
+
+		Args:
+		    company: Optional company filter
+
+		Returns:
+		    Dict with all analysis results
+		"""
+		tasks = {
+			"risk_coverage": ("analyze_risk_coverage", (company,)),
+			"control_testing": ("analyze_control_testing", (company,)),
+			"ownership": ("analyze_ownership", (company,)),
+			"orphaned_entities": ("find_orphaned_entities", ()),
+			"dependencies": ("analyze_control_dependencies", ()),
+		}
+
+		site, sites_path, user = frappe.local.site, frappe.local.sites_path, frappe.session.user
+		with ThreadPoolExecutor(max_workers=PARALLEL_ANALYSIS_WORKERS) as executor:
+			futures = {
+				key: executor.submit(_run_analysis_in_thread, site, sites_path, user, method, args)
+				for key, (method, args) in tasks.items()
+			}
+			results = {key: future.result() for key, future in futures.items()}
+
+		# Seed the memo so the score is derived from the workers' results
+		self._cache[("risk", company, True)] = results["risk_coverage"]
+		self._cache[("testing", company, True)] = results["control_testing"]
+		self._cache[("ownership", company, True)] = results["ownership"]
+
+		return {"compliance_score": self.get_compliance_score(company), **results}
+
+
+def get_cached_analysis(analysis, company, generator):
+	"""
+	Get an analysis result from cache, keyed by the current graph version.
+
+	Args:
+	    analysis: Analysis name used in the cache key
+	    company: Optional company filter
+	    generator: Function computing the result on a cache miss
+
+	Returns:
+	    Cached or freshly computed analysis result
+	"""
+	return get_cached(
+		f"coverage_analysis:{analysis}:{company or ''}:{get_graph_version()}",
+		generator,
+		ttl=ANALYSIS_CACHE_TTL,
+	)
+
 
 # API Endpoints
 @frappe.whitelist()
@@ -493,18 +975,82 @@ def get_compliance_score(company=None):
 	if not frappe.has_permission("Compliance Graph Entity", "read"):
 		frappe.throw(_("No permission to read graph entities"))
 
-	analyzer = CoverageAnalyzer()
-	return analyzer.get_compliance_score(company)
+	return get_cached_analysis("score", company, lambda: CoverageAnalyzer().get_compliance_score(company))
 
 
 @frappe.whitelist()
-def get_full_coverage_analysis(company=None):
-	"""API endpoint for full coverage analysis."""
+def get_full_coverage_analysis(company=None, refresh=False):
+	"""
+	API endpoint for full coverage analysis.
+
+	Serves the stored snapshot and enqueues a background refresh when the
+	graph has changed since it was generated or when refresh is requested.
+	The analysis only runs on the request thread until the first snapshot
+	has been stored.
+	"""
 	if not frappe.has_permission("Compliance Graph Entity", "read"):
 		frappe.throw(_("No permission to read graph entities"))
 
-	analyzer = CoverageAnalyzer()
-	return analyzer.get_full_analysis(company)
+	snapshot = ComplianceAnalysisSnapshot.get_snapshot(company)
+	if not snapshot:
+		# Serve this request synchronously and persist the snapshot off-thread
+		enqueue_snapshot_refresh(company)
+		analysis = get_cached_analysis("full", company, lambda: CoverageAnalyzer().get_full_analysis(company))
+		return {**analysis, "generated_at": now_datetime(), "is_stale": False}
+
+	is_stale = snapshot.graph_version != get_graph_version()
+	if is_stale or cint(refresh):
+		enqueue_snapshot_refresh(company)
+
+	return {**snapshot.get_analysis(), "generated_at": snapshot.generated_at, "is_stale": is_stale}
+
+
+def enqueue_snapshot_refresh(company=None):
+	"""
+	Queue a background refresh of a company's analysis snapshot.
+
+	Args:
+	    company: Optional company filter
+	"""
+	frappe.enqueue(
+		"advanced_compliance.advanced_compliance.knowledge_graph.analysis.refresh_analysis_snapshot",
+		queue="long",
+		timeout=SNAPSHOT_REFRESH_TIMEOUT,
+		job_id=f"coverage_snapshot_refresh:{ComplianceAnalysisSnapshot.get_snapshot_key(company)}",
+		deduplicate=True,
+		company=company,
+	)
+
+
+def refresh_analysis_snapshot(company=None):
+	"""
+	Recompute and store the full coverage analysis snapshot for a company.
+
+	Runs as a background job; enqueue_snapshot_refresh deduplicates the job
+	per company, so overlapping runs are not queued.
+
+	Args:
+	    company: Optional company filter
+	"""
+	# Read the version first so changes made during the run mark the snapshot stale
+	graph_version = get_graph_version()
+	analysis = CoverageAnalyzer().get_full_analysis(company)
+	ComplianceAnalysisSnapshot.save_snapshot(company, analysis, graph_version)
+	frappe.db.commit()
+
+
+def refresh_stale_snapshots():
+	"""
+	Refresh every snapshot generated from an older graph version.
+
+	Runs via scheduler so dashboards rarely see stale data.
+	"""
+	graph_version = get_graph_version()
+	snapshots = frappe.get_all("Compliance Analysis Snapshot", fields=["company", "graph_version"])
+
+	for snapshot in snapshots:
+		if snapshot.graph_version != graph_version:
+			enqueue_snapshot_refresh(snapshot.company)
 
 
 @frappe.whitelist()
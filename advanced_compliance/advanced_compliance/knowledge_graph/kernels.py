@@ -0,0 +1,213 @@
+# Copyright (c) 2025, Noreli North
+# For license information, please see license.txt
+
+"""
+Compiled traversal kernels for CSR graph snapshots.
+
+The BFS and DFS loops over a snapshot's integer offset and target arrays
+are compiled with numba when it is installed. numba is optional: when it
+is missing, is_available() returns False and the query engine keeps its
+pure-Python traversal.
+"""
+
+# Upper bound on the (max_paths x max_depth) result buffer of the DFS kernel
+KERNEL_MAX_PATH_SLOTS = 1000000
+
+_kernels = None
+
+
+def is_available():
+	"""Return True if numba is installed and the kernels compiled."""
+	return _get_kernels() is not None
+
+
+def _get_kernels():
+	"""Compile the kernels on first use; None if numba is not installed."""
+	global _kernels
+
+	if _kernels is None:
+		try:
+			import numba
+		except ImportError:
+			_kernels = False
+		else:
+			_kernels = (numba.njit(cache=True)(_bfs_kernel), numba.njit(cache=True)(_dfs_kernel))
+
+	return _kernels or None
+
+
+def find_path_slots(offsets, targets, start_id, end_id, max_depth):
+	"""
+	Find a shortest path between two snapshot ids.
+
+	Args:
+	    offsets: Snapshot offsets array
+	    targets: Snapshot targets array
+	    start_id: Start entity id
+	    end_id: End entity id
+	    max_depth: Maximum path length
+
+	Returns:
+	    List of edge slots from start to end, or None if not reachable
+	"""
+	import numpy as np
+
+	bfs_kernel = _get_kernels()[0]
+	count = len(offsets) - 1
+	parents = np.full(count, -1, dtype=np.int32)
+	parent_slots = np.full(count, -1, dtype=np.int32)
+
+	found = bfs_kernel(
+		_as_ndarray(offsets),
+		_as_ndarray(targets),
+		start_id,
+		end_id,
+		max_depth,
+		np.zeros(count, dtype=np.uint8),
+		parents,
+		parent_slots,
+		np.empty(count, dtype=np.int32),
+		np.empty(count, dtype=np.int32),
+	)
+	if not found:
+		return None
+
+	slots = []
+	current = end_id
+	while parents[current] != -1:
+		slots.append(int(parent_slots[current]))
+		current = parents[current]
+
+	slots.reverse()
+	return slots
+
+
+def find_all_path_slots(offsets, targets, start_id, end_id, max_depth, max_paths):
+	"""
+	Find simple paths between two snapshot ids in DFS order.
+
+	Args:
+	    offsets: Snapshot offsets array
+	    targets: Snapshot targets array
+	    start_id: Start entity id
+	    end_id: End entity id
+	    max_depth: Maximum path length
+	    max_paths: Maximum number of paths
+
+	Returns:
+	    List of edge slot lists, or None if the result buffer would be too large
+	"""
+	import numpy as np
+
+	dfs_kernel = _get_kernels()[1]
+	count = len(offsets) - 1
+
+	# A simple path never has more edges than there are entities
+	depth = min(max_depth, count)
+	if max_paths * depth > KERNEL_MAX_PATH_SLOTS:
+		return None
+
+	out_slots = np.empty((max_paths, depth), dtype=np.int32)
+	out_lengths = np.empty(max_paths, dtype=np.int32)
+
+	found = dfs_kernel(
+		_as_ndarray(offsets),
+		_as_ndarray(targets),
+		start_id,
+		end_id,
+		depth,
+		max_paths,
+		np.zeros(count, dtype=np.uint8),
+		np.empty(depth + 1, dtype=np.int32),
+		np.empty(depth, dtype=np.int64),
+		np.empty(depth, dtype=np.int32),
+		out_slots,
+		out_lengths,
+	)
+
+	return [out_slots[i, : out_lengths[i]].tolist() for i in range(found)]
+
+
+def _as_ndarray(values):
+	"""View a snapshot array.array as a numpy array without copying."""
+	import numpy as np
+
+	return np.frombuffer(values, dtype=np.dtype(values.typecode))
+
+
+def _bfs_kernel(offsets, targets, start, end, max_depth, visited, parents, parent_slots, frontier, next_frontier):
+	"""Level-synchronous BFS; fills parent pointers and returns True once end is reached."""
+	visited[start] = 1
+	frontier[0] = start
+	size = 1
+
+	for _depth in range(max_depth):
+		next_size = 0
+		for i in range(size):
+			current = frontier[i]
+			for slot in range(offsets[current], offsets[current + 1]):
+				neighbor = targets[slot]
+				if visited[neighbor]:
+					continue
+
+				visited[neighbor] = 1
+				parents[neighbor] = current
+				parent_slots[neighbor] = slot
+				if neighbor == end:
+					return True
+				next_frontier[next_size] = neighbor
+				next_size += 1
+
+		if next_size == 0:
+			break
+		frontier, next_frontier = next_frontier, frontier
+		size = next_size
+
+	return False
+
+
+def _dfs_kernel(
+	offsets, targets, start, end, max_depth, max_paths, in_path, path_ids, cursors, path_slots, out_slots, out_lengths
+):
+	"""Iterative DFS over simple paths; writes edge slots per path and returns the path count."""
+	found = 0
+	depth = 0
+	path_ids[0] = start
+	in_path[start] = 1
+	cursors[0] = offsets[start]
+
+	while depth >= 0:
+		current = path_ids[depth]
+		slot = cursors[depth]
+
+		if slot >= offsets[current + 1]:
+			# Neighbors exhausted; backtrack
+			in_path[current] = 0
+			depth -= 1
+			continue
+
+		cursors[depth] = slot + 1
+		neighbor = targets[slot]
+		if in_path[neighbor]:
+			continue
+
+		path_slots[depth] = slot
+		if neighbor == end:
+			for i in range(depth + 1):
+				out_slots[found, i] = path_slots[i]
+			out_lengths[found] = depth + 1
+			found += 1
+			if found >= max_paths:
+				break
+			continue
+
+		# Stepping to neighbor would leave no room to reach the end within max_depth
+		if depth + 1 >= max_depth:
+			continue
+
+		depth += 1
+		path_ids[depth] = neighbor
+		in_path[neighbor] = 1
+		cursors[depth] = offsets[neighbor]
+
+	return found
@@ -5,12 +5,181 @@ Provides graph traversal and query capabilities for the compliance knowledge gra
 Supports path finding, pattern matching, and neighborhood exploration.
 """
 
+import hashlib
 import json
-from collections import deque
+from array import array
+from collections import deque, namedtuple
 
 import frappe
+import orjson
 from frappe import _
 from frappe.utils import cint
+from frappe.utils.response import json_handler
+from werkzeug.wrappers import Response
+
+from advanced_compliance.advanced_compliance.doctype.compliance_graph_relationship.compliance_graph_relationship import (
+	get_vis_edge,
+)
+from advanced_compliance.advanced_compliance.knowledge_graph import kernels
+from advanced_compliance.advanced_compliance.utils.cache import get_cached, get_graph_version
+
+# Entity columns returned by bulk entity loads
+ENTITY_FIELDS = [
+	"name",
+	"entity_type",
+	"entity_doctype",
+	"entity_id",
+	"entity_label",
+	"properties",
+	"node_color",
+	"node_size",
+	"is_active",
+]
+
+# Neighbor record used inside traversals; converted to a dict only at the API boundary
+Neighbor = namedtuple("Neighbor", "entity relationship relationship_type direction depth")
+
+# Columns read from relationship rows during traversal
+RELATIONSHIP_FIELDS = ["name", "relationship_type", "source_entity", "target_entity", "weight"]
+
+# Largest active relationship count loaded into an in-memory CSR snapshot
+CSR_SNAPSHOT_MAX_EDGES = 50000
+
+# Maximum pattern matches returned (one per binding of the first pattern node)
+PATTERN_MATCH_LIMIT = 100
+
+# Safety-net TTL for cached path results; graph changes invalidate via version
+PATH_CACHE_TTL = 300  # 5 minutes
+
+# Per-engine adjacency cache size (entity, relationship filter, direction entries)
+ADJACENCY_CACHE_CAPACITY = 2048
+
+
+class LRUKCache:
+	"""
+	Bounded LRU-K cache (K=2 by default).
+
+	Evicts the entry whose K-th most recent access is oldest. Entries accessed
+	fewer than K times are evicted first, so one-off lookups do not push out
+	the entities a traversal keeps coming back to.
+	"""
+
+	def __init__(self, capacity=ADJACENCY_CACHE_CAPACITY, k=2):
+		"""
+		Initialize the cache.
+
+		Args:
+		    capacity: Maximum number of entries
+		    k: Number of accesses tracked per entry
+		"""
+		self.capacity = capacity
+		self.k = k
+		self._values = {}
+		self._history = {}  # key -> ticks of the last k accesses
+		self._tick = 0
+
+	def __len__(self):
+		return len(self._values)
+
+	def __contains__(self, key):
+		return key in self._values
+
+	def get(self, key, default=None):
+		"""Return the cached value for key, recording the access."""
+		if key not in self._values:
+			return default
+
+		self._touch(key)
+		return self._values[key]
+
+	def put(self, key, value):
+		"""Store a value, evicting the LRU-K victim when full."""
+		if key not in self._values and len(self._values) >= self.capacity:
+			self._evict()
+
+		self._values[key] = value
+		self._touch(key)
+
+	def clear(self):
+		"""Drop all entries."""
+		self._values.clear()
+		self._history.clear()
+
+	def _touch(self, key):
+		self._tick += 1
+		history = self._history.get(key)
+		if history is None:
+			history = self._history[key] = deque(maxlen=self.k)
+		history.append(self._tick)
+
+	def _evict(self):
+		def backward_k_distance(key):
+			history = self._history[key]
+			# Fewer than k accesses counts as infinitely old; ties go to the least recent
+			return (history[0] if len(history) == self.k else 0, history[-1])
+
+		victim = min(self._values, key=backward_k_distance)
+		del self._values[victim]
+		del self._history[victim]
+
+
+class CSRSnapshot:
+	"""
+	Compressed sparse row adjacency of the active relationship graph.
+
+	Entities get integer ids; the neighbors of id v are the slots
+	offsets[v]:offsets[v + 1] of the parallel edge arrays. Each entity keeps one
+	slot per distinct neighbor, outgoing before incoming, the same neighbors
+	get_neighbors(direction="both", max_depth=1) returns.
+	"""
+
+	__slots__ = ("names", "ids", "offsets", "targets", "relationships", "relationship_types", "incoming")
+
+	def __init__(self, relationships):
+		"""
+		Build the snapshot from relationship rows.
+
+		Args:
+		    relationships: Rows with name, relationship_type, source_entity and target_entity
+		"""
+		self.names = []
+		self.ids = {}
+
+		outgoing = []
+		incoming = []
+		for rel in relationships:
+			source = self._get_id(rel.source_entity, outgoing, incoming)
+			target = self._get_id(rel.target_entity, outgoing, incoming)
+			outgoing[source].append((target, rel.name, rel.relationship_type))
+			incoming[target].append((source, rel.name, rel.relationship_type))
+
+		self.offsets = array("I", [0])
+		self.targets = array("I")
+		self.relationships = []
+		self.relationship_types = []
+		self.incoming = bytearray()
+
+		for v in range(len(self.names)):
+			seen = {v}
+			for flag, edges in ((0, outgoing[v]), (1, incoming[v])):
+				for target, rel_name, rel_type in edges:
+					if target not in seen:
+						seen.add(target)
+						self.targets.append(target)
+						self.relationships.append(rel_name)
+						self.relationship_types.append(rel_type)
+						self.incoming.append(flag)
+			self.offsets.append(len(self.targets))
+
+	def _get_id(self, name, outgoing, incoming):
+		"""Return the integer id of an entity, assigning one on first sight."""
+		entity_id = self.ids.get(name)
+		if entity_id is None:
+			entity_id = self.ids[name] = len(self.names)
+			self.names.append(name)
+			outgoing.append([])
+			incoming.append([])
+		return entity_id
 
 
 class GraphQueryEngine:
@@ -20,6 +189,23 @@ class GraphQueryEngine:
 		"""Initialize the query engine."""
 		self.visited = set()
 		self.path_cache = {}
+		self._csr_snapshots = {}
+		self._adjacency_cache = LRUKCache()
+		self._pattern_matches = {}
+		self._relationship_types = None
+
+	def clear_cache(self):
+		"""
+		Drop cached adjacency lists, CSR snapshots, paths and pattern matches.
+
+		The caches live as long as the engine and are not invalidated by graph
+		writes; call this after changing relationships through the same engine.
+		"""
+		self.path_cache.clear()
+		self._adjacency_cache.clear()
+		self._csr_snapshots.clear()
+		self._pattern_matches.clear()
+		self._relationship_types = None
 
 	def get_entity(self, entity_name):
 		"""
@@ -29,12 +215,9 @@ class GraphQueryEngine:
 		    entity_name: Name of the entity
 
 		Returns:
-		    Entity document as dict or None
+		    Entity fields as dict or None
 		"""
-		if not frappe.db.exists("Compliance Graph Entity", entity_name):
-			return None
-
-		return frappe.get_doc("Compliance Graph Entity", entity_name).as_dict()
+		return frappe.db.get_value("Compliance Graph Entity", entity_name, ENTITY_FIELDS, as_dict=True) or None
 
 	def get_entity_by_document(self, doctype, docname):
 		"""
@@ -45,19 +228,18 @@ class GraphQueryEngine:
 		    docname: The document name
 
 		Returns:
-		    Entity document as dict or None
+		    Entity fields as dict or None
 		"""
-		entity_name = frappe.db.get_value(
-			"Compliance Graph Entity",
-			{"entity_doctype": doctype, "entity_id": docname, "is_active": 1},
-			"name",
+		return (
+			frappe.db.get_value(
+				"Compliance Graph Entity",
+				{"entity_doctype": doctype, "entity_id": docname, "is_active": 1},
+				ENTITY_FIELDS,
+				as_dict=True,
+			)
+			or None
 		)
 
-		if not entity_name:
-			return None
-
-		return frappe.get_doc("Compliance Graph Entity", entity_name).as_dict()
-
 	def get_neighbors(self, entity_name, relationship_types=None, direction="both", max_depth=1):
 		"""
 		Get neighboring entities.
@@ -71,79 +253,126 @@ class GraphQueryEngine:
 		Returns:
 		    List of neighbor entities with relationship info
 		"""
+		neighbors = self._get_neighbors(entity_name, relationship_types, direction, max_depth)
+		return [neighbor._asdict() for neighbor in neighbors]
+
+	def _get_neighbors(self, entity_name, relationship_types=None, direction="both", max_depth=1):
+		"""Level-synchronous BFS behind get_neighbors, returning Neighbor tuples."""
+		# Snapshots keep one edge per neighbor pair regardless of direction, so only "both" can use them
+		if direction == "both":
+			snapshot = self._csr_snapshots.get(tuple(sorted(relationship_types or ())))
+			if snapshot is not None:
+				return self._get_neighbors_in_snapshot(snapshot, entity_name, max_depth)
+
 		neighbors = []
 		visited = {entity_name}
-		queue = deque([(entity_name, 0)])  # (entity, depth)
+		frontier = [entity_name]
+
+		# One batched expansion per depth, not per entity
+		for depth in range(1, cint(max_depth) + 1):
+			next_frontier = []
+			for _current, neighbor, rel_name, rel_type, rel_direction in self._get_frontier_relationships(
+				frontier, relationship_types, direction
+			):
+				if neighbor not in visited:
+					visited.add(neighbor)
+					next_frontier.append(neighbor)
+					neighbors.append(Neighbor(neighbor, rel_name, rel_type, rel_direction, depth))
+
+			if not next_frontier:
+				break
+			frontier = next_frontier
 
-		while queue:
-			current, depth = queue.popleft()
+		return neighbors
 
-			if depth >= max_depth:
-				continue
+	def _get_neighbors_in_snapshot(self, snapshot, entity_name, max_depth):
+		"""Level-synchronous BFS over a CSR snapshot with a bytearray visited mask."""
+		start_id = snapshot.ids.get(entity_name)
+		if start_id is None:
+			return []
 
-			# Get outgoing relationships
-			if direction in ("outgoing", "both"):
-				outgoing = self._get_outgoing_relationships(current, relationship_types)
-				for rel in outgoing:
-					if rel.target_entity not in visited:
-						visited.add(rel.target_entity)
-						neighbors.append(
-							{
-								"entity": rel.target_entity,
-								"relationship": rel.name,
-								"relationship_type": rel.relationship_type,
-								"direction": "outgoing",
-								"depth": depth + 1,
-							}
-						)
-						if depth + 1 < max_depth:
-							queue.append((rel.target_entity, depth + 1))
-
-			# Get incoming relationships
-			if direction in ("incoming", "both"):
-				incoming = self._get_incoming_relationships(current, relationship_types)
-				for rel in incoming:
-					if rel.source_entity not in visited:
-						visited.add(rel.source_entity)
+		offsets, targets = snapshot.offsets, snapshot.targets
+		visited = bytearray(len(snapshot.names))
+		visited[start_id] = 1
+		neighbors = []
+		frontier = [start_id]
+
+		for depth in range(1, cint(max_depth) + 1):
+			next_frontier = []
+			for current in frontier:
+				for slot in range(offsets[current], offsets[current + 1]):
+					neighbor = targets[slot]
+					if not visited[neighbor]:
+						visited[neighbor] = 1
+						next_frontier.append(neighbor)
 						neighbors.append(
-							{
-								"entity": rel.source_entity,
-								"relationship": rel.name,
-								"relationship_type": rel.relationship_type,
-								"direction": "incoming",
-								"depth": depth + 1,
-							}
+							Neighbor(
+								snapshot.names[neighbor],
+								snapshot.relationships[slot],
+								snapshot.relationship_types[slot],
+								"incoming" if snapshot.incoming[slot] else "outgoing",
+								depth,
+							)
 						)
-						if depth + 1 < max_depth:
-							queue.append((rel.source_entity, depth + 1))
+
+			if not next_frontier:
+				break
+			frontier = next_frontier
 
 		return neighbors
 
 	def _get_outgoing_relationships(self, entity_name, relationship_types=None):
 		"""Get outgoing relationships from an entity."""
-		filters = {"source_entity": entity_name, "is_active": 1}
-
-		if relationship_types:
-			filters["relationship_type"] = ["in", relationship_types]
-
-		return frappe.get_all(
-			"Compliance Graph Relationship",
-			filters=filters,
-			fields=["name", "relationship_type", "target_entity", "weight"],
-		)
+		return self._get_adjacency([entity_name], relationship_types, "outgoing")[entity_name]
 
 	def _get_incoming_relationships(self, entity_name, relationship_types=None):
 		"""Get incoming relationships to an entity."""
-		filters = {"target_entity": entity_name, "is_active": 1}
+		return self._get_adjacency([entity_name], relationship_types, "incoming")[entity_name]
 
-		if relationship_types:
-			filters["relationship_type"] = ["in", relationship_types]
+	def _get_adjacency(self, entity_names, relationship_types, direction):
+		"""
+		Get active relationships of several entities in one direction.
 
-		return frappe.get_all(
-			"Compliance Graph Relationship",
-			filters=filters,
-			fields=["name", "relationship_type", "source_entity", "weight"],
-		)
+		Cached entities are served from the adjacency cache; the rest are
+		loaded with a single query and cached.
+
+		Args:
+		    entity_names: Entity names to look up
+		    relationship_types: Optional list of relationship types to filter
+		    direction: "outgoing" or "incoming"
+
+		Returns:
+		    Dict of entity name -> list of relationship rows
+		"""
+		types_key = tuple(sorted(relationship_types or ()))
+		adjacency = {}
+		misses = []
+
+		for name in entity_names:
+			rows = self._adjacency_cache.get((name, types_key, direction))
+			if rows is None:
+				misses.append(name)
+			else:
+				adjacency[name] = rows
+
+		if misses:
+			column = "source_entity" if direction == "outgoing" else "target_entity"
+			filters = {column: ["in", misses], "is_active": 1}
+			if relationship_types:
+				filters["relationship_type"] = ["in", relationship_types]
+
+			loaded = {name: [] for name in misses}
+			relationships = frappe.get_all(
+				"Compliance Graph Relationship", filters=filters, fields=RELATIONSHIP_FIELDS
+			)
+			for rel in relationships:
+				loaded[rel[column]].append(rel)
+
+			for name, rows in loaded.items():
+				self._adjacency_cache.put((name, types_key, direction), rows)
+			adjacency.update(loaded)
+
+		return adjacency
 
 	def find_path(self, start_entity, end_entity, relationship_types=None, max_depth=5):
 		"""
@@ -161,42 +390,167 @@ class GraphQueryEngine:
 		if start_entity == end_entity:
 			return {"entities": [start_entity], "relationships": [], "length": 0}
 
-		# BFS for shortest path
-		visited = {start_entity}
-		queue = deque([(start_entity, [start_entity], [])])
+		return self._get_cached_paths(
+			"shortest",
+			lambda: self._find_path(start_entity, end_entity, relationship_types, max_depth),
+			start_entity,
+			end_entity,
+			relationship_types,
+			max_depth,
+		)
 
-		while queue:
-			current, path_entities, path_relationships = queue.popleft()
+	def _find_path(self, start_entity, end_entity, relationship_types, max_depth):
+		"""Uncached shortest path search behind find_path."""
+		# Reuse a snapshot already loaded by this engine; otherwise a few batched queries beat a full scan
+		snapshot = self._csr_snapshots.get(tuple(sorted(relationship_types or ())))
+		if snapshot is not None:
+			return self._find_path_in_snapshot(snapshot, start_entity, end_entity, max_depth)
 
-			if len(path_entities) > max_depth:
-				continue
+		return self._find_path_bidirectional(start_entity, end_entity, relationship_types, max_depth)
 
-			# Check all neighbors
-			neighbors = self.get_neighbors(
-				current, relationship_types=relationship_types, direction="both", max_depth=1
-			)
+	def _find_path_bidirectional(self, start_entity, end_entity, relationship_types, max_depth):
+		"""
+		Shortest path by bidirectional level-synchronous BFS.
 
-			for neighbor in neighbors:
-				neighbor_entity = neighbor["entity"]
+		Grows one frontier from each end, always expanding the smaller one, and
+		stops after the first level on which they meet. Paths ignore edge
+		direction, so both frontiers follow outgoing and incoming edges.
 
-				if neighbor_entity == end_entity:
-					return {
-						"entities": path_entities + [end_entity],
-						"relationships": path_relationships + [neighbor["relationship"]],
-						"length": len(path_entities),
-					}
+		Args:
+		    start_entity: Starting entity name
+		    end_entity: Target entity name
+		    relationship_types: Optional list of relationship types to traverse
+		    max_depth: Maximum path length
 
-				if neighbor_entity not in visited:
-					visited.add(neighbor_entity)
-					queue.append(
-						(
-							neighbor_entity,
-							path_entities + [neighbor_entity],
-							path_relationships + [neighbor["relationship"]],
-						)
-					)
+		Returns:
+		    Path dict, or None if no path within max_depth
+		"""
+		# entity -> (next entity toward the search origin, relationship, depth from origin)
+		forward = {start_entity: (None, None, 0)}
+		backward = {end_entity: (None, None, 0)}
+		forward_frontier = [start_entity]
+		backward_frontier = [end_entity]
+		forward_depth = backward_depth = 0
+
+		while forward_frontier and backward_frontier and forward_depth + backward_depth < cint(max_depth):
+			expand_forward = len(forward_frontier) <= len(backward_frontier)
+			if expand_forward:
+				frontier, parents, others = forward_frontier, forward, backward
+				forward_depth += 1
+				depth = forward_depth
+			else:
+				frontier, parents, others = backward_frontier, backward, forward
+				backward_depth += 1
+				depth = backward_depth
+
+			next_frontier = []
+			for current, neighbor, rel_name, _rel_type, _direction in self._get_frontier_relationships(
+				frontier, relationship_types, "both"
+			):
+				if neighbor not in parents:
+					parents[neighbor] = (current, rel_name, depth)
+					next_frontier.append(neighbor)
+
+			# Every meeting entity on this level gives a candidate; keep the shortest
+			meetings = [name for name in next_frontier if name in others]
+			if meetings:
+				meet = min(meetings, key=lambda name: forward[name][2] + backward[name][2])
+				return self._join_bidirectional_path(forward, backward, meet)
+
+			if expand_forward:
+				forward_frontier = next_frontier
+			else:
+				backward_frontier = next_frontier
 
-		return None  # No path found
+		return None
+
+	def _join_bidirectional_path(self, forward, backward, meet):
+		"""Stitch the forward and backward parent chains together at meet."""
+		path_entities = []
+		path_relationships = []
+
+		current = meet
+		while current is not None:
+			path_entities.append(current)
+			current, relationship, _depth = forward[current]
+			if relationship:
+				path_relationships.append(relationship)
+
+		path_entities.reverse()
+		path_relationships.reverse()
+
+		current, relationship, _depth = backward[meet]
+		while current is not None:
+			path_entities.append(current)
+			path_relationships.append(relationship)
+			current, relationship, _depth = backward[current]
+
+		return {"entities": path_entities, "relationships": path_relationships, "length": len(path_relationships)}
+
+	def _find_path_in_snapshot(self, snapshot, start_entity, end_entity, max_depth):
+		"""BFS shortest path over a CSR snapshot."""
+		start_id = snapshot.ids.get(start_entity)
+		end_id = snapshot.ids.get(end_entity)
+		if start_id is None or end_id is None:
+			return None
+
+		offsets, targets = snapshot.offsets, snapshot.targets
+		if kernels.is_available():
+			slots = kernels.find_path_slots(offsets, targets, start_id, end_id, max_depth)
+			return None if slots is None else self._build_slot_path(snapshot, start_id, slots)
+
+		visited = bytearray(len(snapshot.names))
+		parents = array("i", [-1]) * len(snapshot.names)
+		parent_slots = array("i", [-1]) * len(snapshot.names)
+
+		visited[start_id] = 1
+		frontier = [start_id]
+
+		for _depth in range(max_depth):
+			next_frontier = []
+			for current in frontier:
+				for slot in range(offsets[current], offsets[current + 1]):
+					neighbor = targets[slot]
+					if visited[neighbor]:
+						continue
+
+					visited[neighbor] = 1
+					parents[neighbor] = current
+					parent_slots[neighbor] = slot
+					if neighbor == end_id:
+						return self._build_snapshot_path(snapshot, parents, parent_slots, end_id)
+					next_frontier.append(neighbor)
+
+			if not next_frontier:
+				break
+			frontier = next_frontier
+
+		return None
+
+	def _build_snapshot_path(self, snapshot, parents, parent_slots, end_id):
+		"""Rebuild a path dict by walking snapshot parent pointers back from end_id."""
+		path_entities = []
+		path_relationships = []
+
+		current = end_id
+		while current != -1:
+			path_entities.append(snapshot.names[current])
+			if parent_slots[current] != -1:
+				path_relationships.append(snapshot.relationships[parent_slots[current]])
+			current = parents[current]
+
+		path_entities.reverse()
+		path_relationships.reverse()
+
+		return {"entities": path_entities, "relationships": path_relationships, "length": len(path_relationships)}
+
+	def _build_slot_path(self, snapshot, start_id, slots):
+		"""Build a path dict from the snapshot edge slots a traversal kernel returned."""
+		return {
+			"entities": [snapshot.names[start_id]] + [snapshot.names[snapshot.targets[slot]] for slot in slots],
+			"relationships": [snapshot.relationships[slot] for slot in slots],
+			"length": len(slots),
+		}
 
 	def find_all_paths(self, start_entity, end_entity, relationship_types=None, max_depth=5, max_paths=10):
 		"""
@@ -212,6 +566,120 @@ class GraphQueryEngine:
 		Returns:
 		    List of path dicts
 		"""
+		if start_entity == end_entity:
+			return [{"entities": [start_entity], "relationships": [], "length": 0}]
+
+		return self._get_cached_paths(
+			"all",
+			lambda: self._find_all_paths(start_entity, end_entity, relationship_types, max_depth, max_paths),
+			start_entity,
+			end_entity,
+			relationship_types,
+			max_depth,
+			max_paths,
+		)
+
+	def _get_cached_paths(self, kind, compute, start_entity, end_entity, relationship_types, *limits):
+		"""
+		Read-through path cache: engine dict first, then Redis.
+
+		The Redis key includes the graph version, so any relationship change
+		makes earlier results unreachable without explicit invalidation.
+
+		Args:
+		    kind: "shortest" or "all"
+		    compute: Function running the uncached search
+		    start_entity: Starting entity name
+		    end_entity: Target entity name
+		    relationship_types: Optional list of relationship types
+		    *limits: Depth and path limits of the search
+
+		Returns:
+		    Cached or freshly computed result
+		"""
+		key = (kind, start_entity, end_entity, tuple(sorted(relationship_types or ())), *limits)
+		if key in self.path_cache:
+			return self.path_cache[key]
+
+		digest = hashlib.blake2s(repr(key).encode()).hexdigest()
+		result = get_cached(f"graph_paths:{get_graph_version()}:{digest}", compute, ttl=PATH_CACHE_TTL)
+
+		self.path_cache[key] = result
+		return result
+
+	def _find_all_paths(self, start_entity, end_entity, relationship_types, max_depth, max_paths):
+		"""Uncached all-paths search behind find_all_paths."""
+		snapshot = self._build_csr_snapshot(relationship_types)
+		if snapshot is None:
+			return self._find_all_paths_by_query(
+				start_entity, end_entity, relationship_types, max_depth, max_paths
+			)
+
+		all_paths = []
+		start_id = snapshot.ids.get(start_entity)
+		end_id = snapshot.ids.get(end_entity)
+
+		# Entities without active relationships cannot be on any path
+		if start_id is None or end_id is None:
+			return all_paths
+
+		if max_depth < 1 or max_paths < 1:
+			return all_paths
+
+		offsets, targets = snapshot.offsets, snapshot.targets
+		if kernels.is_available():
+			path_slots = kernels.find_all_path_slots(offsets, targets, start_id, end_id, max_depth, max_paths)
+			if path_slots is not None:
+				return [self._build_slot_path(snapshot, start_id, slots) for slots in path_slots]
+
+		# Iterative DFS: one neighbor-slot iterator per path entity, no recursion
+		in_path = bytearray(len(snapshot.names))
+		in_path[start_id] = 1
+		path_ids = [start_id]
+		path_slots = []
+		stack = [iter(range(offsets[start_id], offsets[start_id + 1]))]
+
+		while stack:
+			slot = next(stack[-1], None)
+
+			if slot is None:
+				# Neighbors exhausted; backtrack
+				stack.pop()
+				in_path[path_ids.pop()] = 0
+				if path_slots:
+					path_slots.pop()
+				continue
+
+			neighbor = targets[slot]
+			if in_path[neighbor]:
+				continue
+
+			if neighbor == end_id:
+				all_paths.append(
+					{
+						"entities": [snapshot.names[v] for v in path_ids] + [end_entity],
+						"relationships": [snapshot.relationships[i] for i in path_slots]
+						+ [snapshot.relationships[slot]],
+						"length": len(path_ids),
+					}
+				)
+				if len(all_paths) >= max_paths:
+					break
+				continue
+
+			# Stepping to neighbor would leave no room to reach the end within max_depth
+			if len(path_ids) >= max_depth:
+				continue
+
+			in_path[neighbor] = 1
+			path_ids.append(neighbor)
+			path_slots.append(slot)
+			stack.append(iter(range(offsets[neighbor], offsets[neighbor + 1])))
+
+		return all_paths
+
+	def _find_all_paths_by_query(self, start_entity, end_entity, relationship_types, max_depth, max_paths):
+		"""Find all paths with per-node neighbor queries, for graphs too large to snapshot."""
 		all_paths = []
 
 		def dfs(current, path_entities, path_relationships, visited):
@@ -231,16 +699,16 @@ class GraphQueryEngine:
 			if len(path_entities) > max_depth:
 				return
 
-			neighbors = self.get_neighbors(
+			neighbors = self._get_neighbors(
 				current, relationship_types=relationship_types, direction="both", max_depth=1
 			)
 
 			for neighbor in neighbors:
-				neighbor_entity = neighbor["entity"]
+				neighbor_entity = neighbor.entity
 				if neighbor_entity not in visited:
 					visited.add(neighbor_entity)
 					path_entities.append(neighbor_entity)
-					path_relationships.append(neighbor["relationship"])
+					path_relationships.append(neighbor.relationship)
 
 					dfs(neighbor_entity, path_entities, path_relationships, visited)
 
@@ -251,6 +719,39 @@ class GraphQueryEngine:
 		dfs(start_entity, [start_entity], [], {start_entity})
 		return all_paths
 
+	def _build_csr_snapshot(self, relationship_types=None):
+		"""
+		Load the active relationship graph into a CSR snapshot.
+
+		Snapshots are kept per relationship type filter for the lifetime of the
+		engine, so repeated path queries in one request share a single scan.
+
+		Args:
+		    relationship_types: Optional list of relationship types to include
+
+		Returns:
+		    CSRSnapshot, or None if the graph exceeds CSR_SNAPSHOT_MAX_EDGES
+		"""
+		key = tuple(sorted(relationship_types or ()))
+		if key in self._csr_snapshots:
+			return self._csr_snapshots[key]
+
+		filters = {"is_active": 1}
+		if relationship_types:
+			filters["relationship_type"] = ["in", relationship_types]
+
+		snapshot = None
+		if frappe.db.count("Compliance Graph Relationship", filters) <= CSR_SNAPSHOT_MAX_EDGES:
+			relationships = frappe.get_all(
+				"Compliance Graph Relationship",
+				filters=filters,
+				fields=["name", "relationship_type", "source_entity", "target_entity"],
+			)
+			snapshot = CSRSnapshot(relationships)
+
+		self._csr_snapshots[key] = snapshot
+		return snapshot
+
 	def traverse(
 		self,
 		start_entity,
@@ -276,29 +777,26 @@ class GraphQueryEngine:
 		"""
 		entities = {}
 		relationships = []
-		visited = set()
+		visited = {start_entity}
+		loaded = {}  # entity name -> entity dict, or None if missing/inactive
 
 		if include_start:
 			entity = self.get_entity(start_entity)
 			if entity:
 				entities[start_entity] = entity
 
-		queue = deque([(start_entity, 0)])
-		visited.add(start_entity)
+		frontier = [start_entity]
+		depth = 0
 
-		while queue:
-			current, depth = queue.popleft()
+		while frontier and depth < max_depth:
+			level = self._get_frontier_relationships(frontier, relationship_types, direction)
 
-			if depth >= max_depth:
-				continue
+			# One entity query per level instead of one per neighbor
+			self._load_entities([row[1] for row in level if row[1] not in loaded], loaded)
 
-			neighbors = self.get_neighbors(
-				current, relationship_types=relationship_types, direction=direction, max_depth=1
-			)
-
-			for neighbor in neighbors:
-				neighbor_name = neighbor["entity"]
-				entity = self.get_entity(neighbor_name)
+			next_frontier = []
+			for current, neighbor_name, rel_name, rel_type, rel_direction in level:
+				entity = loaded.get(neighbor_name)
 
 				if not entity:
 					continue
@@ -309,10 +807,10 @@ class GraphQueryEngine:
 
 				# Add relationship
 				rel_data = {
-					"name": neighbor["relationship"],
-					"type": neighbor["relationship_type"],
-					"source": current if neighbor["direction"] == "outgoing" else neighbor_name,
-					"target": neighbor_name if neighbor["direction"] == "outgoing" else current,
+					"name": rel_name,
+					"type": rel_type,
+					"source": current if rel_direction == "outgoing" else neighbor_name,
+					"target": neighbor_name if rel_direction == "outgoing" else current,
 				}
 				relationships.append(rel_data)
 
@@ -320,10 +818,81 @@ class GraphQueryEngine:
 				if neighbor_name not in visited:
 					visited.add(neighbor_name)
 					entities[neighbor_name] = entity
-					queue.append((neighbor_name, depth + 1))
+					next_frontier.append(neighbor_name)
+
+			frontier = next_frontier
+			depth += 1
 
 		return {"entities": list(entities.values()), "relationships": relationships, "count": len(entities)}
 
+	def _get_frontier_relationships(self, frontier, relationship_types=None, direction="both"):
+		"""
+		Get the one-hop relationships of every entity in a BFS frontier.
+
+		Issues at most two queries for the whole frontier, fewer when entities
+		are already in the adjacency cache. Each entity keeps one
+		relationship per distinct neighbor, outgoing before incoming, matching
+		get_neighbors(max_depth=1).
+
+		Args:
+		    frontier: List of entity names to expand
+		    relationship_types: Optional list of relationship types to follow
+		    direction: "outgoing", "incoming", or "both"
+
+		Returns:
+		    List of (entity, neighbor, relationship, relationship_type, direction)
+		    tuples grouped by frontier order
+		"""
+		by_entity = {name: [] for name in frontier}
+
+		if direction in ("outgoing", "both"):
+			for name, rels in self._get_adjacency(frontier, relationship_types, "outgoing").items():
+				by_entity[name].extend(
+					(name, rel.target_entity, rel.name, rel.relationship_type, "outgoing") for rel in rels
+				)
+
+		if direction in ("incoming", "both"):
+			for name, rels in self._get_adjacency(frontier, relationship_types, "incoming").items():
+				by_entity[name].extend(
+					(name, rel.source_entity, rel.name, rel.relationship_type, "incoming") for rel in rels
+				)
+
+		rows = []
+		for name in frontier:
+			seen = {name}
+			for row in by_entity[name]:
+				if row[1] not in seen:
+					seen.add(row[1])
+					rows.append(row)
+
+		return rows
+
+	def _load_entities(self, entity_names, loaded):
+		"""
+		Bulk load active entities into a name -> entity dict.
+
+		Names that are missing or inactive are recorded as None so they are
+		not queried again.
+
+		Args:
+		    entity_names: Entity names to load
+		    loaded: Dict updated in place
+		"""
+		entity_names = list(dict.fromkeys(entity_names))
+		if not entity_names:
+			return
+
+		for name in entity_names:
+			loaded[name] = None
+
+		entities = frappe.get_all(
+			"Compliance Graph Entity",
+			filters={"name": ["in", entity_names], "is_active": 1},
+			fields=ENTITY_FIELDS,
+		)
+		for entity in entities:
+			loaded[entity.name] = entity
+
 	def get_subgraph(self, entity_names):
 		"""
 		Get a subgraph containing specified entities and their inter-relationships.
@@ -334,30 +903,38 @@ class GraphQueryEngine:
 		Returns:
 		    Dict with entities and relationships
 		"""
-		entities = []
-		relationships = []
-		entity_set = set(entity_names)
+		if not entity_names:
+			return {"entities": [], "relationships": []}
 
-		# Get all entities
-		for name in entity_names:
-			entity = self.get_entity(name)
-			if entity:
-				entities.append(entity)
+		loaded = frappe.get_all(
+			"Compliance Graph Entity", filters={"name": ["in", entity_names]}, fields=ENTITY_FIELDS
+		)
 
-		# Get relationships between these entities
-		for name in entity_names:
-			outgoing = self._get_outgoing_relationships(name)
-			for rel in outgoing:
-				if rel.target_entity in entity_set:
-					relationships.append(
-						{
-							"name": rel.name,
-							"type": rel.relationship_type,
-							"source": name,
-							"target": rel.target_entity,
-							"weight": rel.weight,
-						}
-					)
+		# Keep the caller's ordering
+		by_name = {entity.name: entity for entity in loaded}
+		entities = [by_name[name] for name in dict.fromkeys(entity_names) if name in by_name]
+
+		# Restrict both endpoints in SQL rather than filtering every outgoing edge in Python
+		inter_relationships = frappe.get_all(
+			"Compliance Graph Relationship",
+			filters={
+				"source_entity": ["in", entity_names],
+				"target_entity": ["in", entity_names],
+				"is_active": 1,
+			},
+			fields=RELATIONSHIP_FIELDS,
+		)
+
+		relationships = [
+			{
+				"name": rel.name,
+				"type": rel.relationship_type,
+				"source": rel.source_entity,
+				"target": rel.target_entity,
+				"weight": rel.weight,
+			}
+			for rel in inter_relationships
+		]
 
 		return {"entities": entities, "relationships": relationships}
 
@@ -406,13 +983,22 @@ class GraphQueryEngine:
 		Returns:
 		    Dict with incoming and outgoing counts
 		"""
-		outgoing = frappe.db.count(
-			"Compliance Graph Relationship", {"source_entity": entity_name, "is_active": 1}
-		)
-
-		incoming = frappe.db.count(
-			"Compliance Graph Relationship", {"target_entity": entity_name, "is_active": 1}
-		)
+		# One pass over both endpoint indexes instead of two COUNT(*) queries
+		counts = frappe.db.sql(
+			"""
+			SELECT
+				COUNT(CASE WHEN source_entity = %(entity)s THEN 1 END) AS outgoing,
+				COUNT(CASE WHEN target_entity = %(entity)s THEN 1 END) AS incoming
+			FROM `tabCompliance Graph Relationship`
+			WHERE (source_entity = %(entity)s OR target_entity = %(entity)s)
+			AND is_active = 1
+		""",
+			{"entity": entity_name},
+			as_dict=True,
+		)[0]
+
+		outgoing = cint(counts.outgoing)
+		incoming = cint(counts.incoming)
 
 		return {"outgoing": outgoing, "incoming": incoming, "total": outgoing + incoming}
 
@@ -542,16 +1128,16 @@ class GraphQueryEngine:
 			if relationship_types:
 				rel_filters["relationship_type"] = ["in", relationship_types]
 
-			relationships = frappe.get_all(
-				"Compliance Graph Relationship",
-				filters=rel_filters,
-				fields=["name", "source_entity", "target_entity"],
-			)
+			# Only edges between loaded nodes, with every field get_vis_edge reads
+			if entity_map:
+				node_names = list(entity_map)
+				rel_filters["source_entity"] = ["in", node_names]
+				rel_filters["target_entity"] = ["in", node_names]
 
-			for rel in relationships:
-				if rel.source_entity in entity_map and rel.target_entity in entity_map:
-					rel_doc = frappe.get_doc("Compliance Graph Relationship", rel.name)
-					edges.append(rel_doc.to_vis_edge())
+				relationships = frappe.get_all(
+					"Compliance Graph Relationship", filters=rel_filters, fields=RELATIONSHIP_FIELDS
+				)
+				edges.extend(get_vis_edge(rel) for rel in relationships)
 
 		return {"nodes": nodes, "edges": edges, "node_count": len(nodes), "edge_count": len(edges)}
 
@@ -576,6 +1162,15 @@ class GraphQueryEngine:
 		Returns:
 		    List of matching subgraphs
 		"""
+		# Memoized per engine: repeated patterns in one request reuse the first result
+		key = json.dumps(pattern, sort_keys=True)
+		if key not in self._pattern_matches:
+			self._pattern_matches[key] = self._match_pattern(pattern)
+
+		return [match.copy() for match in self._pattern_matches[key]]
+
+	def _match_pattern(self, pattern):
+		"""Run the compiled pattern query and collect binding dicts."""
 		matches = []
 		nodes = pattern.get("nodes", [])
 		edges = pattern.get("edges", [])
@@ -583,63 +1178,103 @@ class GraphQueryEngine:
 		if not nodes:
 			return matches
 
-		# Get candidates for first node
-		first_node = nodes[0]
-		candidates = self.get_entities_by_type(first_node["type"])
+		# An edge type with no active relationship can never match; skip the join
+		if any(edge.get("type") not in self._get_relationship_types() for edge in edges):
+			return matches
 
-		for candidate in candidates:
-			# Try to match from this candidate
-			bindings = {first_node["var"]: candidate["name"]}
-			match = self._try_pattern_match(nodes[1:], edges, bindings)
+		query = self._compile_pattern(nodes, edges)
+		if not query:
+			return matches
 
-			if match:
-				matches.append(match)
+		sql, values = query
+		variables = [node["var"] for node in nodes]
+		anchors = set()
 
-		return matches
+		# Keep the first match per binding of the first node
+		for row in frappe.db.sql(sql, values):
+			if row[0] in anchors:
+				continue
 
-	def _try_pattern_match(self, remaining_nodes, edges, bindings):
-		"""Try to complete pattern match with current bindings."""
-		if not remaining_nodes:
-			# Check all edges are satisfied
-			for edge in edges:
-				from_entity = bindings.get(edge["from"])
-				to_entity = bindings.get(edge["to"])
+			anchors.add(row[0])
+			matches.append(dict(zip(variables, row)))
+			if len(matches) >= PATTERN_MATCH_LIMIT:
+				break
 
-				if not from_entity or not to_entity:
-					return None
+		return matches
 
-				# Check relationship exists
-				exists = frappe.db.exists(
+	def _get_relationship_types(self):
+		"""Relationship types with at least one active edge, loaded once per engine."""
+		if self._relationship_types is None:
+			self._relationship_types = frozenset(
+				frappe.get_all(
 					"Compliance Graph Relationship",
-					{
-						"source_entity": from_entity,
-						"target_entity": to_entity,
-						"relationship_type": edge["type"],
-						"is_active": 1,
-					},
+					filters={"is_active": 1},
+					pluck="relationship_type",
+					distinct=True,
 				)
+			)
 
-				if not exists:
-					return None
+		return self._relationship_types
 
-			return bindings.copy()
+	def _compile_pattern(self, nodes, edges):
+		"""
+		Compile a pattern into one SQL join.
 
-		# Try to bind next node
-		next_node = remaining_nodes[0]
-		candidates = self.get_entities_by_type(next_node["type"])
+		Each node becomes an entity alias filtered by type, each edge a
+		relationship alias joining its two nodes. Edges are joined right
+		after the later of their two nodes, so every edge constraint prunes
+		partial matches as soon as both ends are bound. Nodes of the same
+		type must bind distinct entities.
 
-		for candidate in candidates:
-			if candidate["name"] in bindings.values():
-				continue  # Already bound
+		Args:
+		    nodes: Pattern nodes ({"var", "type"})
+		    edges: Pattern edges ({"from", "to", "type"})
 
-			new_bindings = bindings.copy()
-			new_bindings[next_node["var"]] = candidate["name"]
+		Returns:
+		    Tuple of (sql, values), or None if an edge references an unknown variable
+		"""
+		positions = {node["var"]: i for i, node in enumerate(nodes)}
+		aliases = {var: f"n{i}" for var, i in positions.items()}
+		if any(edge["from"] not in aliases or edge["to"] not in aliases for edge in edges):
+			return None
 
-			result = self._try_pattern_match(remaining_nodes[1:], edges, new_bindings)
-			if result:
-				return result
+		# Group edges by the node index at which both of their ends are bound
+		edges_by_node = {}
+		for i, edge in enumerate(edges):
+			bound_at = max(positions[edge["from"]], positions[edge["to"]])
+			edges_by_node.setdefault(bound_at, []).append((i, edge))
+
+		values = {}
+		tables = []
+		for i, node in enumerate(nodes):
+			values[f"type_{i}"] = node["type"]
+			conditions = [f"n{i}.entity_type = %(type_{i})s", f"n{i}.is_active = 1"]
+			conditions.extend(
+				f"n{i}.name != n{j}.name" for j in range(i) if nodes[j]["type"] == node["type"]
+			)
+			tables.append((f"`tabCompliance Graph Entity` n{i}", conditions))
+
+			for e, edge in edges_by_node.get(i, []):
+				values[f"edge_type_{e}"] = edge["type"]
+				tables.append(
+					(
+						f"`tabCompliance Graph Relationship` e{e}",
+						[
+							f"e{e}.source_entity = {aliases[edge['from']]}.name",
+							f"e{e}.target_entity = {aliases[edge['to']]}.name",
+							f"e{e}.relationship_type = %(edge_type_{e})s",
+							f"e{e}.is_active = 1",
+						],
+					)
+				)
 
-		return None
+		# The first table's conditions go in WHERE, every other table joins ON its own
+		(first_table, where), joined = tables[0], tables[1:]
+		joins = "".join(f" JOIN {table} ON {' AND '.join(conditions)}" for table, conditions in joined)
+		columns = ", ".join(f"n{i}.name" for i in range(len(nodes)))
+		sql = f"SELECT DISTINCT {columns} FROM {first_table}{joins} WHERE {' AND '.join(where)}"
+
+		return sql, values
 
 
 # API Endpoints
@@ -701,16 +1336,26 @@ def get_visualization_data(entity_type=None, center_entity=None, depth=2, max_no
 	    center_entity: Optional center entity for ego graph
 	    depth: Traversal depth
 	    max_nodes: Maximum nodes to return
+
+	Returns:
+	    JSON response with the graph under "message", like any frappe.call result
 	"""
 	if not frappe.has_permission("Compliance Graph Entity", "read"):
 		frappe.throw(_("No permission to read graph entities"))
 
 	engine = GraphQueryEngine()
 
-	return engine.get_graph_for_visualization(
+	graph = engine.get_graph_for_visualization(
 		entity_type=entity_type, center_entity=center_entity, depth=cint(depth), max_nodes=cint(max_nodes)
 	)
 
+	# Node and edge lists are the largest payload the app returns; serialize
+	# them with orjson instead of Frappe's stdlib json encoder
+	return Response(
+		orjson.dumps({"message": graph}, default=json_handler),
+		mimetype="application/json",
+	)
+
 
 @frappe.whitelist()
 def get_graph_statistics():
@@ -719,39 +1364,42 @@ def get_graph_statistics():
 		frappe.throw(_("No permission to read graph entities"))
 
 	stats = {
-		"total_entities": frappe.db.count("Compliance Graph Entity", {"is_active": 1}),
-		"total_relationships": frappe.db.count("Compliance Graph Relationship", {"is_active": 1}),
-		"total_paths": frappe.db.count("Compliance Graph Path", {"is_valid": 1}),
+		"total_entities": 0,
+		"total_relationships": 0,
+		"total_paths": 0,
 		"entities_by_type": {},
 		"relationships_by_type": {},
 	}
 
-	# Count by entity type
-	entity_counts = frappe.db.sql(
+	# Per-type counts for both tables plus the valid path count in one round trip;
+	# the entity and relationship totals are the sums of their per-type counts
+	rows = frappe.db.sql(
 		"""
-        SELECT entity_type, COUNT(*) as count
+        SELECT 'entity' as kind, entity_type as type, COUNT(*) as count
         FROM `tabCompliance Graph Entity`
         WHERE is_active = 1
         GROUP BY entity_type
-    """,
-		as_dict=True,
-	)
-
-	for row in entity_counts:
-		stats["entities_by_type"][row.entity_type] = row.count
-
-	# Count by relationship type
-	rel_counts = frappe.db.sql(
-		"""
-        SELECT relationship_type, COUNT(*) as count
+        UNION ALL
+        SELECT 'relationship', relationship_type, COUNT(*)
         FROM `tabCompliance Graph Relationship`
         WHERE is_active = 1
         GROUP BY relationship_type
+        UNION ALL
+        SELECT 'path', NULL, COUNT(*)
+        FROM `tabCompliance Graph Path`
+        WHERE is_valid = 1
     """,
 		as_dict=True,
 	)
 
-	for row in rel_counts:
-		stats["relationships_by_type"][row.relationship_type] = row.count
+	for row in rows:
+		if row.kind == "entity":
+			stats["entities_by_type"][row.type] = row.count
+			stats["total_entities"] += row.count
+		elif row.kind == "relationship":
+			stats["relationships_by_type"][row.type] = row.count
+			stats["total_relationships"] += row.count
+		else:
+			stats["total_paths"] = row.count
 
 	return stats
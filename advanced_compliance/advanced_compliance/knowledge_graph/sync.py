@@ -9,8 +9,25 @@ import json
 
 import frappe
 from frappe import _
+from frappe.model.naming import set_new_name
 from frappe.utils import now_datetime
 
+from advanced_compliance.advanced_compliance.doctype.compliance_graph_entity.compliance_graph_entity import (
+	ComplianceGraphEntity,
+)
+from advanced_compliance.advanced_compliance.doctype.compliance_graph_path.compliance_graph_path import (
+	ComplianceGraphPath,
+)
+from advanced_compliance.advanced_compliance.doctype.compliance_graph_relationship.compliance_graph_relationship import (
+	ComplianceGraphRelationship,
+)
+from advanced_compliance.advanced_compliance.utils.cache import (
+	bump_graph_version,
+	cache_graph_entity,
+	get_cached_graph_entity,
+	invalidate_graph_entity,
+)
+
 # Mapping from DocType to entity type
 DOCTYPE_TO_ENTITY_TYPE = {
 	"Control Activity": "Control",
@@ -103,12 +120,297 @@ RELATIONSHIP_FIELDS = {
 }
 
 
+# Document fields copied into entity properties when set
+COMMON_PROPERTY_FIELDS = ("status", "company", "department")
+PROPERTY_FIELDS = {
+	"Control Activity": (
+		*COMMON_PROPERTY_FIELDS,
+		"control_type",
+		"automation_level",
+		"frequency",
+		"is_key_control",
+	),
+	"Risk Register Entry": (
+		*COMMON_PROPERTY_FIELDS,
+		"risk_category",
+		"likelihood",
+		"impact",
+		"inherent_risk_score",
+	),
+}
+
+
+def _compile_relationship_fields(relationship_fields):
+	"""
+	Flatten RELATIONSHIP_FIELDS into per-DocType tuples for the sync loop.
+
+	Each tuple is (field_name, relationship_type, target_doctype,
+	target_entity_type, swap, link_field). swap is True for incoming
+	relationships, where the linked record is the source. link_field is set
+	only for child tables.
+	"""
+	return {
+		doctype: tuple(
+			(
+				field_name,
+				config["relationship_type"],
+				config["target_doctype"],
+				config["target_entity_type"],
+				config["direction"] == "incoming",
+				config.get("link_field", "name") if config.get("is_child_table") else None,
+			)
+			for field_name, config in fields.items()
+		)
+		for doctype, fields in relationship_fields.items()
+	}
+
+
+COMPILED_RELATIONSHIPS = _compile_relationship_fields(RELATIONSHIP_FIELDS)
+
+# Columns written by flush_pending for queued entities and relationships
+ENTITY_INSERT_FIELDS = (
+	"name",
+	"creation",
+	"modified",
+	"modified_by",
+	"owner",
+	"docstatus",
+	"idx",
+	"entity_type",
+	"entity_doctype",
+	"entity_id",
+	"entity_label",
+	"is_active",
+	"properties",
+	"node_color",
+	"node_size",
+	"created_at",
+	"modified_at",
+)
+RELATIONSHIP_INSERT_FIELDS = (
+	"name",
+	"creation",
+	"modified",
+	"modified_by",
+	"owner",
+	"docstatus",
+	"idx",
+	"relationship_type",
+	"is_active",
+	"source_entity",
+	"source_entity_type",
+	"target_entity",
+	"target_entity_type",
+	"weight",
+	"valid_from",
+	"created_at",
+	"created_by",
+)
+
+# Rows per INSERT statement when flush_pending writes queued rows
+BULK_INSERT_CHUNK_SIZE = 10_000
+
+# Source DocTypes that rebuild_graph syncs after Companies and Departments
+REBUILD_DOCTYPES = ("Control Activity", "Risk Register Entry", "Control Evidence", "Test Execution")
+
+# Queued rows written and committed per chunk during a rebuild
+REBUILD_COMMIT_ROWS = 10_000
+REBUILD_JOB_TIMEOUT = 3600
+
+# Background job id of the graph rebuild, deduplicated so only one runs at a time
+REBUILD_JOB_ID = "rebuild_graph"
+
+
+def _insert_rows(docs, fields):
+	"""Yield one value tuple per queued document, in the order of fields."""
+	for doc in docs:
+		yield tuple(doc.get(field) for field in fields)
+
+
 class GraphSyncEngine:
 	"""Engine for synchronizing DocTypes with the knowledge graph."""
 
 	def __init__(self):
 		"""Initialize the sync engine."""
 		self.entity_cache = {}
+		self._exists = {}
+		self.batch_mode = False
+		self._entity_types = {}
+		self._pending_entities = {}
+		self._pending_names = set()
+		self._pending_relationships = {}
+		self._seen_relationships = set()
+		self._relationships_loaded_for = set()
+		self._all_relationships_loaded = False
+
+	def prime_cache(self):
+		"""
+		Bulk-load lookups that syncing many documents would otherwise repeat.
+
+		Fills entity_cache with every active graph entity, and loads the names
+		of each DocType that relationship fields point at so link targets are
+		checked in memory instead of with one exists query per reference.
+		"""
+		entities = frappe.get_all(
+			"Compliance Graph Entity",
+			filters={"is_active": 1},
+			fields=["name", "entity_type", "entity_doctype", "entity_id"],
+		)
+		for entity in entities:
+			self.entity_cache[f"{entity.entity_doctype}:{entity.entity_id}"] = entity.name
+			self._entity_types[entity.name] = entity.entity_type
+
+		target_doctypes = {
+			config["target_doctype"] for fields in RELATIONSHIP_FIELDS.values() for config in fields.values()
+		}
+		for doctype in target_doctypes:
+			self._exists[doctype] = set(frappe.get_all(doctype, pluck="name"))
+
+		relationships = frappe.get_all(
+			"Compliance Graph Relationship",
+			filters={"is_active": 1},
+			fields=["relationship_type", "source_entity", "target_entity"],
+			as_list=True,
+		)
+		self._seen_relationships.update(map(tuple, relationships))
+		self._all_relationships_loaded = True
+
+	def begin_batch(self):
+		"""
+		Queue new entities and relationships in memory instead of inserting them.
+
+		Primes the caches first, so every entity that already exists is known
+		and only genuinely new rows are queued. Call flush_pending() to write
+		the queue.
+		"""
+		self.prime_cache()
+		self.batch_mode = True
+
+	def flush_pending(self, end_batch=True):
+		"""
+		Bulk insert queued entities and relationships and leave batch mode.
+
+		Args:
+		    end_batch: False keeps queueing after the flush, for chunked writes
+
+		Returns:
+		    Dict with the number of entities and relationships inserted
+		"""
+		entity_count = len(self._pending_entities)
+		relationship_count = len(self._pending_relationships)
+
+		self._set_pending_labels(self._pending_entities.values())
+
+		# Rows are generated chunk by chunk as bulk_insert consumes them, so
+		# no full list of row tuples is built next to the queued documents
+		frappe.db.bulk_insert(
+			"Compliance Graph Entity",
+			fields=ENTITY_INSERT_FIELDS,
+			values=_insert_rows(self._pending_entities.values(), ENTITY_INSERT_FIELDS),
+			chunk_size=BULK_INSERT_CHUNK_SIZE,
+		)
+		frappe.db.bulk_insert(
+			"Compliance Graph Relationship",
+			fields=RELATIONSHIP_INSERT_FIELDS,
+			values=_insert_rows(self._pending_relationships.values(), RELATIONSHIP_INSERT_FIELDS),
+			chunk_size=BULK_INSERT_CHUNK_SIZE,
+		)
+
+		self._pending_entities.clear()
+		self._pending_names.clear()
+		self._pending_relationships.clear()
+		self.batch_mode = not end_batch
+
+		if entity_count or relationship_count:
+			# bulk_insert skips doc events, so bump the graph version here
+			bump_graph_version()
+
+		return {"entities": entity_count, "relationships": relationship_count}
+
+	def _queue_entity(self, entity_type, doctype, doc_name):
+		"""Return the queued entity for a document, queueing a new one if needed."""
+		cache_key = f"{doctype}:{doc_name}"
+		entity = self._pending_entities.get(cache_key)
+		if entity:
+			return entity
+
+		now = now_datetime()
+		entity = frappe.get_doc(
+			{
+				"doctype": "Compliance Graph Entity",
+				"entity_type": entity_type,
+				"entity_doctype": doctype,
+				"entity_id": doc_name,
+				"is_active": 1,
+			}
+		)
+		set_new_name(entity)
+		entity.set_visualization_defaults()
+		self._set_insert_defaults(entity, now)
+		entity.created_at = now
+		entity.modified_at = now
+
+		self._pending_entities[cache_key] = entity
+		self._pending_names.add(entity.name)
+		self.entity_cache[cache_key] = entity.name
+		self._entity_types[entity.name] = entity_type
+		return entity
+
+	def _queue_relationship(self, relationship_type, source_entity, target_entity):
+		"""Queue a relationship unless the same one is already queued."""
+		key = (relationship_type, source_entity, target_entity)
+		if key in self._pending_relationships:
+			return
+
+		now = now_datetime()
+		rel = frappe.get_doc(
+			{
+				"doctype": "Compliance Graph Relationship",
+				"relationship_type": relationship_type,
+				"source_entity": source_entity,
+				"source_entity_type": self._entity_types.get(source_entity),
+				"target_entity": target_entity,
+				"target_entity_type": self._entity_types.get(target_entity),
+				"weight": 1.0,
+				"is_active": 1,
+			}
+		)
+		set_new_name(rel)
+		self._set_insert_defaults(rel, now)
+		rel.valid_from = now
+		rel.created_at = now
+		rel.created_by = frappe.session.user
+
+		self._pending_relationships[key] = rel
+
+	def _set_insert_defaults(self, doc, now):
+		"""Set the standard columns Document.insert would have filled."""
+		doc.creation = doc.modified = now
+		doc.owner = doc.modified_by = frappe.session.user
+		doc.docstatus = 0
+		doc.idx = 0
+
+	def _set_pending_labels(self, entities):
+		"""Set queued entity labels from each source DocType's title field, one query per DocType."""
+		by_doctype = {}
+		for entity in entities:
+			by_doctype.setdefault(entity.entity_doctype, []).append(entity)
+
+		for doctype, doctype_entities in by_doctype.items():
+			titles = {}
+			title_field = frappe.get_meta(doctype).get_title_field()
+			if title_field and title_field != "name":
+				titles = dict(
+					frappe.get_all(
+						doctype,
+						filters={"name": ["in", [entity.entity_id for entity in doctype_entities]]},
+						fields=["name", title_field],
+						as_list=True,
+					)
+				)
+
+			for entity in doctype_entities:
+				entity.entity_label = titles.get(entity.entity_id) or entity.entity_id
 
 	def sync_document(self, doc, event_type="update"):
 		"""
@@ -126,119 +428,104 @@ class GraphSyncEngine:
 
 		if event_type == "delete":
 			self._handle_delete(doc, entity_type)
+		elif event_type == "update" and self._is_graph_unchanged(doc):
+			return  # Only fields the graph does not store were edited
 		else:
 			self._sync_entity(doc, entity_type)
 			self._sync_relationships(doc)
 
+	def _is_graph_unchanged(self, doc):
+		"""Return True if a saved document changed no field the graph reads and already has an entity."""
+		get_doc_before_save = getattr(doc, "get_doc_before_save", None)
+		doc_before_save = get_doc_before_save() if get_doc_before_save else None
+		if doc_before_save is None:
+			return False
+
+		return get_graph_state(doc_before_save) == get_graph_state(doc) and bool(self._get_entity_for_doc(doc))
+
 	def _sync_entity(self, doc, entity_type):
 		"""Create or update entity for document."""
-		from advanced_compliance.advanced_compliance.doctype.compliance_graph_entity.compliance_graph_entity import (
-			ComplianceGraphEntity,
-		)
-
-		entity = ComplianceGraphEntity.get_or_create(
-			entity_type=entity_type, entity_doctype=doc.doctype, entity_id=doc.name
+		cache_key = f"{doc.doctype}:{doc.name}"
+		if self.batch_mode and (cache_key in self._pending_entities or cache_key not in self.entity_cache):
+			# New entity: queue it with its properties for flush_pending
+			entity = self._queue_entity(entity_type, doc.doctype, doc.name)
+			properties = self._extract_properties(doc)
+			if properties:
+				entity.properties = json.dumps(properties, sort_keys=True)
+			return entity
+
+		# Name and stored properties in one query; only a new entity needs a document
+		entity = frappe.db.get_value(
+			"Compliance Graph Entity",
+			{"entity_doctype": doc.doctype, "entity_id": doc.name, "is_active": 1},
+			["name", "properties"],
+			as_dict=True,
 		)
+		if entity:
+			cache_graph_entity(cache_key, entity.name)
+		else:
+			entity = ComplianceGraphEntity.get_or_create(
+				entity_type=entity_type, entity_doctype=doc.doctype, entity_id=doc.name
+			)
 
-		# Update properties
+		# Update properties only when they changed, without a full save
 		properties = self._extract_properties(doc)
 		if properties:
-			entity.properties = json.dumps(properties)
-			entity.save(ignore_permissions=True)
+			properties_json = json.dumps(properties, sort_keys=True)
+			if properties_json != entity.properties:
+				modified_at = now_datetime()
+				frappe.db.set_value(
+					"Compliance Graph Entity",
+					entity.name,
+					{"properties": properties_json, "modified_at": modified_at},
+					update_modified=False,
+				)
+				entity.properties = properties_json
+				entity.modified_at = modified_at
+
+				# set_value skips doc events, so bump the graph version here
+				bump_graph_version()
 
-		self.entity_cache[f"{doc.doctype}:{doc.name}"] = entity.name
+		self.entity_cache[cache_key] = entity.name
 		return entity
 
 	def _extract_properties(self, doc):
 		"""Extract relevant properties from document for graph storage."""
-		properties = {}
-
-		# Common fields to extract
-		common_fields = ["status", "company", "department"]
-		for field in common_fields:
-			if hasattr(doc, field) and doc.get(field):
-				properties[field] = doc.get(field)
-
-		# DocType-specific fields
-		if doc.doctype == "Control Activity":
-			for field in ["control_type", "automation_level", "frequency", "is_key_control"]:
-				if hasattr(doc, field) and doc.get(field):
-					properties[field] = doc.get(field)
-
-		elif doc.doctype == "Risk Register Entry":
-			for field in ["risk_category", "likelihood", "impact", "inherent_risk_score"]:
-				if hasattr(doc, field) and doc.get(field):
-					properties[field] = doc.get(field)
-
-		return properties
+		fields = PROPERTY_FIELDS.get(doc.doctype, COMMON_PROPERTY_FIELDS)
+		return {field: value for field in fields if (value := doc.get(field))}
 
 	def _sync_relationships(self, doc):
 		"""Sync relationships for document."""
-		rel_config = RELATIONSHIP_FIELDS.get(doc.doctype, {})
-
-		for field_name, config in rel_config.items():
-			if config.get("is_child_table"):
-				self._sync_child_table_relationships(doc, field_name, config)
-			else:
-				self._sync_field_relationship(doc, field_name, config)
-
-	def _sync_field_relationship(self, doc, field_name, config):
-		"""Sync relationship from a link field."""
-		target_value = doc.get(field_name)
-		if not target_value:
-			return
-
-		# Get or create source entity
-		source_entity = self._get_entity_for_doc(doc)
-		if not source_entity:
-			return
-
-		# Get or create target entity
-		target_entity = self._get_or_create_entity(
-			config["target_entity_type"], config["target_doctype"], target_value
-		)
-		if not target_entity:
+		compiled = COMPILED_RELATIONSHIPS.get(doc.doctype)
+		if not compiled:
 			return
 
-		# Determine source and target based on direction
-		if config["direction"] == "incoming":
-			rel_source = target_entity
-			rel_target = source_entity
-		else:
-			rel_source = source_entity
-			rel_target = target_entity
-
-		# Create relationship if it doesn't exist
-		self._create_relationship_if_not_exists(config["relationship_type"], rel_source, rel_target)
-
-	def _sync_child_table_relationships(self, doc, field_name, config):
-		"""Sync relationships from a child table."""
-		child_table = doc.get(field_name) or []
-		link_field = config.get("link_field", "name")
-
+		# Every relationship synced here touches the document's own entity
 		source_entity = self._get_entity_for_doc(doc)
 		if not source_entity:
 			return
+		self._load_relationships(source_entity)
 
-		for row in child_table:
-			target_value = row.get(link_field)
-			if not target_value:
-				continue
+		for field_name, relationship_type, target_doctype, target_entity_type, swap, link_field in compiled:
+			if link_field:
+				# Child table: one relationship per linked row
+				targets = [row.get(link_field) for row in doc.get(field_name) or []]
+			else:
+				targets = [doc.get(field_name)]
 
-			target_entity = self._get_or_create_entity(
-				config["target_entity_type"], config["target_doctype"], target_value
-			)
-			if not target_entity:
-				continue
+			for target_value in targets:
+				if not target_value:
+					continue
 
-			if config["direction"] == "incoming":
-				rel_source = target_entity
-				rel_target = source_entity
-			else:
-				rel_source = source_entity
-				rel_target = target_entity
+				target_entity = self._get_or_create_entity(target_entity_type, target_doctype, target_value)
+				if not target_entity:
+					continue
 
-			self._create_relationship_if_not_exists(config["relationship_type"], rel_source, rel_target)
+				if swap:
+					# Incoming: the linked record is the relationship's source
+					self._create_relationship_if_not_exists(relationship_type, target_entity, source_entity)
+				else:
+					self._create_relationship_if_not_exists(relationship_type, source_entity, target_entity)
 
 	def _get_entity_for_doc(self, doc):
 		"""Get entity name for a document."""
@@ -246,15 +533,19 @@ class GraphSyncEngine:
 		if cache_key in self.entity_cache:
 			return self.entity_cache[cache_key]
 
-		entity_type = DOCTYPE_TO_ENTITY_TYPE.get(doc.doctype)
-		if not entity_type:
+		if doc.doctype not in DOCTYPE_TO_ENTITY_TYPE:
 			return None
 
-		entity_name = frappe.db.get_value(
-			"Compliance Graph Entity",
-			{"entity_doctype": doc.doctype, "entity_id": doc.name, "is_active": 1},
-			"name",
-		)
+		# Shared across requests; _handle_delete drops entries
+		entity_name = get_cached_graph_entity(cache_key)
+		if not entity_name:
+			entity_name = frappe.db.get_value(
+				"Compliance Graph Entity",
+				{"entity_doctype": doc.doctype, "entity_id": doc.name, "is_active": 1},
+				"name",
+			)
+			if entity_name:
+				cache_graph_entity(cache_key, entity_name)
 
 		if entity_name:
 			self.entity_cache[cache_key] = entity_name
@@ -267,13 +558,15 @@ class GraphSyncEngine:
 		if cache_key in self.entity_cache:
 			return self.entity_cache[cache_key]
 
-		# Check if document exists
-		if not frappe.db.exists(doctype, doc_name):
+		# Check if document exists, in memory when prime_cache loaded the DocType
+		if doctype in self._exists:
+			if doc_name not in self._exists[doctype]:
+				return None
+		elif not frappe.db.exists(doctype, doc_name):
 			return None
 
-		from advanced_compliance.advanced_compliance.doctype.compliance_graph_entity.compliance_graph_entity import (
-			ComplianceGraphEntity,
-		)
+		if self.batch_mode:
+			return self._queue_entity(entity_type, doctype, doc_name).name
 
 		entity = ComplianceGraphEntity.get_or_create(
 			entity_type=entity_type, entity_doctype=doctype, entity_id=doc_name
@@ -284,7 +577,18 @@ class GraphSyncEngine:
 
 	def _create_relationship_if_not_exists(self, relationship_type, source_entity, target_entity):
 		"""Create relationship if it doesn't already exist."""
-		existing = frappe.db.exists(
+		key = (relationship_type, source_entity, target_entity)
+		if key in self._seen_relationships:
+			return
+
+		self._seen_relationships.add(key)
+		if self.batch_mode and (source_entity in self._pending_names or target_entity in self._pending_names):
+			# A queued entity has no stored relationships yet, so skip the lookup
+			self._queue_relationship(relationship_type, source_entity, target_entity)
+			return
+
+		# Unseen means missing once an endpoint's relationships are loaded
+		existing = not self._is_relationships_loaded(source_entity, target_entity) and frappe.db.exists(
 			"Compliance Graph Relationship",
 			{
 				"relationship_type": relationship_type,
@@ -295,10 +599,6 @@ class GraphSyncEngine:
 		)
 
 		if not existing:
-			from advanced_compliance.advanced_compliance.doctype.compliance_graph_relationship.compliance_graph_relationship import (
-				ComplianceGraphRelationship,
-			)
-
 			# Handle race condition - another process might have created it
 			try:
 				ComplianceGraphRelationship.create_relationship(
@@ -310,18 +610,29 @@ class GraphSyncEngine:
 				# Already exists, ignore
 				pass
 
-	def _handle_delete(self, doc, entity_type):
-		"""Handle document deletion."""
-		from advanced_compliance.advanced_compliance.doctype.compliance_graph_entity.compliance_graph_entity import (
-			ComplianceGraphEntity,
-		)
-		from advanced_compliance.advanced_compliance.doctype.compliance_graph_path.compliance_graph_path import (
-			ComplianceGraphPath,
+	def _load_relationships(self, entity_name):
+		"""Add an entity's active relationships to the seen set with one query."""
+		if self._all_relationships_loaded or entity_name in self._relationships_loaded_for:
+			return
+
+		relationships = frappe.get_all(
+			"Compliance Graph Relationship",
+			filters={"is_active": 1},
+			or_filters=[{"source_entity": entity_name}, {"target_entity": entity_name}],
+			fields=["relationship_type", "source_entity", "target_entity"],
+			as_list=True,
 		)
-		from advanced_compliance.advanced_compliance.doctype.compliance_graph_relationship.compliance_graph_relationship import (
-			ComplianceGraphRelationship,
+		self._seen_relationships.update(map(tuple, relationships))
+		self._relationships_loaded_for.add(entity_name)
+
+	def _is_relationships_loaded(self, *entity_names):
+		"""Return True if the seen set holds every active relationship of one of the entities."""
+		return self._all_relationships_loaded or any(
+			name in self._relationships_loaded_for for name in entity_names
 		)
 
+	def _handle_delete(self, doc, entity_type):
+		"""Handle document deletion."""
 		# Get entity
 		entity_name = frappe.db.get_value(
 			"Compliance Graph Entity",
@@ -339,76 +650,167 @@ class GraphSyncEngine:
 			# Deactivate entity
 			ComplianceGraphEntity.deactivate_for_document(doc.doctype, doc.name)
 
-			# MEDIUM PRIORITY FIX (#17): Clear entity from cache to prevent stale references
-			cache_key = f"{doc.doctype}:{doc.name}"
-			if cache_key in self.entity_cache:
-				del self.entity_cache[cache_key]
+			# Forget the deactivated relationships so they can be recreated
+			self._seen_relationships = {
+				key for key in self._seen_relationships if entity_name not in (key[1], key[2])
+			}
+
+		# MEDIUM PRIORITY FIX (#17): Clear entity from cache to prevent stale references
+		cache_key = f"{doc.doctype}:{doc.name}"
+		self.entity_cache.pop(cache_key, None)
+		if doc.doctype in self._exists:
+			self._exists[doc.doctype].discard(doc.name)
 
+		# Drop the shared entry now, and again on commit in case another
+		# request re-cached the still-active row before this one committed
+		invalidate_graph_entity(cache_key)
+		frappe.db.after_commit.add(lambda: invalidate_graph_entity(cache_key))
 
-# Document event handlers
-def on_control_created(doc, method):
-	"""Handle Control Activity creation."""
+
+def get_graph_state(doc):
+	"""
+	Return the values of every field that graph sync reads from a document.
+
+	Two documents with equal states produce the same entity properties and
+	relationships.
+
+	Args:
+	    doc: Document or row of a DocType mapped in DOCTYPE_TO_ENTITY_TYPE
+
+	Returns:
+	    Tuple of property values, link values and child table link values
+	"""
+	state = [doc.get(field) for field in PROPERTY_FIELDS.get(doc.doctype, COMMON_PROPERTY_FIELDS)]
+	for field_name, _type, _doctype, _entity_type, _swap, link_field in COMPILED_RELATIONSHIPS.get(
+		doc.doctype, ()
+	):
+		if link_field:
+			state.append(tuple(row.get(link_field) for row in doc.get(field_name) or []))
+		else:
+			state.append(doc.get(field_name))
+	return tuple(state)
+
+
+def get_sync_engine():
+	"""
+	Return the request's shared GraphSyncEngine.
+
+	Every document event in a request (e.g. a bulk import firing hundreds of
+	them) reuses one engine and its caches. The engine is kept on
+	frappe.local and dropped on rollback and at the end of the request.
+	"""
+	engine = getattr(frappe.local, "advanced_compliance_sync_engine", None)
+	if engine is None:
+		engine = GraphSyncEngine()
+		frappe.local.advanced_compliance_sync_engine = engine
+
+	# Rolled back rows must not stay in the engine's caches. A commit clears
+	# the after_rollback callbacks, so register once per transaction
+	if not getattr(frappe.local, "advanced_compliance_sync_reset_registered", False):
+		frappe.local.advanced_compliance_sync_reset_registered = True
+		frappe.db.after_rollback.add(reset_sync_engine)
+		frappe.db.after_commit.add(_clear_sync_reset_registration)
+
+	return engine
+
+
+def reset_sync_engine():
+	"""Drop the request's GraphSyncEngine; called on rollback and via the after_request hook."""
+	frappe.local.advanced_compliance_sync_engine = None
+	_clear_sync_reset_registration()
+
+
+def _clear_sync_reset_registration():
+	"""Let the next get_sync_engine call register the rollback reset for the new transaction."""
+	frappe.local.advanced_compliance_sync_reset_registered = False
+
+
+def _sync_on_event(doc, event_type):
+	"""Sync a document with the shared engine unless graph sync is switched off."""
 	# Skip graph sync during demo data generation to avoid deadlocks
 	if frappe.flags.skip_graph_sync:
 		return
-	sync = GraphSyncEngine()
-	sync.sync_document(doc, "create")
+	get_sync_engine().sync_document(doc, event_type)
+
+
+# Document event handlers
+def on_control_created(doc, method):
+	"""Handle Control Activity creation."""
+	_sync_on_event(doc, "create")
 
 
 def on_control_updated(doc, method):
 	"""Handle Control Activity update."""
-	if frappe.flags.skip_graph_sync:
-		return
-	sync = GraphSyncEngine()
-	sync.sync_document(doc, "update")
+	_sync_on_event(doc, "update")
 
 
 def on_control_deleted(doc, method):
 	"""Handle Control Activity deletion."""
-	if frappe.flags.skip_graph_sync:
-		return
-	sync = GraphSyncEngine()
-	sync.sync_document(doc, "delete")
+	_sync_on_event(doc, "delete")
 
 
 def on_risk_created(doc, method):
 	"""Handle Risk Register Entry creation."""
-	if frappe.flags.skip_graph_sync:
-		return
-	sync = GraphSyncEngine()
-	sync.sync_document(doc, "create")
+	_sync_on_event(doc, "create")
 
 
 def on_risk_updated(doc, method):
 	"""Handle Risk Register Entry update."""
-	if frappe.flags.skip_graph_sync:
-		return
-	sync = GraphSyncEngine()
-	sync.sync_document(doc, "update")
+	_sync_on_event(doc, "update")
 
 
 def on_evidence_created(doc, method):
 	"""Handle Control Evidence creation."""
-	if frappe.flags.skip_graph_sync:
-		return
-	sync = GraphSyncEngine()
-	sync.sync_document(doc, "create")
+	_sync_on_event(doc, "create")
 
 
 def on_test_created(doc, method):
 	"""Handle Test Execution creation."""
-	if frappe.flags.skip_graph_sync:
-		return
-	sync = GraphSyncEngine()
-	sync.sync_document(doc, "create")
+	_sync_on_event(doc, "create")
 
 
 def on_test_updated(doc, method):
 	"""Handle Test Execution update."""
-	if frappe.flags.skip_graph_sync:
-		return
-	sync = GraphSyncEngine()
-	sync.sync_document(doc, "update")
+	_sync_on_event(doc, "update")
+
+
+def get_sync_rows(doctype):
+	"""
+	Load every document of a DocType as rows that sync_document accepts.
+
+	Parent columns come from one query, and each child table that
+	RELATIONSHIP_FIELDS reads comes from one query grouped by parent, so
+	no full document is loaded.
+
+	Args:
+	    doctype: Source DocType name
+
+	Returns:
+	    List of frappe._dict rows with doctype set and child rows attached
+	"""
+	rows = frappe.get_all(doctype, fields=["*"])
+	for row in rows:
+		row.doctype = doctype
+
+	for field_name, config in RELATIONSHIP_FIELDS.get(doctype, {}).items():
+		if not config.get("is_child_table"):
+			continue
+
+		link_field = config.get("link_field", "name")
+		child_doctype = frappe.get_meta(doctype).get_field(field_name).options
+		children = {}
+		for child in frappe.get_all(
+			child_doctype,
+			filters={"parenttype": doctype, "parentfield": field_name},
+			fields=["parent", link_field],
+			order_by="idx asc",
+		):
+			children.setdefault(child.parent, []).append(child)
+
+		for row in rows:
+			row[field_name] = children.get(row.name, [])
+
+	return rows
 
 
 @frappe.whitelist()
@@ -416,94 +818,112 @@ def rebuild_graph():
 	"""
 	Rebuild entire knowledge graph from scratch.
 
-	API endpoint for manual graph rebuild.
-	Uses savepoint for transaction safety - if rebuild fails, data is preserved.
+	API endpoint for manual graph rebuild. The rebuild runs as a background
+	job and reports progress through the "graph_rebuild_progress" realtime
+	event. Under tests the job runs inline, so the graph is rebuilt when
+	the call returns.
+
+	Returns:
+	    Dict with the background job id and a message
 	"""
 	if not frappe.has_permission("Compliance Graph Entity", "create"):
 		frappe.throw(_("No permission to rebuild graph"))
 
-	try:
-		# Create savepoint for rollback on failure
-		frappe.db.savepoint("rebuild_graph_start")
+	job = frappe.enqueue(
+		"advanced_compliance.advanced_compliance.knowledge_graph.sync.rebuild_graph_job",
+		queue="long",
+		timeout=REBUILD_JOB_TIMEOUT,
+		job_id=REBUILD_JOB_ID,
+		deduplicate=True,
+		now=frappe.flags.in_test,
+		user=frappe.session.user,
+	)
 
-		# MEDIUM PRIORITY FIX (#15): Use SQL DELETE instead of frappe.db.delete()
-		# frappe.db.delete() may autocommit and bypass savepoint
-		# SQL DELETE respects transaction boundaries and savepoint
-		frappe.db.sql("DELETE FROM `tabCompliance Graph Path`")
-		frappe.db.sql("DELETE FROM `tabCompliance Graph Relationship`")
-		frappe.db.sql("DELETE FROM `tabCompliance Graph Entity`")
+	if not job:
+		# deduplicate=True skips the enqueue while a rebuild is queued or running
+		return {"job_id": None, "message": _("A graph rebuild is already running")}
 
-		sync = GraphSyncEngine()
-		stats = {"entities": 0, "relationships": 0}
+	return {"job_id": REBUILD_JOB_ID, "message": _("Graph rebuild started in background")}
 
-		# Sync Companies first (as they are referenced by other entities)
-		companies = frappe.get_all("Company", pluck="name")
-		for company_name in companies:
-			from advanced_compliance.advanced_compliance.doctype.compliance_graph_entity.compliance_graph_entity import (
-				ComplianceGraphEntity,
-			)
 
-			ComplianceGraphEntity.get_or_create(
-				entity_type="Company", entity_doctype="Company", entity_id=company_name
-			)
-			stats["entities"] += 1
+def rebuild_graph_job(user=None):
+	"""
+	Delete and rebuild every graph entity and relationship.
 
-		# Sync Departments
-		departments = frappe.get_all("Department", pluck="name")
-		for dept_name in departments:
-			from advanced_compliance.advanced_compliance.doctype.compliance_graph_entity.compliance_graph_entity import (
-				ComplianceGraphEntity,
-			)
+	Runs as a background job. Queued rows are flushed and committed every
+	REBUILD_COMMIT_ROWS rows, so memory stays bounded and progress is
+	durable. A failed run leaves a partial graph that the next rebuild
+	replaces.
 
-			ComplianceGraphEntity.get_or_create(
-				entity_type="Department", entity_doctype="Department", entity_id=dept_name
-			)
-			stats["entities"] += 1
-
-		# Sync all Control Activities
-		controls = frappe.get_all("Control Activity", pluck="name")
-		for control_name in controls:
-			doc = frappe.get_doc("Control Activity", control_name)
-			sync.sync_document(doc, "create")
-			stats["entities"] += 1
-
-		# Sync all Risk Register Entries
-		risks = frappe.get_all("Risk Register Entry", pluck="name")
-		for risk_name in risks:
-			doc = frappe.get_doc("Risk Register Entry", risk_name)
-			sync.sync_document(doc, "create")
-			stats["entities"] += 1
-
-		# Sync all Control Evidence
-		evidence = frappe.get_all("Control Evidence", pluck="name")
-		for evidence_name in evidence:
-			doc = frappe.get_doc("Control Evidence", evidence_name)
-			sync.sync_document(doc, "create")
-			stats["entities"] += 1
-
-		# Sync all Test Executions
-		tests = frappe.get_all("Test Execution", pluck="name")
-		for test_name in tests:
-			doc = frappe.get_doc("Test Execution", test_name)
-			sync.sync_document(doc, "create")
-			stats["entities"] += 1
-
-		# Count relationships
-		stats["relationships"] = frappe.db.count("Compliance Graph Relationship")
-
-		# Release savepoint on success
-		frappe.db.release_savepoint("rebuild_graph_start")
-
-		frappe.msgprint(
-			_("Graph rebuilt: {0} entities, {1} relationships").format(
-				stats["entities"], stats["relationships"]
-			)
-		)
+	Args:
+	    user: User who receives the realtime progress events
+	"""
+	try:
+		# TRUNCATE drops the tables' rows without per-row undo logging. It is
+		# DDL and commits implicitly, which the chunked job already accepts
+		for doctype in ("Compliance Graph Path", "Compliance Graph Relationship", "Compliance Graph Entity"):
+			frappe.db.truncate(doctype)
+		invalidate_graph_entity()
 
+		sync = GraphSyncEngine()
+
+		# Queue new entities and relationships for bulk inserts; priming
+		# loads all link targets once
+		sync.begin_batch()
+
+		source_doctypes = ("Company", "Department", *REBUILD_DOCTYPES)
+		total = sum(frappe.db.count(doctype) for doctype in source_doctypes)
+		done = 0
+
+		# Sync Companies and Departments first (as they are referenced by other entities)
+		for doctype in ("Company", "Department"):
+			for doc_name in frappe.get_all(doctype, pluck="name"):
+				sync._get_or_create_entity(doctype, doctype, doc_name)
+				done += 1
+				_flush_rebuild_chunk(sync, done, total, user)
+
+		# Sync Control Activities, Risk Register Entries, Control Evidence and
+		# Test Executions from bulk-loaded rows instead of one get_doc per document
+		for doctype in REBUILD_DOCTYPES:
+			for doc in get_sync_rows(doctype):
+				sync.sync_document(doc, "create")
+				done += 1
+				_flush_rebuild_chunk(sync, done, total, user)
+
+		sync.flush_pending()
+		frappe.db.commit()
+
+		stats = {
+			"entities": frappe.db.count("Compliance Graph Entity"),
+			"relationships": frappe.db.count("Compliance Graph Relationship"),
+		}
+
+		# TRUNCATE above skips doc events, so bump the graph version here
+		bump_graph_version()
+
+		frappe.publish_realtime(
+			"graph_rebuild_progress", {"done": total, "total": total, "stats": stats}, user=user
+		)
 		return stats
 
 	except Exception as e:
-		# Rollback to savepoint on failure - preserves original data
-		frappe.db.rollback(save_point="rebuild_graph_start")
+		frappe.db.rollback()
 		frappe.log_error(message=frappe.get_traceback(), title=_("Graph Rebuild Failed"))
-		frappe.throw(_("Graph rebuild failed. Original data preserved. Error: {0}").format(str(e)))
+		frappe.publish_realtime(
+			"graph_rebuild_progress",
+			{"error": _("Graph rebuild failed. Run it again to rebuild from scratch. Error: {0}").format(str(e))},
+			user=user,
+		)
+		raise
+
+
+def _flush_rebuild_chunk(sync, done, total, user):
+	"""Write and commit the rebuild queue once it holds REBUILD_COMMIT_ROWS rows."""
+	if len(sync._pending_entities) + len(sync._pending_relationships) < REBUILD_COMMIT_ROWS:
+		return
+
+	# Every queued row is complete between documents, so the queue can be written here
+	sync.flush_pending(end_batch=False)
+	frappe.db.commit()
+
+	frappe.publish_realtime("graph_rebuild_progress", {"done": done, "total": total}, user=user)
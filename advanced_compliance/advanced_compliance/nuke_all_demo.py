@@ -3,7 +3,110 @@
 Nuclear option: Delete ALL demo data and start fresh.
 """
 
+import json
+
 import frappe
+from frappe.utils import now_datetime
+
+from advanced_compliance.advanced_compliance.knowledge_graph.sync import DOCTYPE_TO_ENTITY_TYPE
+from advanced_compliance.advanced_compliance.utils.cache import bump_graph_version, invalidate_graph_entity
+
+# (summary key, DocType) in deletion order: dependents before what they reference
+DEMO_DOCTYPES = (
+	("deficiencies", "Deficiency"),
+	("tests", "Test Execution"),
+	("controls", "Control Activity"),
+	("risks", "Risk Register Entry"),
+	("coso", "COSO Principle"),
+	("risk_cats", "Risk Category"),
+	("control_cats", "Control Category"),
+)
+
+
+def _bulk_delete(doctype):
+	"""
+	Delete every row of a DocType and its child tables with plain SQL DELETEs.
+
+	Skips the per-document delete_doc path (hooks, link checks, one child
+	delete per row). Plain SQL stays inside the caller's transaction, unlike
+	frappe.db.delete which may autocommit.
+
+	Returns:
+	    Number of parent rows deleted
+	"""
+	count = frappe.db.count(doctype)
+	if not count:
+		return 0
+
+	for table_field in frappe.get_meta(doctype).get_table_fields():
+		frappe.db.sql(
+			f"DELETE FROM `tab{table_field.options}` WHERE parenttype = %s",
+			doctype,
+		)
+	frappe.db.sql(f"DELETE FROM `tab{doctype}`")
+
+	return count
+
+
+def _deactivate_graph_entities(doctype):
+	"""
+	Deactivate the graph entities of a DocType's documents and their edges.
+
+	Does in bulk what the on_trash graph sync does per document, since the
+	plain SQL deletes skip doc events: relationships touching the entities
+	are closed, computed paths through them are invalidated and the
+	entities are deactivated. The caller clears the entity map and bumps
+	the graph version.
+
+	Returns:
+	    Number of entities deactivated
+	"""
+	if doctype not in DOCTYPE_TO_ENTITY_TYPE:
+		return 0
+
+	entities = set(
+		frappe.get_all(
+			"Compliance Graph Entity",
+			filters={"entity_doctype": doctype, "is_active": 1},
+			pluck="name",
+		)
+	)
+	if not entities:
+		return 0
+
+	now = now_datetime()
+	frappe.db.sql(
+		"""
+		UPDATE `tabCompliance Graph Relationship`
+		SET is_active = 0, valid_to = %(now)s
+		WHERE is_active = 1
+		AND (source_entity IN %(entities)s OR target_entity IN %(entities)s)
+	""",
+		{"entities": tuple(entities), "now": now},
+	)
+
+	invalid_paths = []
+	for path in frappe.get_all(
+		"Compliance Graph Path", filters={"is_valid": 1}, fields=["name", "path_entities"]
+	):
+		try:
+			if entities.intersection(json.loads(path.path_entities or "[]")):
+				invalid_paths.append(path.name)
+		except (json.JSONDecodeError, TypeError):
+			continue
+	if invalid_paths:
+		frappe.db.set_value("Compliance Graph Path", {"name": ["in", invalid_paths]}, "is_valid", 0)
+
+	frappe.db.sql(
+		"""
+		UPDATE `tabCompliance Graph Entity`
+		SET is_active = 0, modified_at = %(now)s
+		WHERE name IN %(entities)s
+	""",
+		{"entities": tuple(entities), "now": now},
+	)
+
+	return len(entities)
 
 
 def nuke_all_demo():
@@ -11,93 +114,32 @@ def nuke_all_demo():
 
 	frappe.set_user("Administrator")
 
-	deleted = {
-		"deficiencies": 0,
-		"tests": 0,
-		"controls": 0,
-		"risks": 0,
-		"coso": 0,
-		"control_cats": 0,
-		"risk_cats": 0,
-	}
-
-	print("=" * 60)
-	print("NUCLEAR OPTION: DELETING ALL DEMO DATA")
-	print("=" * 60)
-
-	# Delete all Deficiencies
-	print("\n1. Deleting ALL Deficiencies...")
-	for name in frappe.get_all("Deficiency", pluck="name"):
-		try:
-			frappe.delete_doc("Deficiency", name, force=True)
-			deleted["deficiencies"] += 1
-		except Exception:
-			pass
-
-	# Delete all Test Executions
-	print("\n2. Deleting ALL Test Executions...")
-	for name in frappe.get_all("Test Execution", pluck="name"):
-		try:
-			frappe.delete_doc("Test Execution", name, force=True)
-			deleted["tests"] += 1
-		except Exception:
-			pass
-
-	# Delete all Control Activities
-	print("\n3. Deleting ALL Control Activities...")
-	controls = frappe.get_all("Control Activity", pluck="name")
-	print(f"   Found {len(controls)} controls to delete")
-	for name in controls:
-		try:
-			frappe.delete_doc("Control Activity", name, force=True)
-			deleted["controls"] += 1
-			if deleted["controls"] % 20 == 0:
-				print(f"   Deleted {deleted['controls']} controls...")
-		except Exception as e:
-			print(f"   Failed: {name}: {str(e)}")
-
-	# Delete all Risk Register Entries
-	print("\n4. Deleting ALL Risk Register Entries...")
-	risks = frappe.get_all("Risk Register Entry", pluck="name")
-	print(f"   Found {len(risks)} risks to delete")
-	for name in risks:
-		try:
-			frappe.delete_doc("Risk Register Entry", name, force=True)
-			deleted["risks"] += 1
-			if deleted["risks"] % 20 == 0:
-				print(f"   Deleted {deleted['risks']} risks...")
-		except Exception as e:
-			print(f"   Failed: {name}: {str(e)}")
-
-	# Delete all COSO Principles
-	print("\n5. Deleting ALL COSO Principles...")
-	for name in frappe.get_all("COSO Principle", pluck="name"):
-		try:
-			frappe.delete_doc("COSO Principle", name, force=True)
-			deleted["coso"] += 1
-		except Exception:
-			pass
-
-	# Delete all Risk Categories
-	print("\n6. Deleting ALL Risk Categories...")
-	for name in frappe.get_all("Risk Category", pluck="name"):
-		try:
-			frappe.delete_doc("Risk Category", name, force=True)
-			deleted["risk_cats"] += 1
-		except Exception:
-			pass
-
-	# Delete all Control Categories
-	print("\n7. Deleting ALL Control Categories...")
-	for name in frappe.get_all("Control Category", pluck="name"):
-		try:
-			frappe.delete_doc("Control Category", name, force=True)
-			deleted["control_cats"] += 1
-		except Exception:
-			pass
+	deleted = {key: 0 for key, _doctype in DEMO_DOCTYPES}
+
+	logger = frappe.logger("advanced_compliance")
+
+	# One savepoint around every delete so a failure leaves all data in place
+	frappe.db.savepoint("nuke_all_demo")
+	try:
+		for key, doctype in DEMO_DOCTYPES:
+			deleted[key] = _bulk_delete(doctype)
+			deactivated = _deactivate_graph_entities(doctype)
+			logger.info(
+				f"nuke_all_demo: deleted {deleted[key]} {doctype} records, "
+				f"deactivated {deactivated} graph entities"
+			)
+	except Exception:
+		# Nothing is swallowed: roll back every delete and surface the error
+		frappe.db.rollback(save_point="nuke_all_demo")
+		raise
 
 	frappe.db.commit()
 
+	# Raw SQL skipped the graph's doc events: drop the entity map and move
+	# analysis caches and snapshots off the old graph version
+	invalidate_graph_entity()
+	bump_graph_version()
+
 	print("\n" + "=" * 60)
 	print("SUMMARY")
 	print("=" * 60)
@@ -478,26 +478,56 @@ class GraphExplorer {
       async () => {
         frappe.show_progress(__("Rebuilding Graph"), 0, 100, __("Starting..."));
 
-        try {
-          const result = await frappe.call({
-            method:
-              "advanced_compliance.advanced_compliance.knowledge_graph.sync.rebuild_graph",
-          });
+        // The rebuild runs in a background job that reports progress here
+        frappe.realtime.off("graph_rebuild_progress");
+        frappe.realtime.on("graph_rebuild_progress", (data) => {
+          if (data.error) {
+            frappe.realtime.off("graph_rebuild_progress");
+            frappe.hide_progress();
+            frappe.msgprint({
+              title: __("Error"),
+              indicator: "red",
+              message: data.error,
+            });
+            return;
+          }
 
-          frappe.hide_progress();
+          frappe.show_progress(
+            __("Rebuilding Graph"),
+            data.done,
+            data.total || 1,
+            __("Synced {0} of {1} documents", [data.done, data.total]),
+          );
 
-          if (result.message) {
+          if (data.stats) {
+            frappe.realtime.off("graph_rebuild_progress");
+            frappe.hide_progress();
             frappe.msgprint({
               title: __("Graph Rebuilt"),
               indicator: "green",
               message: __("Created {0} entities and {1} relationships", [
-                result.message.entities,
-                result.message.relationships,
+                data.stats.entities,
+                data.stats.relationships,
               ]),
             });
             this.load_graph();
           }
+        });
+
+        try {
+          const result = await frappe.call({
+            method:
+              "advanced_compliance.advanced_compliance.knowledge_graph.sync.rebuild_graph",
+          });
+
+          if (result.message && !result.message.job_id) {
+            // Not queued, e.g. a rebuild is already running
+            frappe.realtime.off("graph_rebuild_progress");
+            frappe.hide_progress();
+            frappe.show_alert(result.message.message);
+          }
         } catch (e) {
+          frappe.realtime.off("graph_rebuild_progress");
           frappe.hide_progress();
           frappe.msgprint({
             title: __("Error"),
@@ -6,6 +6,44 @@ These functions are called by Frappe's permission system via hooks.py.
 
 import frappe
 
+# Roles with unrestricted access to compliance records
+ADMIN_ROLES = frozenset(("System Manager", "Compliance Admin"))
+
+# Roles with read access to controls and tests
+READ_ROLES = frozenset(("Compliance Officer", "Compliance Viewer"))
+
+
+def get_user_condition(doctype, fieldname, user):
+	"""
+	Build a list-view condition restricting a user field to the given user.
+
+	The escaped fragment is built once per request and reused on every list
+	refresh and link autocomplete within it.
+
+	Args:
+	    doctype: DocType the condition applies to
+	    fieldname: User field to match
+	    user: User to match
+
+	Returns:
+	    SQL condition string
+	"""
+	conditions = _get_request_cache("compliance_user_conditions")
+	key = (doctype, fieldname, user)
+	if key not in conditions:
+		conditions[key] = f"`tab{doctype}`.{fieldname} = {frappe.db.escape(user)}"
+
+	return conditions[key]
+
+
+def _get_request_cache(name):
+	"""Return a dict stored on frappe.local, which Frappe releases after each request."""
+	cache = getattr(frappe.local, name, None)
+	if cache is None:
+		cache = {}
+		setattr(frappe.local, name, cache)
+	return cache
+
 
 def control_activity_query(user):
 	"""
@@ -17,12 +55,13 @@ def control_activity_query(user):
 		user = frappe.session.user
 
 	# Admins see everything
-	if "System Manager" in frappe.get_roles(user) or "Compliance Admin" in frappe.get_roles(user):
+	roles = frappe.get_roles(user)
+	if not ADMIN_ROLES.isdisjoint(roles):
 		return ""
 
 	# Control owners see only their controls
-	if "Control Owner" in frappe.get_roles(user):
-		return f"`tabControl Activity`.control_owner = {frappe.db.escape(user)}"
+	if "Control Owner" in roles:
+		return get_user_condition("Control Activity", "control_owner", user)
 
 	# Default: show all (read permission handled by DocType permissions)
 	return ""
@@ -33,7 +72,8 @@ def risk_entry_query(user):
 	if not user:
 		user = frappe.session.user
 
-	if "System Manager" in frappe.get_roles(user) or "Compliance Admin" in frappe.get_roles(user):
+	roles = frappe.get_roles(user)
+	if not ADMIN_ROLES.isdisjoint(roles):
 		return ""
 
 	return ""
@@ -44,12 +84,13 @@ def test_execution_query(user):
 	if not user:
 		user = frappe.session.user
 
-	if "System Manager" in frappe.get_roles(user) or "Compliance Admin" in frappe.get_roles(user):
+	roles = frappe.get_roles(user)
+	if not ADMIN_ROLES.isdisjoint(roles):
 		return ""
 
 	# Internal auditors see their tests
-	if "Internal Auditor" in frappe.get_roles(user):
-		return f"`tabTest Execution`.tester = {frappe.db.escape(user)}"
+	if "Internal Auditor" in roles:
+		return get_user_condition("Test Execution", "tester", user)
 
 	return ""
 
@@ -59,7 +100,8 @@ def deficiency_query(user):
 	if not user:
 		user = frappe.session.user
 
-	if "System Manager" in frappe.get_roles(user) or "Compliance Admin" in frappe.get_roles(user):
+	roles = frappe.get_roles(user)
+	if not ADMIN_ROLES.isdisjoint(roles):
 		return ""
 
 	return ""
@@ -86,7 +128,7 @@ def control_activity_permission(doc, ptype=None, user=None, debug=False):
 	roles = frappe.get_roles(user)
 
 	# Admins have full access
-	if "System Manager" in roles or "Compliance Admin" in roles:
+	if not ADMIN_ROLES.isdisjoint(roles):
 		return True
 
 	# Control owners can read and edit their controls
@@ -101,7 +143,7 @@ def control_activity_permission(doc, ptype=None, user=None, debug=False):
 		return True
 
 	# Compliance Officer and Viewer can read
-	if ptype == "read" and ("Compliance Officer" in roles or "Compliance Viewer" in roles):
+	if ptype == "read" and not READ_ROLES.isdisjoint(roles):
 		return True
 
 	# Default: deny access (let DocType permissions handle it via role permissions)
@@ -120,7 +162,7 @@ def test_execution_permission(doc, ptype=None, user=None, debug=False):
 	roles = frappe.get_roles(user)
 
 	# Admins have full access
-	if "System Manager" in roles or "Compliance Admin" in roles:
+	if not ADMIN_ROLES.isdisjoint(roles):
 		return True
 
 	# Internal auditors can read all and submit/cancel their tests
@@ -131,7 +173,7 @@ def test_execution_permission(doc, ptype=None, user=None, debug=False):
 			return doc.tester == user
 
 	# Compliance Officer and Viewer can read
-	if ptype == "read" and ("Compliance Officer" in roles or "Compliance Viewer" in roles):
+	if ptype == "read" and not READ_ROLES.isdisjoint(roles):
 		return True
 
 	# Control Owner can read
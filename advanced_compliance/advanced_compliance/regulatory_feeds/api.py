@@ -9,6 +9,16 @@ Provides whitelisted API methods for regulatory feed operations.
 
 import frappe
 from frappe import _
+from frappe.utils import now_datetime, time_diff_in_hours
+
+from advanced_compliance.advanced_compliance.utils.cache import (
+	REGULATORY_DASHBOARD_KEY,
+	get_local_cached,
+)
+
+# Dashboard counts are aggregates that change only when feeds sync or
+# assessments move, so a short TTL backs up the event-driven invalidation
+REGULATORY_DASHBOARD_TTL = 90
 
 
 @frappe.whitelist()
@@ -19,8 +29,11 @@ def sync_feed(feed_source):
 	Args:
 		feed_source: Regulatory Feed Source name
 
+	The sync runs as a background job so the HTTP worker is not held for
+	the feed fetch and inserts; poll get_feed_sync_status for the result.
+
 	Returns:
-		dict: Sync results with count of new updates
+		dict: Background job id
 	"""
 	if not frappe.has_permission("Regulatory Feed Source", "write"):
 		frappe.throw(
@@ -31,14 +44,53 @@ def sync_feed(feed_source):
 	if not frappe.db.exists("Regulatory Feed Source", feed_source):
 		frappe.throw(_("Regulatory Feed Source {0} does not exist").format(frappe.bold(feed_source)))
 
-	from .connectors import get_connector
+	job = frappe.enqueue(
+		"advanced_compliance.advanced_compliance.regulatory_feeds.connectors.run_sync",
+		queue="short",
+		timeout=300,
+		job_id=get_feed_sync_job_id(feed_source),
+		deduplicate=True,
+		feed_source=feed_source,
+	)
+
+	if not job:
+		# deduplicate=True skips the enqueue while this feed's sync is queued or running
+		return {"success": True, "job_id": None, "message": _("Feed sync is already running")}
+
+	return {"success": True, "job_id": job.id, "message": _("Feed sync started in background")}
+
+
+@frappe.whitelist()
+def get_feed_sync_status(feed_source):
+	"""
+	Get the state of a feed source's background sync.
+
+	Args:
+		feed_source: Regulatory Feed Source name
+
+	Returns:
+		dict: Whether a sync is queued or running, and the last sync result
+	"""
+	if not frappe.has_permission("Regulatory Feed Source", "read"):
+		frappe.throw(_("Insufficient permissions to read Regulatory Feed Source."))
+
+	from frappe.utils.background_jobs import is_job_enqueued
+
+	status = frappe.db.get_value(
+		"Regulatory Feed Source",
+		feed_source,
+		["last_sync", "last_sync_status", "last_error"],
+		as_dict=True,
+	)
+	if not status:
+		frappe.throw(_("Regulatory Feed Source {0} does not exist").format(frappe.bold(feed_source)))
 
-	feed_doc = frappe.get_doc("Regulatory Feed Source", feed_source)
-	connector = get_connector(feed_doc)
+	return {"running": is_job_enqueued(get_feed_sync_job_id(feed_source)), **status}
 
-	count = connector.sync()
 
-	return {"success": True, "updates_count": count, "message": _("{0} new updates synced").format(count)}
+def get_feed_sync_job_id(feed_source):
+	"""Return the background job id used for a feed source's manual sync."""
+	return f"regulatory_feed_sync:{feed_source}"
 
 
 @frappe.whitelist()
@@ -84,20 +136,10 @@ def analyze_update_impact(regulatory_update):
 
 	# Get all changes for this update
 	changes = frappe.get_all(
-		"Regulatory Change", filters={"regulatory_update": regulatory_update}, pluck="name"
+		"Regulatory Change", filters={"regulatory_update": regulatory_update}, fields=["*"]
 	)
 
-	all_assessments = []
-
-	for change_name in changes:
-		# Skip if change was deleted
-		if not frappe.db.exists("Regulatory Change", change_name):
-			continue
-
-		change_doc = frappe.get_doc("Regulatory Change", change_name)
-		mapper = ImpactMapper(change_doc)
-		assessments = mapper.create_impact_assessments()
-		all_assessments.extend(assessments)
+	all_assessments = ImpactMapper.create_impact_assessments_bulk(changes)
 
 	return {"success": True, "assessments_created": len(all_assessments), "assessment_names": all_assessments}
 
@@ -198,35 +240,31 @@ def get_pending_actions(user=None):
 			)
 		)
 
-	assessments = frappe.get_all(
-		"Regulatory Impact Assessment",
-		filters={"assigned_to": user, "status": ["in", ["Pending", "In Progress"]]},
-		fields=[
-			"name",
-			"control_activity",
-			"impact_type",
-			"due_date",
-			"status",
-			"gap_identified",
-			"priority",
-			"confidence_score",
-		],
-		order_by="priority desc, due_date asc",
+	# Join Control Activity so control names come back in the same query, and
+	# rank priority in SQL (a text sort would put Medium before Critical)
+	return frappe.db.sql(
+		"""
+		SELECT
+			ria.name, ria.control_activity, ria.impact_type, ria.due_date, ria.status,
+			ria.gap_identified, ria.priority, ria.confidence_score, ca.control_name
+		FROM `tabRegulatory Impact Assessment` ria
+		LEFT JOIN `tabControl Activity` ca ON ca.name = ria.control_activity
+		WHERE ria.assigned_to = %(user)s
+		AND ria.status IN ('Pending', 'In Progress')
+		ORDER BY
+			CASE ria.priority
+				WHEN 'Critical' THEN 1
+				WHEN 'High' THEN 2
+				WHEN 'Medium' THEN 3
+				WHEN 'Low' THEN 4
+				ELSE 5
+			END,
+			ria.due_date ASC
+		""",
+		{"user": user},
+		as_dict=True,
 	)
 
-	# Enrich with control names - bulk fetch to avoid N+1 queries
-	if assessments:
-		control_ids = [a["control_activity"] for a in assessments if a.get("control_activity")]
-		if control_ids:
-			controls = frappe.get_all(
-				"Control Activity", filters={"name": ["in", control_ids]}, fields=["name", "control_name"]
-			)
-			control_map = {c.name: c.control_name for c in controls}
-			for assessment in assessments:
-				assessment["control_name"] = control_map.get(assessment.get("control_activity"))
-
-	return assessments
-
 
 @frappe.whitelist()
 def get_feed_status():
@@ -257,9 +295,23 @@ def get_feed_status():
 		],
 	)
 
+	# Update counts for every feed in one GROUP BY
+	update_counts = {}
+	if feeds:
+		update_counts = dict(
+			frappe.db.sql(
+				"""
+				SELECT source, COUNT(*)
+				FROM `tabRegulatory Update`
+				WHERE source IN %(sources)s
+				GROUP BY source
+				""",
+				{"sources": tuple(feed["name"] for feed in feeds)},
+			)
+		)
+
 	for feed in feeds:
-		# Get update count
-		feed["update_count"] = frappe.db.count("Regulatory Update", filters={"source": feed["name"]})
+		feed["update_count"] = update_counts.get(feed["name"], 0)
 
 		# Calculate sync status
 		if not feed["last_sync"]:
@@ -269,8 +321,6 @@ def get_feed_status():
 			feed["health"] = "danger"
 			feed["health_message"] = _("Last sync failed")
 		else:
-			from frappe.utils import now_datetime, time_diff_in_hours
-
 			hours_since = time_diff_in_hours(now_datetime(), feed["last_sync"])
 
 			if feed["sync_frequency"] == "Hourly" and hours_since > 2:
@@ -301,32 +351,40 @@ def get_compliance_dashboard_data():
 			)
 		)
 
+	return get_local_cached(
+		REGULATORY_DASHBOARD_KEY, _compute_compliance_dashboard_data, ttl=REGULATORY_DASHBOARD_TTL
+	)
+
+
+def _compute_compliance_dashboard_data():
+	"""Compute the regulatory dashboard; cached by get_compliance_dashboard_data."""
 	from frappe.utils import add_days, nowdate
 
-	# Count by status (using frappe.db.sql for v15/v16 compatibility)
-	updates_by_status = frappe.db.sql(
+	# Every count in one round trip: updates by status, pending assessments,
+	# upcoming deadlines (30 days) and changes by severity
+	counts = frappe.db.sql(
 		"""
-		SELECT status, COUNT(*) as count
+		SELECT 'status' as kind, status as label, COUNT(*) as count
 		FROM `tabRegulatory Update`
 		GROUP BY status
+		UNION ALL
+		SELECT 'pending_assessments', NULL, COUNT(*)
+		FROM `tabRegulatory Impact Assessment`
+		WHERE status IN ('Pending', 'In Progress')
+		UNION ALL
+		SELECT 'upcoming_deadlines', NULL, COUNT(*)
+		FROM `tabRegulatory Update`
+		WHERE effective_date BETWEEN %(today)s AND %(deadline)s
+		AND IFNULL(status, '') NOT IN ('Implemented', 'Not Applicable')
+		UNION ALL
+		SELECT 'severity', severity, COUNT(*)
+		FROM `tabRegulatory Change`
+		GROUP BY severity
 		""",
+		{"today": nowdate(), "deadline": add_days(nowdate(), 30)},
 		as_dict=True,
 	)
 
-	# Pending assessments
-	pending_assessments = frappe.db.count(
-		"Regulatory Impact Assessment", filters={"status": ["in", ["Pending", "In Progress"]]}
-	)
-
-	# Upcoming deadlines (30 days)
-	upcoming_deadline_count = frappe.db.count(
-		"Regulatory Update",
-		filters={
-			"effective_date": ["between", [nowdate(), add_days(nowdate(), 30)]],
-			"status": ["not in", ["Implemented", "Not Applicable"]],
-		},
-	)
-
 	# Recent updates (7 days)
 	recent_updates = frappe.get_all(
 		"Regulatory Update",
@@ -336,23 +394,22 @@ def get_compliance_dashboard_data():
 		limit=5,
 	)
 
-	# Changes by severity (using frappe.db.sql for v15/v16 compatibility)
-	changes_by_severity = frappe.db.sql(
-		"""
-		SELECT severity, COUNT(*) as count
-		FROM `tabRegulatory Change`
-		GROUP BY severity
-		""",
-		as_dict=True,
-	)
-
-	return {
-		"updates_by_status": {item["status"]: item["count"] for item in updates_by_status},
-		"pending_assessments": pending_assessments,
-		"upcoming_deadlines": upcoming_deadline_count,
+	dashboard = {
+		"updates_by_status": {},
+		"pending_assessments": 0,
+		"upcoming_deadlines": 0,
 		"recent_updates": recent_updates,
-		"changes_by_severity": {item["severity"]: item["count"] for item in changes_by_severity},
+		"changes_by_severity": {},
 	}
+	for row in counts:
+		if row.kind == "status":
+			dashboard["updates_by_status"][row.label] = row.count
+		elif row.kind == "severity":
+			dashboard["changes_by_severity"][row.label] = row.count
+		else:
+			dashboard[row.kind] = row.count
+
+	return dashboard
 
 
 @frappe.whitelist()
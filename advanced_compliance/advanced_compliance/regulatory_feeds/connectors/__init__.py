@@ -5,19 +5,74 @@
 Connector Factory
 
 Provides the get_connector function to instantiate the appropriate
-connector based on feed type.
+connector based on feed type, using the CONNECTORS dispatch table.
 """
 
 import frappe
 from frappe import _
 
+# Connector module and class (within this package) for each feed type
+CONNECTORS = {
+	"RSS": ("rss_connector", "RSSConnector"),
+	"SEC EDGAR": ("sec_edgar", "SECEdgarConnector"),
+	"PCAOB": ("pcaob", "PCAOBConnector"),
+	"Custom API": ("custom_api", "CustomAPIConnector"),
+}
+
+# Classes resolved from CONNECTORS, filled on first use
+_connector_classes = {}
+
+# Regulatory Feed Source fields read by the connectors
+FEED_SOURCE_FIELDS = (
+	"name",
+	"source_name",
+	"feed_type",
+	"url",
+	"api_key",
+	"user_agent",
+	"regulatory_body",
+	"last_sync",
+	"document_types",
+	"etag",
+	"last_modified",
+)
+
+
+def get_feed_source(name):
+	"""
+	Load the feed source fields and keywords a connector needs.
+
+	Reads FEED_SOURCE_FIELDS and the keyword rows directly instead of
+	hydrating the full Regulatory Feed Source document.
+
+	Args:
+		name: Regulatory Feed Source name
+
+	Returns:
+		frappe._dict: Feed source with a keywords list
+	"""
+	feed_source = frappe.db.get_value("Regulatory Feed Source", name, FEED_SOURCE_FIELDS, as_dict=True)
+	if not feed_source:
+		frappe.throw(
+			_("Regulatory Feed Source {0} does not exist").format(frappe.bold(name)), frappe.DoesNotExistError
+		)
+
+	feed_source.keywords = frappe.get_all(
+		"Regulatory Keyword",
+		filters={"parent": name, "parenttype": "Regulatory Feed Source", "parentfield": "keywords"},
+		fields=["keyword", "match_type"],
+		order_by="idx asc",
+	)
+
+	return feed_source
+
 
 def get_connector(feed_source):
 	"""
 	Get the appropriate connector for a feed source.
 
 	Args:
-		feed_source: Regulatory Feed Source document or name
+		feed_source: Regulatory Feed Source document, dict from get_feed_source, or name
 
 	Returns:
 		BaseConnector: Connector instance for the feed type
@@ -26,29 +81,46 @@ def get_connector(feed_source):
 		frappe.ValidationError: If feed type is not supported
 	"""
 	if isinstance(feed_source, str):
-		feed_source = frappe.get_doc("Regulatory Feed Source", feed_source)
+		feed_source = get_feed_source(feed_source)
 
-	feed_type = feed_source.feed_type
+	return get_connector_class(feed_source.feed_type)(feed_source)
 
-	if feed_type == "RSS":
-		from .rss_connector import RSSConnector
 
-		return RSSConnector(feed_source)
+def get_connector_class(feed_type):
+	"""
+	Get the connector class for a feed type.
 
-	elif feed_type == "SEC EDGAR":
-		from .sec_edgar import SECEdgarConnector
+	Classes are imported on first use and then served from a module cache.
 
-		return SECEdgarConnector(feed_source)
+	Args:
+		feed_type: Regulatory Feed Source feed type
 
-	elif feed_type == "PCAOB":
-		from .pcaob import PCAOBConnector
+	Returns:
+		type: BaseConnector subclass
 
-		return PCAOBConnector(feed_source)
+	Raises:
+		frappe.ValidationError: If feed type is not supported
+	"""
+	connector_class = _connector_classes.get(feed_type)
+	if connector_class:
+		return connector_class
 
-	elif feed_type == "Custom API":
-		from .custom_api import CustomAPIConnector
+	if feed_type not in CONNECTORS:
+		frappe.throw(_("Unsupported feed type: {0}").format(feed_type))
 
-		return CustomAPIConnector(feed_source)
+	module, class_name = CONNECTORS[feed_type]
+	connector_class = _connector_classes[feed_type] = frappe.get_attr(f"{__name__}.{module}.{class_name}")
+	return connector_class
 
-	else:
-		frappe.throw(_("Unsupported feed type: {0}").format(feed_type))
+
+def run_sync(feed_source):
+	"""
+	Sync a feed source; runs as the background job behind api.sync_feed.
+
+	Args:
+		feed_source: Regulatory Feed Source name
+
+	Returns:
+		int: Number of new updates created
+	"""
+	return get_connector(feed_source).sync()
@@ -7,11 +7,136 @@ Base Connector
 Abstract base class for all regulatory feed connectors.
 """
 
+import re
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 
 import frappe
 from frappe import _
-from frappe.utils import now_datetime
+from frappe.utils import getdate, now_datetime
+
+from advanced_compliance.advanced_compliance.utils.cache import REGULATORY_DASHBOARD_KEY, invalidate_cache
+
+# Lexbor HTML parser, used for feed HTML in place of BeautifulSoup when installed
+try:
+	from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+	LexborHTMLParser = None
+
+# BeautifulSoup tree builder: lxml's C parser when installed
+try:
+	import lxml  # noqa: F401
+
+	HTML_PARSER = "lxml"
+except ImportError:
+	HTML_PARSER = "html.parser"
+
+# Seconds to wait for a feed server before giving up
+HTTP_TIMEOUT = 30
+
+# Keep-alive connections kept per host by the shared HTTP session
+HTTP_POOL_SIZE = 10
+
+# Shared requests session, created on first use by get_http_session
+_http_session = None
+
+# URLs per existence query in BaseConnector.sync
+EXISTS_CHUNK_SIZE = 1000
+
+# New updates written per bulk INSERT and commit in BaseConnector.sync
+INSERT_BATCH_SIZE = 200
+
+# Columns written by BaseConnector._create_updates_bulk
+UPDATE_INSERT_FIELDS = (
+	"name",
+	"creation",
+	"modified",
+	"modified_by",
+	"owner",
+	"docstatus",
+	"idx",
+	"naming_series",
+	"source",
+	"regulatory_body",
+	"title",
+	"publication_date",
+	"effective_date",
+	"days_until_effective",
+	"summary",
+	"full_text",
+	"original_url",
+	"document_type",
+	"status",
+)
+
+
+def get_http_session():
+	"""
+	Get the requests session shared by the connectors.
+
+	Reusing one session keeps TCP/TLS connections to feed hosts open
+	across feeds and syncs, and retries transient server errors.
+
+	Returns:
+		requests.Session: Shared session
+	"""
+	global _http_session
+
+	if _http_session is None:
+		import requests
+		from requests.adapters import HTTPAdapter
+		from urllib3.util.retry import Retry
+
+		adapter = HTTPAdapter(
+			pool_connections=HTTP_POOL_SIZE,
+			pool_maxsize=HTTP_POOL_SIZE,
+			max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504)),
+		)
+		session = requests.Session()
+		session.mount("https://", adapter)
+		session.mount("http://", adapter)
+		_http_session = session
+
+	return _http_session
+
+
+class KeywordClassifier:
+	"""
+	Classify text by ordered keyword rules in a single regex pass.
+
+	Rules are (keyword, value) pairs checked like an if/elif chain: when
+	several keywords occur, the value of the earliest rule wins. All
+	keywords are compiled into one alternation, so the text is scanned
+	once however many rules there are.
+	"""
+
+	def __init__(self, rules, default=None):
+		"""
+		Compile the rules.
+
+		Args:
+			rules: Ordered (keyword, value) pairs, matched case-insensitively
+			default: Value returned when no keyword occurs
+		"""
+		self.default = default
+		self._rules = {keyword.lower(): (priority, value) for priority, (keyword, value) in enumerate(rules)}
+
+		# The lookahead reports every match, including ones overlapping another keyword
+		alternation = "|".join(re.escape(keyword) for keyword, _value in rules)
+		self._pattern = re.compile(f"(?=({alternation}))", re.IGNORECASE)
+
+	def classify(self, text):
+		"""
+		Classify text by the highest-priority keyword it contains.
+
+		Args:
+			text: Text to classify
+
+		Returns:
+			Value of the first matching rule, or the default
+		"""
+		matches = [self._rules[match.group(1).lower()] for match in self._pattern.finditer(text or "")]
+		return min(matches)[1] if matches else self.default
 
 
 class BaseConnector(ABC):
@@ -32,8 +157,27 @@ class BaseConnector(ABC):
 		self.feed_source = feed_source
 		self.url = feed_source.url
 		self.last_sync = feed_source.last_sync
+		# Items published before this date were fetched by an earlier sync
+		self._last_sync_date = getdate(self.last_sync) if self.last_sync else None
 		self.user_agent = feed_source.user_agent or "AdvancedCompliance/1.0"
 
+		# Validators from the last successful fetch, for conditional GETs
+		self.etag = feed_source.get("etag")
+		self.last_modified = feed_source.get("last_modified")
+		self._cache_validators = {}
+
+		# Keyword filters are prepared once here instead of per feed item
+		keywords = feed_source.get("keywords") or []
+		self._has_keywords = bool(keywords)
+		self._kw_contains = [kw.keyword.lower() for kw in keywords if kw.match_type == "Contains"]
+		self._kw_exact = {kw.keyword.lower() for kw in keywords if kw.match_type == "Exact"}
+		self._kw_regex = [
+			re.compile(kw.keyword, re.IGNORECASE) for kw in keywords if kw.match_type == "Regex"
+		]
+		self._allowed_doc_types = frozenset(
+			t.strip().lower() for t in (feed_source.document_types or "").split(",") if t.strip()
+		)
+
 	@abstractmethod
 	def fetch_updates(self):
 		"""
@@ -42,7 +186,7 @@ class BaseConnector(ABC):
 		Must be implemented by subclasses.
 
 		Returns:
-			list: List of dicts with regulatory update data
+			iterable: List (or generator) of dicts with regulatory update data
 		"""
 		pass
 
@@ -78,53 +222,128 @@ class BaseConnector(ABC):
 		Returns:
 			int: Number of new updates processed
 		"""
-		updates = self.fetch_updates()
+		updates = [update_data for update_data in self.fetch_updates() if update_data]
+		existing_urls = self._get_existing_urls(updates)
+		batch = []
 		count = 0
 
 		for update_data in updates:
-			if not update_data:
+			original_url = update_data.get("original_url")
+			if original_url and original_url in existing_urls:
 				continue
 
-			if not self._update_exists(update_data):
-				try:
-					self._create_update(update_data)
-					count += 1
-				except Exception as e:
-					frappe.log_error(
-						message=f"Error creating update: {str(e)}\n" f"Data: {update_data}",
-						title=_("Feed Item Error: {0}").format(self.feed_source.source_name),
-					)
+			if original_url:
+				# Skip repeats of the same URL later in this feed
+				existing_urls.add(original_url)
+
+			batch.append(update_data)
+			if len(batch) >= INSERT_BATCH_SIZE:
+				count += self._create_updates_bulk(batch)
+				batch = []
+
+		if batch:
+			count += self._create_updates_bulk(batch)
 
 		self._update_last_sync()
 		return count
 
-	def _update_exists(self, update_data):
+	def _create_updates_bulk(self, batch):
 		"""
-		Check if update already exists based on original URL.
+		Insert a batch of new Regulatory Updates with one INSERT and one commit.
+
+		Rows are validated and named like Document.insert, then written with
+		frappe.db.bulk_insert. Rows that fail validation go through the
+		row-by-row path, which rejects and logs them. If the bulk insert
+		itself fails, it is rolled back to a savepoint and the whole batch is
+		retried row by row so one bad item does not lose the rest; savepoints
+		keep other uncommitted work, such as another feed's sync status, out
+		of the rollback.
 
 		Args:
-			update_data: Dict with update data
+			batch: List of dicts with update data
 
 		Returns:
-			bool: True if update already exists
+			int: Number of updates created
 		"""
-		original_url = update_data.get("original_url")
-		if not original_url:
-			return False
+		count = 0
+		retry = []
 
-		return frappe.db.exists("Regulatory Update", {"original_url": original_url})
+		frappe.db.savepoint("regulatory_updates_bulk")
+		try:
+			docs = []
+			for update_data in batch:
+				try:
+					docs.append(self._build_update(update_data))
+				except frappe.ValidationError:
+					retry.append(update_data)
+
+			if docs:
+				frappe.db.bulk_insert(
+					"Regulatory Update",
+					fields=UPDATE_INSERT_FIELDS,
+					values=[tuple(doc.get(field) for field in UPDATE_INSERT_FIELDS) for doc in docs],
+				)
+				frappe.db.commit()
+				# bulk_insert skips doc events, so clear the cached dashboard here
+				invalidate_cache(REGULATORY_DASHBOARD_KEY)
+				count = len(docs)
+		except Exception:
+			frappe.db.rollback(save_point="regulatory_updates_bulk")
+			retry = batch
+
+		for update_data in retry:
+			frappe.db.savepoint("regulatory_update_row")
+			try:
+				self._create_update(update_data)
+				count += 1
+			except Exception as e:
+				frappe.db.rollback(save_point="regulatory_update_row")
+				frappe.log_error(
+					message=f"Error creating update: {str(e)}\n" f"Data: {update_data}",
+					title=_("Feed Item Error: {0}").format(self.feed_source.source_name),
+				)
 
-	def _create_update(self, update_data):
+		return count
+
+	def _get_existing_urls(self, updates):
 		"""
-		Create Regulatory Update document.
+		Get the original URLs of updates that already exist.
+
+		Queries in chunks of EXISTS_CHUNK_SIZE URLs so each IN list stays
+		well under MySQL's max_allowed_packet.
+
+		Args:
+			updates: List of dicts with update data
+
+		Returns:
+			set: Original URLs already stored as Regulatory Updates
+		"""
+		urls = list({update_data.get("original_url") for update_data in updates} - {None, ""})
+		existing = set()
+
+		for start in range(0, len(urls), EXISTS_CHUNK_SIZE):
+			existing.update(
+				frappe.get_all(
+					"Regulatory Update",
+					filters={"original_url": ["in", urls[start : start + EXISTS_CHUNK_SIZE]]},
+					pluck="original_url",
+					limit_page_length=0,
+				)
+			)
+
+		return existing
+
+	def _new_update(self, update_data):
+		"""
+		Build an unsaved Regulatory Update document from feed data.
 
 		Args:
 			update_data: Dict with update data
 
 		Returns:
-			Document: Created Regulatory Update document
+			Document: New Regulatory Update document
 		"""
-		doc = frappe.get_doc(
+		return frappe.get_doc(
 			{
 				"doctype": "Regulatory Update",
 				"source": self.feed_source.name,
@@ -139,19 +358,220 @@ class BaseConnector(ABC):
 				"status": "New",
 			}
 		)
+
+	def _build_update(self, update_data):
+		"""
+		Build a named, validated Regulatory Update for bulk_insert.
+
+		Does what Document.insert would for this DocType: mandatory,
+		Select-option and length checks, naming series,
+		RegulatoryUpdate.validate and the standard columns.
+
+		Args:
+			update_data: Dict with update data
+
+		Returns:
+			Document: Regulatory Update ready for bulk_insert
+
+		Raises:
+			frappe.ValidationError: If the row would be rejected by Document.insert
+		"""
+		doc = self._new_update(update_data)
+
+		# Checked before naming so rejected rows do not consume the series
+		doc._validate_mandatory()
+		doc._validate_selects()
+		doc._validate_length()
+
+		doc.set_new_name()
+		doc.calculate_days_until_effective()
+
+		now = now_datetime()
+		doc.creation = doc.modified = now
+		doc.owner = doc.modified_by = frappe.session.user
+		doc.docstatus = 0
+		doc.idx = 0
+
+		return doc
+
+	def _create_update(self, update_data):
+		"""
+		Create Regulatory Update document.
+
+		Args:
+			update_data: Dict with update data
+
+		Returns:
+			Document: Created Regulatory Update document
+		"""
+		doc = self._new_update(update_data)
 		doc.insert(ignore_permissions=True)
 		frappe.db.commit()
 
 		return doc
 
+	def _get_conditional_headers(self):
+		"""
+		Get headers that let the server answer 304 Not Modified.
+
+		Returns:
+			dict: If-None-Match / If-Modified-Since headers for the stored validators
+		"""
+		headers = {}
+		if self.etag:
+			headers["If-None-Match"] = self.etag
+		if self.last_modified:
+			headers["If-Modified-Since"] = self.last_modified
+
+		return headers
+
+	def _set_cache_validators(self, etag, last_modified):
+		"""
+		Remember the validators of a fresh response.
+
+		They are saved with the sync status in _update_last_sync, so a failed
+		sync never causes the next one to skip content.
+
+		Args:
+			etag: ETag response header
+			last_modified: Last-Modified response header
+		"""
+		self._cache_validators = {"etag": etag, "last_modified": last_modified}
+
+	def _fetch_feed(self, feedparser, url):
+		"""
+		Download and parse a feed, as a conditional GET for the source URL.
+
+		When the feed is unchanged the server answers 304 and the result
+		has no entries, so nothing is parsed.
+
+		Args:
+			feedparser: feedparser module
+			url: Feed URL
+
+		Returns:
+			FeedParserDict: Parsed feed
+		"""
+		if url != self.url:
+			return self._download_feed(feedparser, url)
+
+		feed = self._download_feed(feedparser, url, self._get_conditional_headers())
+		if feed.status != 304:
+			self._set_cache_validators(feed.etag, feed.modified)
+
+		return feed
+
+	def _download_feed(self, feedparser, url, headers=None):
+		"""
+		Download a feed over the shared HTTP session and parse its bytes.
+
+		Args:
+			feedparser: feedparser module
+			url: Feed URL
+			headers: Extra request headers
+
+		Returns:
+			FeedParserDict: Parsed feed with status, etag and modified set
+		"""
+		response = get_http_session().get(
+			url, headers={"User-Agent": self.user_agent, **(headers or {})}, timeout=HTTP_TIMEOUT
+		)
+		if response.status_code == 304:
+			feed = feedparser.FeedParserDict(bozo=False, entries=[])
+		else:
+			response.raise_for_status()
+			# Pass the headers so feedparser can detect the content encoding
+			feed = feedparser.parse(
+				response.content, response_headers={k.lower(): v for k, v in response.headers.items()}
+			)
+
+		feed["status"] = response.status_code
+		feed["etag"] = response.headers.get("ETag")
+		feed["modified"] = response.headers.get("Last-Modified")
+		return feed
+
+	def _import_feedparser(self):
+		"""Import feedparser, raising a clear error if it is not installed."""
+		try:
+			import feedparser
+		except ImportError:
+			frappe.throw(
+				_("feedparser package is required. " "Please install it with: pip install feedparser")
+			)
+
+		return feedparser
+
+	def _parse_feed(self, feed):
+		"""
+		Parse the entries of a downloaded feed into filtered updates.
+
+		Args:
+			feed: feedparser result
+
+		Returns:
+			list: List of parsed updates
+		"""
+		if feed.bozo and not feed.entries:
+			return []
+
+		updates = []
+		for entry in feed.entries:
+			parsed = self.parse_item(entry)
+			if parsed:
+				title = parsed.get("title", "")
+				if self._filter_by_keywords(title):
+					doc_type = parsed.get("document_type", "")
+					if self._filter_by_document_types(doc_type):
+						updates.append(parsed)
+
+		return updates
+
+	def _fetch_feeds(self, feeds, max_workers, error_title):
+		"""
+		Download several feeds concurrently and parse them into filtered updates.
+
+		Only the downloads (and feedparser's parse of the bytes) run in
+		worker threads. Entry parsing and error logging stay in this thread,
+		which holds the site's DB connection. A failed feed is logged and
+		the rest are still used.
+
+		Args:
+			feeds: Dict of feed name to feed URL
+			max_workers: Maximum concurrent downloads
+			error_title: Error Log title for a failed feed
+
+		Returns:
+			list: List of parsed updates
+		"""
+		feedparser = self._import_feedparser()
+		with ThreadPoolExecutor(max_workers=min(len(feeds), max_workers)) as executor:
+			futures = {
+				feed_name: executor.submit(self._download_feed, feedparser, feed_url)
+				for feed_name, feed_url in feeds.items()
+			}
+
+		updates = []
+		for feed_name, future in futures.items():
+			try:
+				updates.extend(self._parse_feed(future.result()))
+			except Exception as e:
+				frappe.log_error(message=f"Error fetching {feed_name}: {str(e)}", title=error_title)
+
+		return updates
+
 	def _update_last_sync(self):
-		"""Update last sync timestamp on feed source."""
+		"""
+		Update last sync timestamp and cache validators on feed source.
+
+		Written with one UPDATE that leaves modified alone (sync bookkeeping is
+		not a user edit) and committed by the caller's transaction.
+		"""
 		frappe.db.set_value(
 			"Regulatory Feed Source",
 			self.feed_source.name,
-			{"last_sync": now_datetime(), "last_sync_status": "Success"},
+			{"last_sync": now_datetime(), "last_sync_status": "Success", **self._cache_validators},
+			update_modified=False,
 		)
-		frappe.db.commit()
 
 	def _log_error(self, message, error=None):
 		"""
@@ -177,8 +597,8 @@ class BaseConnector(ABC):
 				"last_sync_status": "Failed",
 				"last_error": str(error)[:500] if error else message[:500],
 			},
+			update_modified=False,
 		)
-		frappe.db.commit()
 
 	def _filter_by_keywords(self, text):
 		"""
@@ -190,29 +610,16 @@ class BaseConnector(ABC):
 		Returns:
 			bool: True if matches keywords or no keywords configured
 		"""
-		keywords = self.feed_source.get("keywords", [])
-		if not keywords:
+		if not self._has_keywords:
 			return True
 
 		text_lower = text.lower()
 
-		for kw in keywords:
-			keyword = kw.keyword.lower()
-			match_type = kw.match_type
-
-			if match_type == "Contains":
-				if keyword in text_lower:
-					return True
-			elif match_type == "Exact":
-				if keyword == text_lower:
-					return True
-			elif match_type == "Regex":
-				import re
-
-				if re.search(keyword, text_lower):
-					return True
-
-		return False
+		return (
+			any(keyword in text_lower for keyword in self._kw_contains)
+			or text_lower in self._kw_exact
+			or any(pattern.search(text) for pattern in self._kw_regex)
+		)
 
 	def _filter_by_document_types(self, doc_type):
 		"""
@@ -224,10 +631,4 @@ class BaseConnector(ABC):
 		Returns:
 			bool: True if matches filter or no filter configured
 		"""
-		doc_types_filter = self.feed_source.document_types
-		if not doc_types_filter:
-			return True
-
-		allowed_types = [t.strip().lower() for t in doc_types_filter.split(",")]
-
-		return doc_type.lower() in allowed_types
+		return not self._allowed_doc_types or doc_type.lower() in self._allowed_doc_types
@@ -7,11 +7,15 @@ Custom API Connector
 Handles fetching from custom REST APIs for regulatory content.
 """
 
-import frappe
+from datetime import date
+from itertools import chain
+
+import orjson
 from frappe import _
 from frappe.utils import getdate
+from frappe.utils.password import get_decrypted_password
 
-from .base_connector import BaseConnector
+from .base_connector import HTTP_TIMEOUT, BaseConnector, get_http_session
 
 
 class CustomAPIConnector(BaseConnector):
@@ -22,6 +26,9 @@ class CustomAPIConnector(BaseConnector):
 	in a configurable format.
 	"""
 
+	# Item fields tried in order for the publication date
+	DATE_FIELDS = ("date", "published", "created", "publication_date")
+
 	def fetch_updates(self):
 		"""
 		Fetch updates from custom API.
@@ -40,51 +47,86 @@ class CustomAPIConnector(BaseConnector):
 			]
 		}
 
-		Returns:
-			list: List of parsed update dicts
-		"""
-		try:
-			import requests
-		except ImportError:
-			frappe.throw(
-				_(
-					"requests package is required for Custom API. "
-					"Please install it with: pip install requests"
-				)
-			)
+		A top-level list of items is accepted too. Items are decoded and
+		filtered one at a time as the body streams in, so a large catalog
+		is never held in memory as one object.
 
+		Yields:
+			dict: Parsed update data
+		"""
 		try:
 			headers = {"User-Agent": self.user_agent, "Accept": "application/json"}
 
 			# Add API key if configured
 			if self.feed_source.api_key:
-				api_key = self.feed_source.get_password("api_key")
+				api_key = get_decrypted_password("Regulatory Feed Source", self.feed_source.name, "api_key")
 				headers["Authorization"] = f"Bearer {api_key}"
 
-			response = requests.get(self.url, headers=headers, timeout=30)
+			# Conditional GET: the server answers 304 when nothing changed
+			headers.update(self._get_conditional_headers())
+
+			response = get_http_session().get(self.url, headers=headers, timeout=HTTP_TIMEOUT, stream=True)
+			if response.status_code == 304:
+				response.close()
+				return
+
 			response.raise_for_status()
-			data = response.json()
 
 		except Exception as e:
 			self._log_error(_("Failed to fetch from API"), e)
-			return []
+			return
+
+		with response:
+			try:
+				for item in self._iter_items(response):
+					parsed = self.parse_item(item)
+					if parsed:
+						title = parsed.get("title", "")
+						if self._filter_by_keywords(title):
+							doc_type = parsed.get("document_type", "")
+							if self._filter_by_document_types(doc_type):
+								yield parsed
+
+			except Exception as e:
+				self._log_error(_("Failed to fetch from API"), e)
+				return
+
+		# Only a fully read response may let the next sync skip it
+		self._set_cache_validators(response.headers.get("ETag"), response.headers.get("Last-Modified"))
+
+	def _iter_items(self, response):
+		"""
+		Iterate the items of an API response as they are decoded.
+
+		Streams the body with ijson when it has a C backend. Otherwise the
+		body is decoded in one go with orjson, which beats ijson's pure
+		Python parser by a wide margin.
+
+		Args:
+			response: Streamed requests response
+
+		Returns:
+			iterable: Item dicts
+		"""
+		try:
+			import ijson
+		except ImportError:
+			ijson = None
 
-		# Parse response
-		items = data.get("items", [])
-		if not items and isinstance(data, list):
-			items = data
+		if not ijson or ijson.backend == "python":
+			data = orjson.loads(response.content)
+			return data if isinstance(data, list) else data.get("items", [])
 
-		updates = []
-		for item in items:
-			parsed = self.parse_item(item)
-			if parsed:
-				title = parsed.get("title", "")
-				if self._filter_by_keywords(title):
-					doc_type = parsed.get("document_type", "")
-					if self._filter_by_document_types(doc_type):
-						updates.append(parsed)
+		response.raw.decode_content = True
+		events = ijson.parse(response.raw)
 
-		return updates
+		# The first event tells whether the body is a list or an object
+		first = next(events, None)
+		if not first:
+			return []
+
+		prefix = "item" if first[1] == "start_array" else "items.item"
+		return ijson.items(chain([first], events), prefix)
 
 	def parse_item(self, item):
 		"""
@@ -98,18 +140,17 @@ class CustomAPIConnector(BaseConnector):
 		"""
 		# Extract date with fallbacks
 		pub_date = None
-		for date_field in ["date", "published", "created", "publication_date"]:
+		for date_field in self.DATE_FIELDS:
 			if item.get(date_field):
 				try:
-					pub_date = getdate(item.get(date_field))
+					pub_date = self._parse_date(item.get(date_field))
 					break
 				except Exception:
 					pass
 
 		# Skip if older than last sync
-		if self.last_sync and pub_date:
-			if pub_date < getdate(self.last_sync):
-				return None
+		if self._last_sync_date and pub_date and pub_date < self._last_sync_date:
+			return None
 
 		# Extract title with fallbacks
 		title = item.get("title") or item.get("name") or item.get("subject", "")
@@ -135,3 +176,24 @@ class CustomAPIConnector(BaseConnector):
 			"regulatory_body": self.feed_source.regulatory_body,
 			"document_type": doc_type,
 		}
+
+	def _parse_date(self, value):
+		"""
+		Parse an API date value.
+
+		ISO 8601 dates and datetimes, the usual API format, are read with
+		date.fromisoformat; anything else goes through getdate.
+
+		Args:
+			value: Date value from the API item
+
+		Returns:
+			date: Parsed date
+		"""
+		if isinstance(value, str):
+			try:
+				return date.fromisoformat(value[:10])
+			except ValueError:
+				pass
+
+		return getdate(value)
@@ -8,11 +8,14 @@ Handles fetching regulatory content from PCAOB
 (Public Company Accounting Oversight Board).
 """
 
-import frappe
+from datetime import date
+
 from frappe import _
-from frappe.utils import getdate
 
-from .base_connector import BaseConnector
+from .base_connector import BaseConnector, KeywordClassifier
+
+# Concurrent feed downloads per sync, kept low to be polite to pcaobus.org
+MAX_FEED_WORKERS = 4
 
 
 class PCAOBConnector(BaseConnector):
@@ -28,6 +31,19 @@ class PCAOBConnector(BaseConnector):
 		"rulemaking": "https://pcaobus.org/oversight/standards/rulemaking-dockets/rss",
 	}
 
+	# Title keyword -> document type, checked in order (first match wins)
+	DOCUMENT_TYPE_CLASSIFIER = KeywordClassifier(
+		(
+			("auditing standard", "Rule"),
+			("proposed", "Proposed Rule"),
+			("guidance", "Guidance"),
+			("staff", "Guidance"),
+			("inspection", "Enforcement"),
+			("release", "Release"),
+		),
+		default="Other",
+	)
+
 	def fetch_updates(self):
 		"""
 		Fetch PCAOB releases.
@@ -35,23 +51,12 @@ class PCAOBConnector(BaseConnector):
 		Returns:
 			list: List of parsed update dicts
 		"""
-		updates = []
-
 		# If specific URL provided, use that
 		if self.url:
-			updates.extend(self._fetch_rss_feed(self.url))
-		else:
-			# Fetch from all PCAOB feeds
-			for feed_name, feed_url in self.PCAOB_FEEDS.items():
-				try:
-					feed_updates = self._fetch_rss_feed(feed_url)
-					updates.extend(feed_updates)
-				except Exception as e:
-					frappe.log_error(
-						message=f"Error fetching {feed_name}: {str(e)}", title=_("PCAOB Feed Error")
-					)
-
-		return updates
+			return self._fetch_rss_feed(self.url)
+
+		# Download all PCAOB feeds concurrently; the fetches are network-bound
+		return self._fetch_feeds(self.PCAOB_FEEDS, MAX_FEED_WORKERS, _("PCAOB Feed Error"))
 
 	def _fetch_rss_feed(self, url):
 		"""
@@ -63,33 +68,15 @@ class PCAOBConnector(BaseConnector):
 		Returns:
 			list: List of parsed updates
 		"""
-		try:
-			import feedparser
-		except ImportError:
-			frappe.throw(
-				_("feedparser package is required. " "Please install it with: pip install feedparser")
-			)
+		feedparser = self._import_feedparser()
 
 		try:
-			feed = feedparser.parse(url, agent=self.user_agent)
+			feed = self._fetch_feed(feedparser, url)
 		except Exception as e:
 			self._log_error(_("Failed to fetch PCAOB feed"), e)
 			return []
 
-		if feed.bozo and not feed.entries:
-			return []
-
-		updates = []
-		for entry in feed.entries:
-			parsed = self.parse_item(entry)
-			if parsed:
-				title = parsed.get("title", "")
-				if self._filter_by_keywords(title):
-					doc_type = parsed.get("document_type", "")
-					if self._filter_by_document_types(doc_type):
-						updates.append(parsed)
-
-		return updates
+		return self._parse_feed(feed)
 
 	def parse_item(self, item):
 		"""
@@ -105,9 +92,8 @@ class PCAOBConnector(BaseConnector):
 		pub_date = self._extract_date(item)
 
 		# Skip if older than last sync
-		if self.last_sync and pub_date:
-			if pub_date < getdate(self.last_sync):
-				return None
+		if self._last_sync_date and pub_date and pub_date < self._last_sync_date:
+			return None
 
 		# Determine document type
 		doc_type = self._classify_document_type(item.get("title", ""))
@@ -137,12 +123,8 @@ class PCAOBConnector(BaseConnector):
 		"""
 		if hasattr(item, "published_parsed") and item.published_parsed:
 			try:
-				return getdate(
-					f"{item.published_parsed.tm_year}-"
-					f"{item.published_parsed.tm_mon:02d}-"
-					f"{item.published_parsed.tm_mday:02d}"
-				)
-			except Exception:
+				return date(*item.published_parsed[:3])
+			except ValueError:
 				pass
 
 		return None
@@ -157,17 +139,8 @@ class PCAOBConnector(BaseConnector):
 		Returns:
 			str: Document type
 		"""
-		title_lower = title.lower()
-
-		if "auditing standard" in title_lower or "AS " in title:
+		# Standard numbers such as "AS 2201" are case-sensitive
+		if "AS " in title:
 			return "Rule"
-		elif "proposed" in title_lower:
-			return "Proposed Rule"
-		elif "guidance" in title_lower or "staff" in title_lower:
-			return "Guidance"
-		elif "inspection" in title_lower:
-			return "Enforcement"
-		elif "release" in title_lower:
-			return "Release"
-		else:
-			return "Other"
+
+		return self.DOCUMENT_TYPE_CLASSIFIER.classify(title)
@@ -7,11 +7,13 @@ RSS Connector
 Handles fetching and parsing of RSS/Atom feeds from regulatory sources.
 """
 
+from datetime import date
+
 import frappe
 from frappe import _
 from frappe.utils import getdate
 
-from .base_connector import BaseConnector
+from .base_connector import HTML_PARSER, BaseConnector, KeywordClassifier, LexborHTMLParser
 
 
 class RSSConnector(BaseConnector):
@@ -22,6 +24,31 @@ class RSSConnector(BaseConnector):
 	including malformed feeds.
 	"""
 
+	# Category keyword -> document type, checked in order (first match wins)
+	CATEGORY_TYPE_CLASSIFIER = KeywordClassifier(
+		(
+			("rule", "Rule"),
+			("guidance", "Guidance"),
+			("release", "Release"),
+			("enforcement", "Enforcement"),
+		)
+	)
+
+	# Title keyword -> document type, checked in order (first match wins)
+	TITLE_TYPE_CLASSIFIER = KeywordClassifier(
+		(
+			("final rule", "Rule"),
+			("proposed rule", "Proposed Rule"),
+			("interpretive", "Interpretation"),
+			("interpretation", "Interpretation"),
+			("guidance", "Guidance"),
+			("amendment", "Amendment"),
+			("enforcement", "Enforcement"),
+			("staff bulletin", "Staff Bulletin"),
+		),
+		default="Release",
+	)
+
 	def fetch_updates(self):
 		"""
 		Fetch and parse RSS feed.
@@ -40,7 +67,7 @@ class RSSConnector(BaseConnector):
 			)
 
 		try:
-			feed = feedparser.parse(self.url, agent=self.user_agent)
+			feed = self._fetch_feed(feedparser, self.url)
 		except Exception as e:
 			self._log_error(_("Failed to fetch RSS feed"), e)
 			return []
@@ -87,9 +114,8 @@ class RSSConnector(BaseConnector):
 		pub_date = self._extract_date(item)
 
 		# Skip if older than last sync
-		if self.last_sync and pub_date:
-			if pub_date < getdate(self.last_sync):
-				return None
+		if self._last_sync_date and pub_date and pub_date < self._last_sync_date:
+			return None
 
 		# Extract content
 		full_text = self._extract_content(item)
@@ -121,23 +147,15 @@ class RSSConnector(BaseConnector):
 		# Try published_parsed first
 		if hasattr(item, "published_parsed") and item.published_parsed:
 			try:
-				return getdate(
-					f"{item.published_parsed.tm_year}-"
-					f"{item.published_parsed.tm_mon:02d}-"
-					f"{item.published_parsed.tm_mday:02d}"
-				)
-			except Exception:
+				return date(*item.published_parsed[:3])
+			except ValueError:
 				pass
 
 		# Try updated_parsed
 		if hasattr(item, "updated_parsed") and item.updated_parsed:
 			try:
-				return getdate(
-					f"{item.updated_parsed.tm_year}-"
-					f"{item.updated_parsed.tm_mon:02d}-"
-					f"{item.updated_parsed.tm_mday:02d}"
-				)
-			except Exception:
+				return date(*item.updated_parsed[:3])
+			except ValueError:
 				pass
 
 		# Try parsing date strings
@@ -229,10 +247,18 @@ class RSSConnector(BaseConnector):
 		if not html_text:
 			return ""
 
+		if LexborHTMLParser:
+			tree = LexborHTMLParser(html_text)
+			# Remove script and style elements
+			for element in tree.css("script, style"):
+				element.decompose()
+			body = tree.body
+			return " ".join(body.text(separator=" ").split()) if body else ""
+
 		try:
 			from bs4 import BeautifulSoup
 
-			soup = BeautifulSoup(html_text, "html.parser")
+			soup = BeautifulSoup(html_text, HTML_PARSER)
 			# Remove script and style elements
 			for element in soup(["script", "style"]):
 				element.decompose()
@@ -258,33 +284,11 @@ class RSSConnector(BaseConnector):
 		# Check categories
 		categories = item.get("tags", []) or item.get("categories", [])
 		for cat in categories:
-			cat_term = cat.get("term", "").lower() if isinstance(cat, dict) else str(cat).lower()
+			cat_term = cat.get("term", "") if isinstance(cat, dict) else str(cat)
 
-			if "rule" in cat_term:
-				return "Rule"
-			elif "guidance" in cat_term:
-				return "Guidance"
-			elif "release" in cat_term:
-				return "Release"
-			elif "enforcement" in cat_term:
-				return "Enforcement"
+			doc_type = self.CATEGORY_TYPE_CLASSIFIER.classify(cat_term)
+			if doc_type:
+				return doc_type
 
 		# Check title
-		title = item.get("title", "").lower()
-
-		if "final rule" in title:
-			return "Rule"
-		elif "proposed rule" in title:
-			return "Proposed Rule"
-		elif "interpretive" in title or "interpretation" in title:
-			return "Interpretation"
-		elif "guidance" in title:
-			return "Guidance"
-		elif "amendment" in title:
-			return "Amendment"
-		elif "enforcement" in title:
-			return "Enforcement"
-		elif "staff bulletin" in title:
-			return "Staff Bulletin"
-
-		return "Release"
+		return self.TITLE_TYPE_CLASSIFIER.classify(item.get("title", ""))
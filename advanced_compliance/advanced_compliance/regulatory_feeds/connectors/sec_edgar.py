@@ -8,11 +8,22 @@ Handles fetching regulatory content from SEC EDGAR system,
 including RSS feeds and the SEC API.
 """
 
+from datetime import date
+
 import frappe
 from frappe import _
-from frappe.utils import getdate
 
-from .base_connector import BaseConnector
+from .base_connector import (
+	HTML_PARSER,
+	HTTP_TIMEOUT,
+	BaseConnector,
+	KeywordClassifier,
+	LexborHTMLParser,
+	get_http_session,
+)
+
+# Concurrent feed downloads per sync, well under SEC's 10 requests/second fair access limit
+MAX_FEED_WORKERS = 5
 
 
 class SECEdgarConnector(BaseConnector):
@@ -32,6 +43,22 @@ class SECEdgarConnector(BaseConnector):
 		"other_releases": "https://www.sec.gov/rules/other.rss",
 	}
 
+	# Title keyword -> document type, checked in order (first match wins)
+	DOCUMENT_TYPE_CLASSIFIER = KeywordClassifier(
+		(
+			("final rule", "Rule"),
+			("proposed rule", "Proposed Rule"),
+			("interpretive", "Interpretation"),
+			("guidance", "Guidance"),
+			("amendment", "Amendment"),
+			("no-action", "Guidance"),
+			("enforcement", "Enforcement"),
+			("charges", "Enforcement"),
+			("staff", "Staff Bulletin"),
+		),
+		default="Release",
+	)
+
 	def fetch_updates(self):
 		"""
 		Fetch SEC filings and releases.
@@ -39,23 +66,12 @@ class SECEdgarConnector(BaseConnector):
 		Returns:
 			list: List of parsed update dicts
 		"""
-		updates = []
-
 		# If specific URL provided, use that
 		if self.url and "sec.gov" in self.url:
-			updates.extend(self._fetch_rss_feed(self.url))
-		else:
-			# Fetch from all SEC feeds
-			for feed_name, feed_url in self.SEC_FEEDS.items():
-				try:
-					feed_updates = self._fetch_rss_feed(feed_url)
-					updates.extend(feed_updates)
-				except Exception as e:
-					frappe.log_error(
-						message=f"Error fetching {feed_name}: {str(e)}", title=_("SEC Feed Error")
-					)
-
-		return updates
+			return self._fetch_rss_feed(self.url)
+
+		# Download all SEC feeds concurrently; the fetches are network-bound
+		return self._fetch_feeds(self.SEC_FEEDS, MAX_FEED_WORKERS, _("SEC Feed Error"))
 
 	def _fetch_rss_feed(self, url):
 		"""
@@ -67,34 +83,15 @@ class SECEdgarConnector(BaseConnector):
 		Returns:
 			list: List of parsed updates
 		"""
-		try:
-			import feedparser
-		except ImportError:
-			frappe.throw(
-				_("feedparser package is required. " "Please install it with: pip install feedparser")
-			)
+		feedparser = self._import_feedparser()
 
 		try:
-			feed = feedparser.parse(url, agent=self.user_agent)
+			feed = self._fetch_feed(feedparser, url)
 		except Exception as e:
 			self._log_error(_("Failed to fetch SEC feed"), e)
 			return []
 
-		if feed.bozo and not feed.entries:
-			return []
-
-		updates = []
-		for entry in feed.entries:
-			parsed = self.parse_item(entry)
-			if parsed:
-				# Apply filters
-				title = parsed.get("title", "")
-				if self._filter_by_keywords(title):
-					doc_type = parsed.get("document_type", "")
-					if self._filter_by_document_types(doc_type):
-						updates.append(parsed)
-
-		return updates
+		return self._parse_feed(feed)
 
 	def parse_item(self, item):
 		"""
@@ -110,9 +107,8 @@ class SECEdgarConnector(BaseConnector):
 		pub_date = self._extract_date(item)
 
 		# Skip if older than last sync
-		if self.last_sync and pub_date:
-			if pub_date < getdate(self.last_sync):
-				return None
+		if self._last_sync_date and pub_date and pub_date < self._last_sync_date:
+			return None
 
 		# Determine document type from title/category
 		doc_type = self._classify_document_type(item.get("title", ""))
@@ -142,12 +138,8 @@ class SECEdgarConnector(BaseConnector):
 		"""
 		if hasattr(item, "published_parsed") and item.published_parsed:
 			try:
-				return getdate(
-					f"{item.published_parsed.tm_year}-"
-					f"{item.published_parsed.tm_mon:02d}-"
-					f"{item.published_parsed.tm_mday:02d}"
-				)
-			except Exception as e:
+				return date(*item.published_parsed[:3])
+			except ValueError as e:
 				frappe.log_error(
 					message=f"Failed to parse published date from SEC EDGAR feed: {str(e)}",
 					title="SEC EDGAR Date Parse Error",
@@ -155,12 +147,8 @@ class SECEdgarConnector(BaseConnector):
 
 		if hasattr(item, "updated_parsed") and item.updated_parsed:
 			try:
-				return getdate(
-					f"{item.updated_parsed.tm_year}-"
-					f"{item.updated_parsed.tm_mon:02d}-"
-					f"{item.updated_parsed.tm_mday:02d}"
-				)
-			except Exception as e:
+				return date(*item.updated_parsed[:3])
+			except ValueError as e:
 				frappe.log_error(
 					message=f"Failed to parse updated date from SEC EDGAR feed: {str(e)}",
 					title="SEC EDGAR Date Parse Error",
@@ -178,26 +166,7 @@ class SECEdgarConnector(BaseConnector):
 		Returns:
 			str: Document type
 		"""
-		title_lower = title.lower()
-
-		if "final rule" in title_lower:
-			return "Rule"
-		elif "proposed rule" in title_lower:
-			return "Proposed Rule"
-		elif "interpretive" in title_lower:
-			return "Interpretation"
-		elif "guidance" in title_lower:
-			return "Guidance"
-		elif "amendment" in title_lower:
-			return "Amendment"
-		elif "no-action" in title_lower:
-			return "Guidance"
-		elif "enforcement" in title_lower or "charges" in title_lower:
-			return "Enforcement"
-		elif "staff" in title_lower:
-			return "Staff Bulletin"
-		else:
-			return "Release"
+		return self.DOCUMENT_TYPE_CLASSIFIER.classify(title)
 
 	def fetch_full_document(self, url):
 		"""
@@ -209,27 +178,26 @@ class SECEdgarConnector(BaseConnector):
 		Returns:
 			str: Full document text
 		"""
-		try:
-			import requests
-			from bs4 import BeautifulSoup
-		except ImportError:
-			return ""
-
 		try:
 			headers = {"User-Agent": self.user_agent}
-			response = requests.get(url, headers=headers, timeout=30)
+			response = get_http_session().get(url, headers=headers, timeout=HTTP_TIMEOUT)
 			response.raise_for_status()
 
-			soup = BeautifulSoup(response.text, "html.parser")
+			if LexborHTMLParser:
+				return self._extract_document_text(response.text)
 
-			# Find main content area
-			content = soup.find("div", {"class": "article-body"})
-			if not content:
-				content = soup.find("div", {"id": "content"})
-			if not content:
-				content = soup.find("main")
+			from bs4 import BeautifulSoup, SoupStrainer
+
+			# Most SEC pages keep the text in div.article-body, so build only that
+			# subtree first; the whole page is parsed only when it is missing
+			content = BeautifulSoup(
+				response.text, HTML_PARSER, parse_only=SoupStrainer("div", {"class": "article-body"})
+			).find("div", {"class": "article-body"})
+
+			# Otherwise fall back to the other main content areas
 			if not content:
-				content = soup.body
+				soup = BeautifulSoup(response.text, HTML_PARSER)
+				content = soup.find("div", {"id": "content"}) or soup.find("main") or soup.body
 
 			if content:
 				# Remove script and style elements
@@ -243,3 +211,30 @@ class SECEdgarConnector(BaseConnector):
 			)
 
 		return ""
+
+	def _extract_document_text(self, html_text):
+		"""
+		Extract the main content text of an SEC page with the Lexbor parser.
+
+		Args:
+			html_text: Page HTML
+
+		Returns:
+			str: Main content text
+		"""
+		tree = LexborHTMLParser(html_text)
+
+		# Find main content area
+		content = (
+			tree.css_first("div.article-body")
+			or tree.css_first("div#content")
+			or tree.css_first("main")
+			or tree.body
+		)
+		if not content:
+			return ""
+
+		# Remove script and style elements
+		for element in content.css("script, style, nav, footer"):
+			element.decompose()
+		return " ".join(content.text(separator=" ").split())
@@ -9,11 +9,129 @@ Includes both text-based and semantic comparison methods.
 """
 
 import difflib
+import threading
 
 import frappe
 from frappe import _
 from frappe.utils import flt
 
+# SequenceMatcher with its matching-block search in C, when installed
+try:
+	from cdifflib import CSequenceMatcher as SequenceMatcher
+except ImportError:
+	from difflib import SequenceMatcher
+
+# Unchanged lines of context around each change, as in a unified diff
+DIFF_CONTEXT_LINES = 3
+
+# C++ Indel similarity, used for whole-document ratios in place of difflib when installed
+try:
+	from rapidfuzz import fuzz
+except ImportError:
+	fuzz = None
+
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# Dynamically quantized INT8 export published alongside the model weights
+QUANTIZED_ONNX_FILE = "onnx/model_quint8_avx2.onnx"
+
+# Texts per forward pass when embedding sections in bulk
+ENCODE_BATCH_SIZE = 64
+
+# Aho-Corasick keyword matching, used for multi-keyword scans when installed
+try:
+	import ahocorasick
+except ImportError:
+	ahocorasick = None
+
+# Words indicating stronger and weaker obligations
+STRONG_OBLIGATIONS = ("must", "shall", "required", "mandatory", "will")
+WEAK_OBLIGATIONS = ("may", "should", "can", "might", "could")
+
+# Severity indicators: new penalties/deficiencies, obligation words, and the
+# optional words a weakened obligation turns into
+CRITICAL_KEYWORDS = (
+	"prohibited",
+	"violation",
+	"penalty",
+	"fine",
+	"material weakness",
+	"significant deficiency",
+)
+MAJOR_KEYWORDS = ("must", "shall", "required", "mandatory")
+OPTIONAL_KEYWORDS = ("may", "should", "can")
+SEVERITY_KEYWORDS = CRITICAL_KEYWORDS + MAJOR_KEYWORDS + OPTIONAL_KEYWORDS
+
+
+def _build_automaton(words):
+	"""
+	Compile words into an Aho-Corasick automaton that reports each word.
+
+	Args:
+		words: Keywords to match
+
+	Returns:
+		ahocorasick.Automaton: Finalized automaton or None without pyahocorasick
+	"""
+	if not ahocorasick:
+		return None
+
+	automaton = ahocorasick.Automaton()
+	for word in words:
+		automaton.add_word(word, word)
+	automaton.make_automaton()
+	return automaton
+
+
+_obligation_automaton = _build_automaton(STRONG_OBLIGATIONS + WEAK_OBLIGATIONS)
+_severity_automaton = _build_automaton(SEVERITY_KEYWORDS)
+
+
+def _find_keywords(text, automaton, words):
+	"""
+	Find which keywords occur in text as substrings.
+
+	Without an automaton each keyword is searched for separately, skipping
+	those whose first character never occurs in the text, which rules out
+	most keywords on short diff hunks.
+
+	Args:
+		text: Lowercased text
+		automaton: Automaton built from words, or None
+		words: Keywords to look for
+
+	Returns:
+		set: Keywords present in text
+	"""
+	if not automaton:
+		chars = set(text)
+		return {word for word in words if word[0] in chars and word in text}
+
+	return {word for _end, word in automaton.iter(text)}
+
+
+def _count_obligation_words(text):
+	"""
+	Count substring occurrences of each obligation word in text.
+
+	With pyahocorasick the text is scanned once for all words; otherwise
+	each word is counted with str.count.
+
+	Args:
+		text: Lowercased text
+
+	Returns:
+		dict: Obligation word -> occurrence count
+	"""
+	if not _obligation_automaton:
+		return {word: text.count(word) for word in STRONG_OBLIGATIONS + WEAK_OBLIGATIONS}
+
+	counts = dict.fromkeys(STRONG_OBLIGATIONS + WEAK_OBLIGATIONS, 0)
+	for _end, word in _obligation_automaton.iter(text):
+		counts[word] += 1
+
+	return counts
+
 
 class ChangeDetector:
 	"""
@@ -49,29 +167,27 @@ class ChangeDetector:
 		"""
 		changes = []
 
-		differ = difflib.unified_diff(self.old_lines, self.new_lines, lineterm="")
-
-		current_change = None
-		diff_lines = list(differ)
-
-		for line in diff_lines:
-			if line.startswith("---") or line.startswith("+++"):
-				continue
-			elif line.startswith("@@"):
-				if current_change:
-					changes.append(current_change)
-				current_change = {
-					"change_type": "Amendment",
-					"removed_text": [],
-					"added_text": [],
-					"location": line,
-				}
-			elif line.startswith("-") and current_change is not None:
-				current_change["removed_text"].append(line[1:])
-			elif line.startswith("+") and current_change is not None:
-				current_change["added_text"].append(line[1:])
-
-		if current_change:
+		# Walk the unified diff hunks as opcodes rather than rendering and
+		# re-parsing the diff text
+		matcher = SequenceMatcher(None, self.old_lines, self.new_lines)
+
+		for group in matcher.get_grouped_opcodes(DIFF_CONTEXT_LINES):
+			first, last = group[0], group[-1]
+			old_range = self._format_range(first[1], last[2])
+			new_range = self._format_range(first[3], last[4])
+			current_change = {
+				"change_type": "Amendment",
+				"removed_text": [],
+				"added_text": [],
+				"location": f"@@ -{old_range} +{new_range} @@",
+			}
+
+			for tag, i1, i2, j1, j2 in group:
+				if tag in ("replace", "delete"):
+					current_change["removed_text"].extend(self.old_lines[i1:i2])
+				if tag in ("replace", "insert"):
+					current_change["added_text"].extend(self.new_lines[j1:j2])
+
 			changes.append(current_change)
 
 		# Classify each change
@@ -95,9 +211,34 @@ class ChangeDetector:
 		if not self.old_text or not self.new_text:
 			return 0.0
 
-		matcher = difflib.SequenceMatcher(None, self.old_text, self.new_text)
+		if fuzz:
+			return fuzz.ratio(self.old_text, self.new_text) / 100.0
+
+		matcher = SequenceMatcher(None, self.old_text, self.new_text)
 		return matcher.ratio()
 
+	@staticmethod
+	def _format_range(start, stop):
+		"""
+		Format a line range the way unified diff hunk headers do.
+
+		Args:
+			start: Zero-based index of the first line
+			stop: Index one past the last line
+
+		Returns:
+			str: Range such as "3,4", "3" for a single line, or "2,0" if empty
+		"""
+		beginning = start + 1
+		length = stop - start
+
+		if length == 1:
+			return str(beginning)
+		if not length:
+			beginning -= 1
+
+		return f"{beginning},{length}"
+
 	def get_diff_html(self):
 		"""
 		Generate HTML diff for display.
@@ -123,36 +264,22 @@ class ChangeDetector:
 		removed = "\n".join(change.get("removed_text", []))
 		added = "\n".join(change.get("added_text", []))
 
-		removed_lower = removed.lower()
-		added_lower = added.lower()
+		# Every severity keyword present on each side, found in one pass
+		removed_hits = _find_keywords(removed.lower(), _severity_automaton, SEVERITY_KEYWORDS)
+		added_hits = _find_keywords(added.lower(), _severity_automaton, SEVERITY_KEYWORDS)
+		new_hits = added_hits - removed_hits
 
 		# Critical indicators - new mandatory requirements
-		critical_keywords = [
-			"prohibited",
-			"violation",
-			"penalty",
-			"fine",
-			"material weakness",
-			"significant deficiency",
-		]
-
-		for keyword in critical_keywords:
-			if keyword in added_lower and keyword not in removed_lower:
-				return "Critical"
+		if new_hits.intersection(CRITICAL_KEYWORDS):
+			return "Critical"
 
 		# Major indicators - obligation changes
-		major_keywords = ["must", "shall", "required", "mandatory"]
-
-		for keyword in major_keywords:
-			if keyword in added_lower and keyword not in removed_lower:
-				return "Major"
+		if new_hits.intersection(MAJOR_KEYWORDS):
+			return "Major"
 
 		# Weakening from mandatory to optional
-		optional_keywords = ["may", "should", "can"]
-		for mandatory in major_keywords:
-			for optional in optional_keywords:
-				if mandatory in removed_lower and optional in added_lower:
-					return "Major"
+		if removed_hits.intersection(MAJOR_KEYWORDS) and added_hits.intersection(OPTIONAL_KEYWORDS):
+			return "Major"
 
 		# Calculate change magnitude
 		total_change = len(removed) + len(added)
@@ -231,21 +358,17 @@ class ChangeDetector:
 		"""
 		changes = []
 
-		# Words indicating stronger obligations
-		strong_obligations = ["must", "shall", "required", "mandatory", "will"]
-		weak_obligations = ["may", "should", "can", "might", "could"]
-
-		old_lower = self.old_text.lower()
-		new_lower = self.new_text.lower()
+		# Count every obligation word once per version
+		old_counts = _count_obligation_words(self.old_text.lower())
+		new_counts = _count_obligation_words(self.new_text.lower())
 
 		# Check for strengthening
-		for weak in weak_obligations:
-			for strong in strong_obligations:
-				# Count occurrences
-				old_weak_count = old_lower.count(weak)
-				new_weak_count = new_lower.count(weak)
-				old_strong_count = old_lower.count(strong)
-				new_strong_count = new_lower.count(strong)
+		for weak in WEAK_OBLIGATIONS:
+			for strong in STRONG_OBLIGATIONS:
+				old_weak_count = old_counts[weak]
+				new_weak_count = new_counts[weak]
+				old_strong_count = old_counts[strong]
+				new_strong_count = new_counts[strong]
 
 				# Strengthening: weak decreased, strong increased
 				if old_weak_count > new_weak_count and new_strong_count > old_strong_count:
@@ -284,22 +407,69 @@ class SemanticChangeDetector:
 	just text similarity.
 	"""
 
+	# Embedding model shared by every detector in the process; loading it
+	# takes a second or two, so it is done once rather than per instance
+	_model = None
+	_model_loaded = False
+	_model_lock = threading.Lock()
+
 	def __init__(self):
 		"""Initialize with embedding model."""
-		self.model = None
-		self._load_model()
+		self.model = self._get_model()
 
-	def _load_model(self):
-		"""Load sentence transformer model."""
+	@classmethod
+	def _get_model(cls):
+		"""
+		Get the shared sentence transformer model, loading it on first use.
+
+		A failed load is remembered too, so a missing package is not
+		re-imported for every detector.
+
+		Returns:
+			SentenceTransformer: Loaded model or None if unavailable
+		"""
+		with cls._model_lock:
+			if not cls._model_loaded:
+				cls._model = cls._load_model()
+				cls._model_loaded = True
+
+		return cls._model
+
+	@staticmethod
+	def _load_model():
+		"""
+		Load sentence transformer model.
+
+		Prefers the INT8-quantized ONNX export of the model, run by ONNX
+		Runtime, which is several times faster on CPU than the FP32 PyTorch
+		weights. Falls back to PyTorch when sentence-transformers has no
+		ONNX backend or onnxruntime/optimum are not installed.
+
+		Returns:
+			SentenceTransformer: Loaded model or None if unavailable
+		"""
 		try:
 			from sentence_transformers import SentenceTransformer
-
-			self.model = SentenceTransformer("all-MiniLM-L6-v2")
 		except ImportError:
-			pass
+			return None
+
+		try:
+			model = SentenceTransformer(
+				EMBEDDING_MODEL, backend="onnx", model_kwargs={"file_name": QUANTIZED_ONNX_FILE}
+			)
+		except Exception:
+			model = None
+
+		try:
+			if model is None:
+				model = SentenceTransformer(EMBEDDING_MODEL)
+			model.eval()
+			return model
 		except Exception as e:
 			frappe.log_error(message=str(e), title=_("Semantic Model Load Error"))
 
+		return None
+
 	def is_available(self):
 		"""Check if semantic analysis is available."""
 		return self.model is not None
@@ -322,12 +492,7 @@ class SemanticChangeDetector:
 			return 0.0
 
 		try:
-			from sklearn.metrics.pairwise import cosine_similarity
-
-			embeddings = self.model.encode([text1, text2])
-			similarity = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
-
-			return flt(similarity, 4)
+			return flt(self._pairwise_similarities([text1], [text2])[0], 4)
 
 		except Exception as e:
 			frappe.log_error(message=str(e), title=_("Semantic Similarity Error"))
@@ -380,6 +545,12 @@ class SemanticChangeDetector:
 
 		all_sections = set(old_sections.keys()) | set(new_sections.keys())
 
+		# Sections present in both versions are embedded together in one batch
+		compared = [
+			section for section in all_sections if old_sections.get(section) and new_sections.get(section)
+		]
+		similarities = dict(zip(compared, self._batch_similarity(compared, old_sections, new_sections)))
+
 		for section in all_sections:
 			old_text = old_sections.get(section, "")
 			new_text = new_sections.get(section, "")
@@ -389,8 +560,61 @@ class SemanticChangeDetector:
 			elif old_text and not new_text:
 				results.append({"section": section, "status": "removed", "similarity": 0.0})
 			else:
-				similarity = self.semantic_similarity(old_text, new_text)
+				similarity = similarities.get(section, 0.0)
 				status = "unchanged" if similarity > 0.85 else "modified"
 				results.append({"section": section, "status": status, "similarity": similarity})
 
 		return results
+
+	def _batch_similarity(self, sections, old_sections, new_sections):
+		"""
+		Calculate semantic similarity for many section pairs at once.
+
+		Args:
+			sections: Section names present in both versions
+			old_sections: Dict of section name -> text
+			new_sections: Dict of section name -> text
+
+		Returns:
+			list: Similarity scores 0.0 to 1.0, in the order of sections
+		"""
+		if not self.model or not sections:
+			return [0.0] * len(sections)
+
+		try:
+			similarities = self._pairwise_similarities(
+				[old_sections[section] for section in sections],
+				[new_sections[section] for section in sections],
+			)
+			return [flt(similarity, 4) for similarity in similarities]
+
+		except Exception as e:
+			frappe.log_error(message=str(e), title=_("Semantic Similarity Error"))
+			return [0.0] * len(sections)
+
+	def _pairwise_similarities(self, old_texts, new_texts):
+		"""
+		Embed both text lists in a single encode call and score each pair.
+
+		Embeddings are L2-normalized, so cosine similarity is a dot product.
+
+		Args:
+			old_texts: List of previous texts
+			new_texts: List of new texts, paired by position with old_texts
+
+		Returns:
+			numpy.ndarray: Cosine similarity per pair
+		"""
+		import torch
+
+		with torch.inference_mode():
+			embeddings = self.model.encode(
+				old_texts + new_texts,
+				batch_size=ENCODE_BATCH_SIZE,
+				convert_to_numpy=True,
+				normalize_embeddings=True,
+			)
+
+		old_embeddings = embeddings[: len(old_texts)]
+		new_embeddings = embeddings[len(old_texts) :]
+		return (old_embeddings * new_embeddings).sum(axis=1)
@@ -10,7 +10,35 @@ multiple matching strategies: citation, keyword, and semantic.
 
 import frappe
 from frappe import _
-from frappe.utils import flt
+from frappe.utils import flt, now_datetime
+
+from advanced_compliance.advanced_compliance.doctype.regulatory_impact_assessment.regulatory_impact_assessment import (
+	get_priority,
+)
+from advanced_compliance.advanced_compliance.utils.cache import REGULATORY_DASHBOARD_KEY, invalidate_cache
+
+# Columns written by ImpactMapper.create_impact_assessments_bulk
+ASSESSMENT_INSERT_FIELDS = (
+	"name",
+	"creation",
+	"modified",
+	"modified_by",
+	"owner",
+	"docstatus",
+	"idx",
+	"naming_series",
+	"regulatory_update",
+	"regulatory_change",
+	"control_activity",
+	"status",
+	"mapping_method",
+	"confidence_score",
+	"matched_citations",
+	"matched_keywords",
+	"impact_type",
+	"gap_identified",
+	"priority",
+)
 
 
 class ImpactMapper:
@@ -23,20 +51,21 @@ class ImpactMapper:
 	3. Semantic matching - AI-based meaning similarity
 	"""
 
-	def __init__(self, regulatory_change):
+	def __init__(self, regulatory_change, regulatory_update=None):
 		"""
 		Initialize with regulatory change.
 
 		Args:
-			regulatory_change: Regulatory Change document or name
+			regulatory_change: Regulatory Change document, row dict or name
+			regulatory_update: Regulatory Update document (loaded from the change if not given)
 		"""
 		if isinstance(regulatory_change, str):
 			regulatory_change = frappe.get_doc("Regulatory Change", regulatory_change)
 
 		self.change = regulatory_change
-		self.update = None
+		self.update = regulatory_update
 
-		if regulatory_change.regulatory_update:
+		if not self.update and regulatory_change.regulatory_update:
 			self.update = frappe.get_doc("Regulatory Update", regulatory_change.regulatory_update)
 
 	def find_affected_controls(self):
@@ -370,50 +399,103 @@ class ImpactMapper:
 		affected_controls = self.find_affected_controls()
 		created = []
 
+		# Controls already assessed for this change, fetched once
+		assessed_controls = set(
+			frappe.get_all(
+				"Regulatory Impact Assessment",
+				filters={"regulatory_change": self.change.name},
+				pluck="control_activity",
+			)
+		)
+
 		for match in affected_controls:
-			if match["confidence"] < min_confidence:
+			if match["confidence"] < min_confidence or match["control"] in assessed_controls:
 				continue
 
-			# Check if assessment already exists
-			exists = frappe.db.exists(
+			try:
+				doc = self._new_assessment(match)
+				doc.insert(ignore_permissions=True)
+				created.append(doc.name)
+
+			except Exception as e:
+				frappe.log_error(
+					message=f"Error creating impact assessment: {str(e)}",
+					title=_("Impact Assessment Creation Error"),
+				)
+
+		frappe.db.commit()
+		return created
+
+	@classmethod
+	def create_impact_assessments_bulk(cls, changes, min_confidence=50.0, regulatory_update=None):
+		"""
+		Create impact assessments for several regulatory changes at once.
+
+		Existing assessments for all changes are fetched in one query and
+		the new ones are written with a single frappe.db.bulk_insert. If the
+		insert fails it is rolled back and retried one document at a time.
+
+		Args:
+			changes: Regulatory Change rows (e.g. from frappe.get_all with fields=["*"])
+			min_confidence: Minimum confidence to create assessment
+			regulatory_update: Regulatory Update document the changes belong to, if already loaded
+
+		Returns:
+			list: Names of created assessment documents
+		"""
+		if not changes:
+			return []
+
+		existing = {
+			tuple(row)
+			for row in frappe.get_all(
 				"Regulatory Impact Assessment",
-				{"regulatory_change": self.change.name, "control_activity": match["control"]},
+				filters={"regulatory_change": ["in", [change.name for change in changes]]},
+				fields=["regulatory_change", "control_activity"],
+				as_list=True,
 			)
+		}
 
-			if exists:
-				continue
+		updates = {regulatory_update.name: regulatory_update} if regulatory_update else {}
+		docs = []
 
-			# Determine impact type based on change severity
-			impact_type = self._determine_impact_type(match)
+		for change in changes:
+			update_name = change.regulatory_update
+			if update_name and update_name not in updates:
+				updates[update_name] = frappe.get_doc("Regulatory Update", update_name)
 
-			# Build matched info
-			matched_citations = ""
-			matched_keywords = ""
+			mapper = cls(change, regulatory_update=updates.get(update_name))
 
-			if match["method"] == "citation":
-				matched_citations = match["matched_on"]
-			elif match["method"] == "keyword":
-				matched_keywords = match["matched_on"]
+			for match in mapper.find_affected_controls():
+				key = (change.name, match["control"])
+				if match["confidence"] < min_confidence or key in existing:
+					continue
 
+				existing.add(key)
+				docs.append(mapper._build_assessment(match))
+
+		if not docs:
+			return []
+
+		frappe.db.savepoint("impact_assessments_bulk")
+		try:
+			frappe.db.bulk_insert(
+				"Regulatory Impact Assessment",
+				fields=ASSESSMENT_INSERT_FIELDS,
+				values=[tuple(doc.get(field) for field in ASSESSMENT_INSERT_FIELDS) for doc in docs],
+			)
+			frappe.db.commit()
+			# bulk_insert skips doc events, so clear the cached dashboard here
+			invalidate_cache(REGULATORY_DASHBOARD_KEY)
+			return [doc.name for doc in docs]
+		except Exception:
+			frappe.db.rollback(save_point="impact_assessments_bulk")
+
+		created = []
+		for doc in docs:
 			try:
-				doc = frappe.get_doc(
-					{
-						"doctype": "Regulatory Impact Assessment",
-						"regulatory_change": self.change.name,
-						"regulatory_update": self.change.regulatory_update,
-						"control_activity": match["control"],
-						"mapping_method": self._map_method_name(match["method"]),
-						"confidence_score": match["confidence"],
-						"matched_citations": matched_citations,
-						"matched_keywords": matched_keywords,
-						"impact_type": impact_type,
-						"gap_identified": impact_type == "New Control Needed",
-						"status": "Pending",
-					}
-				)
-				doc.insert(ignore_permissions=True)
+				doc.insert(ignore_permissions=True, set_name=doc.name)
 				created.append(doc.name)
-
 			except Exception as e:
 				frappe.log_error(
 					message=f"Error creating impact assessment: {str(e)}",
@@ -423,6 +505,70 @@ class ImpactMapper:
 		frappe.db.commit()
 		return created
 
+	def _new_assessment(self, match):
+		"""
+		Build an unsaved Regulatory Impact Assessment for a match.
+
+		Args:
+			match: Match dict with control, confidence, method and matched_on
+
+		Returns:
+			Document: New Regulatory Impact Assessment document
+		"""
+		# Determine impact type based on change severity
+		impact_type = self._determine_impact_type(match)
+
+		# Build matched info
+		matched_citations = ""
+		matched_keywords = ""
+
+		if match["method"] == "citation":
+			matched_citations = match["matched_on"]
+		elif match["method"] == "keyword":
+			matched_keywords = match["matched_on"]
+
+		return frappe.get_doc(
+			{
+				"doctype": "Regulatory Impact Assessment",
+				"regulatory_change": self.change.name,
+				"regulatory_update": self.change.regulatory_update,
+				"control_activity": match["control"],
+				"mapping_method": self._map_method_name(match["method"]),
+				"confidence_score": match["confidence"],
+				"matched_citations": matched_citations,
+				"matched_keywords": matched_keywords,
+				"impact_type": impact_type,
+				"gap_identified": impact_type == "New Control Needed",
+				"status": "Pending",
+			}
+		)
+
+	def _build_assessment(self, match):
+		"""
+		Build a named, validated Regulatory Impact Assessment for bulk_insert.
+
+		Does what Document.insert would for this DocType: naming series,
+		the validate-time priority (from the change severity already in
+		hand) and the standard columns.
+
+		Args:
+			match: Match dict with control, confidence, method and matched_on
+
+		Returns:
+			Document: Regulatory Impact Assessment ready for bulk_insert
+		"""
+		doc = self._new_assessment(match)
+		doc.set_new_name()
+		doc.priority = get_priority(self.change.severity, doc.gap_identified)
+
+		now = now_datetime()
+		doc.creation = doc.modified = now
+		doc.owner = doc.modified_by = frappe.session.user
+		doc.docstatus = 0
+		doc.idx = 0
+
+		return doc
+
 	def _determine_impact_type(self, match):
 		"""
 		Determine type of impact on control.
@@ -30,8 +30,7 @@ def sync_high_priority_feeds():
 
 	for feed_name in feeds:
 		try:
-			feed_doc = frappe.get_doc("Regulatory Feed Source", feed_name)
-			connector = get_connector(feed_doc)
+			connector = get_connector(feed_name)
 			count = connector.sync()
 
 			if count > 0:
@@ -61,8 +60,7 @@ def sync_all_feeds():
 
 	for feed_name in feeds:
 		try:
-			feed_doc = frappe.get_doc("Regulatory Feed Source", feed_name)
-			connector = get_connector(feed_doc)
+			connector = get_connector(feed_name)
 			count = connector.sync()
 			total_updates += count
 
@@ -107,7 +105,7 @@ def analyze_new_updates():
 
 			# Get or create changes for this update
 			changes = frappe.get_all(
-				"Regulatory Change", filters={"regulatory_update": update_doc.name}, pluck="name"
+				"Regulatory Change", filters={"regulatory_update": update_doc.name}, fields=["*"]
 			)
 
 			# If no changes exist, create one from the update content
@@ -124,17 +122,14 @@ def analyze_new_updates():
 					}
 				)
 				change_doc.insert(ignore_permissions=True)
-				changes = [change_doc.name]
+				changes = [change_doc]
 
-			# Create impact assessments for each change
-			for change_name in changes:
-				change_doc = frappe.get_doc("Regulatory Change", change_name)
-				mapper = ImpactMapper(change_doc)
-				assessments = mapper.create_impact_assessments()
+			# Create impact assessments for all changes at once
+			assessments = ImpactMapper.create_impact_assessments_bulk(changes, regulatory_update=update_doc)
 
-				# Notify for each assessment
-				for assessment_name in assessments:
-					alert_manager.notify_impact_assessment(assessment_name)
+			# Notify for each assessment
+			for assessment_name in assessments:
+				alert_manager.notify_impact_assessment(assessment_name)
 
 			# Update status
 			if changes:
@@ -406,6 +406,105 @@ class TestGraphSyncEngine(unittest.TestCase):
 		self.assertIn("control_owner", control_config)
 		self.assertEqual(control_config["control_owner"]["relationship_type"], "OWNS")
 
+	def test_04_prime_cache(self):
+		"""Test prime_cache loads active entities and link target names."""
+		from advanced_compliance.advanced_compliance.knowledge_graph.sync import GraphSyncEngine
+
+		entity = create_test_entity("Person", "User", "Administrator", "Admin User")
+
+		engine = GraphSyncEngine()
+		engine.prime_cache()
+
+		self.assertIn("User:Administrator", engine.entity_cache)
+		self.assertIn("Administrator", engine._exists["User"])
+
+		# Link targets that do not exist are rejected without a query
+		self.assertIsNone(engine._get_or_create_entity("Person", "User", "no-such-user@example.com"))
+
+	def test_05_get_sync_rows(self):
+		"""Test bulk-loaded sync rows carry the doctype and child table rows."""
+		from advanced_compliance.advanced_compliance.knowledge_graph.sync import get_sync_rows
+
+		for row in get_sync_rows("Control Activity"):
+			self.assertEqual(row.doctype, "Control Activity")
+			self.assertIsInstance(row.risks_addressed, list)
+
+	def test_06_batch_mode_flush(self):
+		"""Test batch mode queues new entities and bulk inserts them on flush."""
+		from advanced_compliance.advanced_compliance.knowledge_graph.sync import GraphSyncEngine
+
+		engine = GraphSyncEngine()
+		engine.begin_batch()
+		self.assertTrue(engine.batch_mode)
+
+		entity_name = engine._get_or_create_entity("Person", "User", "Administrator")
+		self.assertEqual(engine.entity_cache["User:Administrator"], entity_name)
+
+		result = engine.flush_pending()
+		self.assertFalse(engine.batch_mode)
+		self.assertIn("entities", result)
+		self.assertEqual(
+			frappe.db.get_value("Compliance Graph Entity", entity_name, "entity_id"), "Administrator"
+		)
+
+	def test_07_shared_sync_engine(self):
+		"""Test document events share one engine per request until it is reset."""
+		from advanced_compliance.advanced_compliance.knowledge_graph.sync import (
+			get_sync_engine,
+			reset_sync_engine,
+		)
+
+		engine = get_sync_engine()
+		self.assertIs(get_sync_engine(), engine)
+
+		reset_sync_engine()
+		self.assertIsNot(get_sync_engine(), engine)
+
+	def test_07b_sync_engine_reset_on_rollback_after_commit(self):
+		"""Test a rollback after an earlier commit still drops the shared engine."""
+		from advanced_compliance.advanced_compliance.knowledge_graph.sync import get_sync_engine
+
+		engine = get_sync_engine()
+		frappe.db.commit()
+
+		# Same engine in the new transaction, which rolls back an entity it cached
+		self.assertIs(get_sync_engine(), engine)
+		entity = create_test_entity("Person", "User", "sync-engine-rollback@example.com")
+		engine.entity_cache["User:sync-engine-rollback@example.com"] = entity.name
+		frappe.db.rollback()
+
+		self.assertFalse(frappe.db.exists("Compliance Graph Entity", entity.name))
+		self.assertIsNot(get_sync_engine(), engine)
+
+	def test_08_compiled_relationships(self):
+		"""Test compiled relationship tuples resolve direction and child tables."""
+		from advanced_compliance.advanced_compliance.knowledge_graph.sync import COMPILED_RELATIONSHIPS
+
+		compiled = {entry[0]: entry for entry in COMPILED_RELATIONSHIPS["Control Activity"]}
+
+		# Person OWNS Control: incoming, so source and target are swapped
+		self.assertEqual(compiled["control_owner"], ("control_owner", "OWNS", "User", "Person", True, None))
+
+		# Control MITIGATES Risk through the risks_addressed child table
+		self.assertFalse(compiled["risks_addressed"][4])
+		self.assertEqual(compiled["risks_addressed"][5], "risk")
+
+	def test_09_graph_state(self):
+		"""Test graph state ignores fields the graph does not read."""
+		from advanced_compliance.advanced_compliance.knowledge_graph.sync import get_graph_state
+
+		before = frappe._dict(
+			doctype="Control Activity",
+			control_owner="Administrator",
+			description="Old",
+			risks_addressed=[frappe._dict(risk="RISK-001")],
+		)
+		edited = frappe._dict(before, description="New")
+		relinked = frappe._dict(before, risks_addressed=[frappe._dict(risk="RISK-002")])
+
+		self.assertEqual(get_graph_state(before), get_graph_state(edited))
+		self.assertNotEqual(get_graph_state(before), get_graph_state(relinked))
+
 
 class TestGraphQueryEngine(unittest.TestCase):
 	"""Tests for Graph Query Engine."""
@@ -589,6 +688,152 @@ class TestGraphQueryEngine(unittest.TestCase):
 		self.assertEqual(len(subgraph["entities"]), 2)
 		self.assertGreater(len(subgraph["relationships"]), 0)
 
+	def test_12_get_neighbors_multi_depth(self):
+		"""Test multi-hop neighbors report their shortest depth."""
+		from advanced_compliance.advanced_compliance.knowledge_graph.query import GraphQueryEngine
+
+		engine = GraphQueryEngine()
+
+		neighbors = engine.get_neighbors(self.entity_person.name, direction="outgoing", max_depth=2)
+		depths = {n["entity"]: n["depth"] for n in neighbors}
+
+		self.assertEqual(depths.get(self.entity_control.name), 1)
+		self.assertEqual(depths.get(self.entity_risk.name), 2)
+		self.assertNotIn(self.entity_person.name, depths)
+
+	def test_13_traverse_levels(self):
+		"""Test level-by-level traversal reaches every hop."""
+		from advanced_compliance.advanced_compliance.knowledge_graph.query import GraphQueryEngine
+
+		engine = GraphQueryEngine()
+
+		result = engine.traverse(self.entity_person.name, direction="outgoing", max_depth=2)
+		names = {e["name"] for e in result["entities"]}
+
+		self.assertEqual(
+			names, {self.entity_person.name, self.entity_control.name, self.entity_risk.name}
+		)
+		self.assertEqual(
+			{r["name"] for r in result["relationships"]}, {self.rel_owns.name, self.rel_mitigates.name}
+		)
+
+	def test_14_find_all_paths_snapshot(self):
+		"""Test all-paths search over the CSR snapshot."""
+		from advanced_compliance.advanced_compliance.knowledge_graph.query import GraphQueryEngine
+
+		engine = GraphQueryEngine()
+
+		paths = engine.find_all_paths(self.entity_person.name, self.entity_risk.name, max_depth=3)
+		self.assertIsNotNone(engine._build_csr_snapshot())
+		self.assertIn(
+			[self.entity_person.name, self.entity_control.name, self.entity_risk.name],
+			[p["entities"] for p in paths],
+		)
+
+		# find_path reuses the loaded snapshot
+		path = engine.find_path(self.entity_person.name, self.entity_risk.name, max_depth=3)
+		self.assertEqual(path["relationships"], [self.rel_owns.name, self.rel_mitigates.name])
+
+		# A zero path budget finds nothing
+		self.assertEqual(engine._find_all_paths(self.entity_person.name, self.entity_risk.name, None, 3, 0), [])
+
+	def test_15_lru_k_cache_eviction(self):
+		"""Test LRU-K evicts single-use entries before repeatedly used ones."""
+		from advanced_compliance.advanced_compliance.knowledge_graph.query import LRUKCache
+
+		cache = LRUKCache(capacity=2, k=2)
+		cache.put("hot", 1)
+		cache.get("hot")
+		cache.put("once", 2)
+		cache.put("new", 3)
+
+		self.assertIn("hot", cache)
+		self.assertNotIn("once", cache)
+		self.assertEqual(cache.get("new"), 3)
+		self.assertEqual(len(cache), 2)
+
+	def test_16_pattern_match(self):
+		"""Test pattern matching compiles to a join over the pattern edges."""
+		from advanced_compliance.advanced_compliance.knowledge_graph.query import GraphQueryEngine
+
+		engine = GraphQueryEngine()
+
+		matches = engine.pattern_match(
+			{
+				"nodes": [{"var": "p", "type": "Person"}, {"var": "c", "type": "Control"}, {"var": "r", "type": "Risk"}],
+				"edges": [{"from": "p", "to": "c", "type": "OWNS"}, {"from": "c", "to": "r", "type": "MITIGATES"}],
+			}
+		)
+		self.assertIn(
+			{"p": self.entity_person.name, "c": self.entity_control.name, "r": self.entity_risk.name}, matches
+		)
+
+		# Edges referencing unknown variables match nothing
+		self.assertEqual(
+			engine.pattern_match(
+				{"nodes": [{"var": "c", "type": "Control"}], "edges": [{"from": "c", "to": "x", "type": "TESTS"}]}
+			),
+			[],
+		)
+
+	def test_17_pattern_match_prunes_unknown_edge_types(self):
+		"""Test pattern edges are checked against the active relationship types."""
+		from advanced_compliance.advanced_compliance.knowledge_graph.query import GraphQueryEngine
+
+		engine = GraphQueryEngine()
+
+		self.assertIn("MITIGATES", engine._get_relationship_types())
+		self.assertNotIn("NOT_A_TYPE", engine._get_relationship_types())
+
+		matches = engine.pattern_match(
+			{
+				"nodes": [{"var": "c", "type": "Control"}, {"var": "r", "type": "Risk"}],
+				"edges": [{"from": "c", "to": "r", "type": "NOT_A_TYPE"}],
+			}
+		)
+		self.assertEqual(matches, [])
+
+	def test_18_traversal_kernels_match_python(self):
+		"""Test compiled traversal kernels return the same paths as the Python loops."""
+		from unittest.mock import patch
+
+		from advanced_compliance.advanced_compliance.knowledge_graph import kernels
+		from advanced_compliance.advanced_compliance.knowledge_graph.query import GraphQueryEngine
+
+		if not kernels.is_available():
+			self.skipTest("numba not installed")
+
+		snapshot = GraphQueryEngine()._build_csr_snapshot()
+		start, end = self.entity_person.name, self.entity_risk.name
+
+		engine = GraphQueryEngine()
+		path = engine._find_path_in_snapshot(snapshot, start, end, 3)
+		paths = engine._find_all_paths(start, end, None, 3, 10)
+		with patch.object(kernels, "is_available", return_value=False):
+			self.assertEqual(engine._find_path_in_snapshot(snapshot, start, end, 3), path)
+			self.assertEqual(engine._find_all_paths(start, end, None, 3, 10), paths)
+
+		self.assertEqual(path["relationships"], [self.rel_owns.name, self.rel_mitigates.name])
+
+	def test_19_get_neighbors_snapshot_with_kernels(self):
+		"""Test neighbor lookups over a loaded snapshot return neighbors when kernels are enabled."""
+		from unittest.mock import patch
+
+		from advanced_compliance.advanced_compliance.knowledge_graph import kernels
+		from advanced_compliance.advanced_compliance.knowledge_graph.query import GraphQueryEngine
+
+		engine = GraphQueryEngine()
+		expected = engine.get_neighbors(self.entity_control.name)
+
+		self.assertIsNotNone(engine._build_csr_snapshot())
+		with patch.object(kernels, "is_available", return_value=True):
+			neighbors = engine.get_neighbors(self.entity_control.name, max_depth=1)
+
+		self.assertIsInstance(neighbors, list)
+		names = {n["entity"] for n in neighbors}
+		self.assertLessEqual({self.entity_person.name, self.entity_risk.name}, names)
+		self.assertEqual(names, {n["entity"] for n in expected})
+
 
 class TestCoverageAnalyzer(unittest.TestCase):
 	"""Tests for Coverage Analyzer."""
@@ -720,6 +965,143 @@ class TestCoverageAnalyzer(unittest.TestCase):
 		self.assertIn("orphaned_entities", result)
 		self.assertIn("dependencies", result)
 
+	def test_08_analyzer_memoizes_results(self):
+		"""Test sub-analyses are computed once per analyzer instance."""
+		from advanced_compliance.advanced_compliance.knowledge_graph.analysis import CoverageAnalyzer
+
+		analyzer = CoverageAnalyzer()
+		first = analyzer.analyze_risk_coverage()
+		analyzer.get_compliance_score()
+
+		# Second call returns the memoized result object
+		self.assertIs(analyzer.analyze_risk_coverage(), first)
+		self.assertIn(("risk", None, True), analyzer._cache)
+
+	def test_09_risk_coverage_counts_in_sql(self):
+		"""Test aggregated counts and optional detail hydration."""
+		from advanced_compliance.advanced_compliance.knowledge_graph.analysis import CoverageAnalyzer
+
+		detailed = CoverageAnalyzer().analyze_risk_coverage()
+		summary = CoverageAnalyzer().analyze_risk_coverage(include_details=False)
+
+		self.assertEqual(detailed["total_risks"], summary["total_risks"])
+		self.assertGreaterEqual(detailed["partially_covered"] + detailed["fully_covered"], 1)
+
+		covered = [
+			r for r in detailed["partially_covered_risks"] if r["entity"] == self.risk_covered.name
+		]
+		self.assertEqual(covered[0]["controls"], [self.control.name])
+		# Summary results carry counts only
+		self.assertEqual(detailed["coverage_percentage"], summary["coverage_percentage"])
+		self.assertNotIn("partially_covered_risks", summary)
+		self.assertNotIn("uncovered_risks", summary)
+
+	def test_10_company_filter_in_sql(self):
+		"""Test company filter excludes entities tagged with another company."""
+		from advanced_compliance.advanced_compliance.knowledge_graph.analysis import CoverageAnalyzer
+
+		other = create_test_entity("Risk", "Risk Register Entry", "COV-TEST-RISK-OTHER-CO")
+		frappe.db.set_value(
+			"Compliance Graph Entity", other.name, "properties", json.dumps({"company": "Other Co"})
+		)
+
+		result = CoverageAnalyzer().analyze_risk_coverage(company="Test Co")
+		entities = [r["entity"] for r in result["uncovered_risks"]]
+
+		self.assertNotIn(other.name, entities)
+		# Entities without a company still match any company filter
+		self.assertIn(self.risk_uncovered.name, entities)
+
+	def test_11_max_dependency_chain_length(self):
+		"""Test iterative chain length handles shared sub-chains, cycles and deep chains."""
+		from advanced_compliance.advanced_compliance.knowledge_graph.analysis import CoverageAnalyzer
+
+		analyzer = CoverageAnalyzer()
+
+		self.assertEqual(analyzer._get_max_dependency_chain_length({}), 0)
+		self.assertEqual(
+			analyzer._get_max_dependency_chain_length({"A": ["B", "C"], "C": ["D"], "D": ["E"]}), 3
+		)
+		# Circular dependency terminates
+		self.assertEqual(analyzer._get_max_dependency_chain_length({"A": ["B"], "B": ["A"]}), 2)
+		# Deep chains no longer hit the recursion limit
+		deep = {f"C{i}": [f"C{i + 1}"] for i in range(5000)}
+		self.assertEqual(analyzer._get_max_dependency_chain_length(deep), 5000)
+
+	def test_12_full_analysis_shared_scan_matches(self):
+		"""Test the shared relationship scan yields the same metrics as per-analyzer queries."""
+		from advanced_compliance.advanced_compliance.knowledge_graph.analysis import CoverageAnalyzer
+
+		full = CoverageAnalyzer().get_full_analysis()
+		standalone = CoverageAnalyzer()
+
+		for section, result, keys in (
+			("risk_coverage", standalone.analyze_risk_coverage(), ["total_risks", "fully_covered", "uncovered"]),
+			("control_testing", standalone.analyze_control_testing(), ["total_controls", "tested"]),
+			("ownership", standalone.analyze_ownership(), ["total_controls", "owned"]),
+			("dependencies", standalone.analyze_control_dependencies(), ["total_dependencies"]),
+		):
+			for key in keys:
+				self.assertEqual(full[section][key], result[key])
+
+	def test_13_iter_orphaned_entities_chunked(self):
+		"""Test chunked orphan scan finds orphans across page boundaries."""
+		from advanced_compliance.advanced_compliance.knowledge_graph.analysis import CoverageAnalyzer
+
+		orphan = create_test_entity("Process", "DocType", "COV-TEST-ORPHAN-CHUNK")
+
+		analyzer = CoverageAnalyzer()
+		orphans = {o["entity"] for o in analyzer.iter_orphaned_entities(chunk_size=2)}
+
+		self.assertIn(orphan.name, orphans)
+		self.assertNotIn(self.control.name, orphans)
+		self.assertNotIn(self.risk_covered.name, orphans)
+
+	def test_14_get_grade_boundaries(self):
+		"""Test grade lookup matches the score thresholds."""
+		from advanced_compliance.advanced_compliance.knowledge_graph.analysis import get_grade
+
+		self.assertEqual(get_grade(100), "A")
+		self.assertEqual(get_grade(90), "A")
+		self.assertEqual(get_grade(89.99), "B")
+		self.assertEqual(get_grade(80), "B")
+		self.assertEqual(get_grade(70), "C")
+		self.assertEqual(get_grade(60), "D")
+		self.assertEqual(get_grade(59.99), "F")
+		self.assertEqual(get_grade(0), "F")
+
+	def test_15_full_analysis_empty_company(self):
+		"""Test a company with no risks or controls gets zeroed coverage."""
+		from advanced_compliance.advanced_compliance.knowledge_graph.analysis import CoverageAnalyzer
+
+		# Untagged test entities match any company, so stub the scoped check:
+		# no risks/controls for this company, but the graph itself is not empty
+		empty = CoverageAnalyzer()
+		empty._has_entities = lambda entity_types=None, company=None: bool(entity_types is None)
+		result = empty.get_full_analysis(company="COV-TEST-NO-SUCH-COMPANY")
+
+		self.assertEqual(result["risk_coverage"]["total_risks"], 0)
+		self.assertEqual(result["control_testing"]["total_controls"], 0)
+		self.assertEqual(result["ownership"]["total_controls"], 0)
+		self.assertEqual(result["compliance_score"]["grade"], "F")
+		self.assertIsNone(empty._relationships_by_type)
+
+	def test_16_refresh_analysis_snapshot(self):
+		"""Test the background refresh stores a snapshot tagged with the graph version."""
+		from advanced_compliance.advanced_compliance.doctype.compliance_analysis_snapshot.compliance_analysis_snapshot import (
+			ComplianceAnalysisSnapshot,
+		)
+		from advanced_compliance.advanced_compliance.knowledge_graph.analysis import refresh_analysis_snapshot
+		from advanced_compliance.advanced_compliance.utils.cache import get_graph_version
+
+		refresh_analysis_snapshot()
+		snapshot = ComplianceAnalysisSnapshot.get_snapshot()
+
+		self.assertIsNotNone(snapshot)
+		self.assertEqual(snapshot.graph_version, get_graph_version())
+		self.assertIn("compliance_score", snapshot.get_analysis())
+		self.assertEqual(snapshot.grade, snapshot.get_analysis()["compliance_score"]["grade"])
+
 
 class TestGraphAPIEndpoints(unittest.TestCase):
 	"""Tests for Graph API Endpoints."""
@@ -746,8 +1128,10 @@ class TestGraphAPIEndpoints(unittest.TestCase):
 		"""Test get_visualization_data API endpoint."""
 		from advanced_compliance.advanced_compliance.knowledge_graph.query import get_visualization_data
 
-		result = get_visualization_data(max_nodes=10)
+		response = get_visualization_data(max_nodes=10)
+		self.assertEqual(response.mimetype, "application/json")
 
+		result = json.loads(response.get_data())["message"]
 		self.assertIn("nodes", result)
 		self.assertIn("edges", result)
 
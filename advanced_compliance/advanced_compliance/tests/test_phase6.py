@@ -63,6 +63,35 @@ class TestCacheUtilities(unittest.TestCase):
 		result2 = get_cached("test_key_2", generator, ttl=60)
 		self.assertEqual(result2["count"], 2)
 
+	def test_local_cached_invalidation(self):
+		"""Test the per-process copy is reused until the key is invalidated."""
+		from advanced_compliance.advanced_compliance.utils.cache import get_local_cached, invalidate_cache
+
+		call_count = [0]
+
+		def generator():
+			call_count[0] += 1
+			return {"count": call_count[0]}
+
+		invalidate_cache("test_local_key")
+		self.assertEqual(get_local_cached("test_local_key", generator, ttl=60)["count"], 1)
+		self.assertEqual(get_local_cached("test_local_key", generator, ttl=60)["count"], 1)
+
+		invalidate_cache("test_local_key")
+		self.assertEqual(get_local_cached("test_local_key", generator, ttl=60)["count"], 2)
+		invalidate_cache("test_local_key")
+
+	def test_graph_version_bump(self):
+		"""Test graph version is stable until bumped."""
+		from advanced_compliance.advanced_compliance.utils.cache import bump_graph_version, get_graph_version
+
+		version = get_graph_version()
+		self.assertEqual(get_graph_version(), version)
+
+		new_version = bump_graph_version()
+		self.assertNotEqual(new_version, version)
+		self.assertEqual(get_graph_version(), new_version)
+
 
 class TestOptimizations(unittest.TestCase):
 	"""Tests for query optimization utilities."""
@@ -399,6 +399,21 @@ class TestChangeDetector(unittest.TestCase):
 		self.assertIsInstance(changes, list)
 		self.assertTrue(len(changes) > 0)
 
+	def test_detect_changes_keeps_dash_lines(self):
+		"""Test removed lines that look like diff headers are still reported."""
+		from advanced_compliance.advanced_compliance.regulatory_feeds.detection.change_detector import (
+			ChangeDetector,
+		)
+
+		old_text = "Line 1\n-- Note: filings are optional\nLine 3"
+		new_text = "Line 1\nLine 3"
+
+		changes = ChangeDetector(old_text, new_text).detect_changes()
+
+		self.assertEqual(len(changes), 1)
+		self.assertEqual(changes[0]["removed_text"], ["-- Note: filings are optional"])
+		self.assertEqual(changes[0]["location"], "@@ -1,3 +1,2 @@")
+
 	def test_classify_severity(self):
 		"""Test severity classification."""
 		from advanced_compliance.advanced_compliance.regulatory_feeds.detection.change_detector import (
@@ -416,6 +431,36 @@ class TestChangeDetector(unittest.TestCase):
 		if changes:
 			self.assertIn(changes[0]["severity"], ["Major", "Critical"])
 
+	def test_classify_severity_keywords(self):
+		"""Test severity keywords are compared across removed and added text."""
+		from advanced_compliance.advanced_compliance.regulatory_feeds.detection.change_detector import (
+			ChangeDetector,
+		)
+
+		detector = ChangeDetector("", "")
+
+		def severity(removed, added):
+			return detector._classify_severity({"removed_text": [removed], "added_text": [added]})
+
+		self.assertEqual(severity("Reports are due.", "Late reports incur a penalty."), "Critical")
+		self.assertEqual(severity("A penalty applies.", "A penalty still applies."), "Minor")
+		self.assertEqual(severity("Firms must file.", "Firms may file."), "Major")
+		self.assertEqual(severity("Reports are due.", "Reports are due monthly."), "Minor")
+
+	def test_find_keywords_without_automaton(self):
+		"""Test the fallback keyword scan matches the automaton's results."""
+		from advanced_compliance.advanced_compliance.regulatory_feeds.detection.change_detector import (
+			SEVERITY_KEYWORDS,
+			_find_keywords,
+		)
+
+		text = "a fine is payable; firms must report any material weakness"
+
+		self.assertEqual(
+			_find_keywords(text, None, SEVERITY_KEYWORDS), {"fine", "must", "material weakness"}
+		)
+		self.assertEqual(_find_keywords("", None, SEVERITY_KEYWORDS), set())
+
 	def test_detect_obligation_changes(self):
 		"""Test obligation change detection."""
 		from advanced_compliance.advanced_compliance.regulatory_feeds.detection.change_detector import (
@@ -431,6 +476,51 @@ class TestChangeDetector(unittest.TestCase):
 		self.assertTrue(len(obligation_changes) > 0)
 		self.assertEqual(obligation_changes[0]["type"], "strengthened")
 
+	def test_semantic_model_loaded_once(self):
+		"""Test detectors share one embedding model per process."""
+		from advanced_compliance.advanced_compliance.regulatory_feeds.detection.change_detector import (
+			SemanticChangeDetector,
+		)
+
+		model = Mock()
+		with (
+			patch.object(SemanticChangeDetector, "_model_loaded", False),
+			patch.object(SemanticChangeDetector, "_model", None),
+			patch.object(SemanticChangeDetector, "_load_model", return_value=model) as load_model,
+		):
+			first = SemanticChangeDetector()
+			second = SemanticChangeDetector()
+
+		load_model.assert_called_once()
+		self.assertIs(first.model, model)
+		self.assertIs(second.model, model)
+
+	def test_compare_sections_batched(self):
+		"""Test sections in both versions are embedded in a single batch."""
+		from advanced_compliance.advanced_compliance.regulatory_feeds.detection.change_detector import (
+			SemanticChangeDetector,
+		)
+
+		with patch.object(SemanticChangeDetector, "_get_model", return_value=Mock()):
+			detector = SemanticChangeDetector()
+
+		old_sections = {"scope": "Old scope", "terms": "Old terms", "repealed": "Gone"}
+		new_sections = {"scope": "New scope", "terms": "New terms", "added": "Fresh"}
+
+		with patch.object(detector, "_pairwise_similarities", return_value=[0.9, 0.5]) as pairwise:
+			results = detector.compare_sections(old_sections, new_sections)
+
+		pairwise.assert_called_once()
+		old_texts, new_texts = pairwise.call_args[0]
+		# Old and new texts of the same section are paired by position
+		self.assertEqual([text.split()[1] for text in old_texts], [text.split()[1] for text in new_texts])
+		self.assertEqual(len(old_texts), 2)
+
+		statuses = {result["section"]: result["status"] for result in results}
+		self.assertEqual(statuses["repealed"], "removed")
+		self.assertEqual(statuses["added"], "added")
+		self.assertEqual(sorted([statuses["scope"], statuses["terms"]]), ["modified", "unchanged"])
+
 
 class TestImpactMapper(unittest.TestCase):
 	"""Tests for Impact Mapping module."""
@@ -506,6 +596,28 @@ class TestImpactMapper(unittest.TestCase):
 				self.assertGreaterEqual(match["confidence"], 80)
 				self.assertEqual(match["method"], "citation")
 
+	def test_create_impact_assessments_bulk(self):
+		"""Test bulk assessment creation skips existing assessments."""
+		from advanced_compliance.advanced_compliance.regulatory_feeds.mapping.impact_mapper import (
+			ImpactMapper,
+		)
+
+		changes = frappe.get_all(
+			"Regulatory Change", filters={"regulatory_update": self.update.name}, fields=["*"]
+		)
+
+		created = ImpactMapper.create_impact_assessments_bulk(changes)
+		controls = frappe.get_all(
+			"Regulatory Impact Assessment", filters={"name": ["in", created]}, pluck="control_activity"
+		)
+		self.assertIn(self.control.name, controls)
+		self.assertEqual(
+			frappe.db.get_value("Regulatory Impact Assessment", created[0], "priority"), "High"
+		)
+
+		# Running again creates nothing new
+		self.assertEqual(ImpactMapper.create_impact_assessments_bulk(changes), [])
+
 
 class TestRegulatoryAPI(unittest.TestCase):
 	"""Tests for API endpoints."""
@@ -578,6 +690,76 @@ class TestRegulatoryAPI(unittest.TestCase):
 		self.assertIn("pending_assessments", data)
 		self.assertIn("upcoming_deadlines", data)
 
+	def _create_sync_feed_source(self):
+		"""Create a feed source for the sync job endpoint tests."""
+		doc = frappe.get_doc(
+			{
+				"doctype": "Regulatory Feed Source",
+				"source_name": "Sync Job Test Feed",
+				"feed_type": "RSS",
+				"url": "https://example.com/sync.rss",
+				"enabled": 1,
+			}
+		)
+		doc.insert()
+		return doc
+
+	def test_sync_feed_enqueues_deduplicated_job(self):
+		"""Test sync_feed enqueues a deduplicated job and returns its id."""
+		from advanced_compliance.advanced_compliance.regulatory_feeds.api import (
+			get_feed_sync_job_id,
+			sync_feed,
+		)
+
+		doc = self._create_sync_feed_source()
+
+		with patch("frappe.enqueue", return_value=Mock(id="job-1")) as mock_enqueue:
+			result = sync_feed(doc.name)
+
+		self.assertTrue(result["success"])
+		self.assertEqual(result["job_id"], "job-1")
+		kwargs = mock_enqueue.call_args.kwargs
+		self.assertEqual(kwargs["job_id"], get_feed_sync_job_id(doc.name))
+		self.assertTrue(kwargs["deduplicate"])
+		self.assertEqual(kwargs["feed_source"], doc.name)
+
+	def test_sync_feed_reports_already_running(self):
+		"""Test sync_feed reports a running sync when enqueue is deduplicated."""
+		from advanced_compliance.advanced_compliance.regulatory_feeds.api import sync_feed
+
+		doc = self._create_sync_feed_source()
+
+		with patch("frappe.enqueue", return_value=None):
+			result = sync_feed(doc.name)
+
+		self.assertTrue(result["success"])
+		self.assertIsNone(result["job_id"])
+		self.assertEqual(result["message"], "Feed sync is already running")
+
+	def test_get_feed_sync_status(self):
+		"""Test get_feed_sync_status returns the job state and last sync fields."""
+		from advanced_compliance.advanced_compliance.regulatory_feeds.api import (
+			get_feed_sync_job_id,
+			get_feed_sync_status,
+		)
+
+		doc = self._create_sync_feed_source()
+
+		with patch("frappe.utils.background_jobs.is_job_enqueued", return_value=True) as mock_is_job_enqueued:
+			status = get_feed_sync_status(doc.name)
+
+		mock_is_job_enqueued.assert_called_once_with(get_feed_sync_job_id(doc.name))
+		self.assertTrue(status["running"])
+		for key in ("last_sync", "last_sync_status", "last_error"):
+			self.assertIn(key, status)
+
+	def test_get_feed_sync_status_missing_feed(self):
+		"""Test get_feed_sync_status rejects an unknown feed source."""
+		from advanced_compliance.advanced_compliance.regulatory_feeds.api import get_feed_sync_status
+
+		with self.assertRaises(frappe.ValidationError):
+			get_feed_sync_status("Nonexistent Feed Source")
+
 
 class TestConnectorFactory(unittest.TestCase):
 	"""Tests for connector factory."""
@@ -630,6 +812,32 @@ class TestConnectorFactory(unittest.TestCase):
 
 		self.assertIsInstance(connector, SECEdgarConnector)
 
+	def test_get_connector_by_name(self):
+		"""Test a feed source name loads only the connector fields and keywords."""
+		from advanced_compliance.advanced_compliance.regulatory_feeds.connectors import get_connector
+
+		frappe.set_user("Administrator")
+		feed_source = frappe.get_doc(
+			{
+				"doctype": "Regulatory Feed Source",
+				"source_name": "Test Connector Fields Feed",
+				"feed_type": "RSS",
+				"url": "https://example.com/connector-fields.rss",
+				"document_types": "Rule",
+				"keywords": [{"keyword": "Audit", "match_type": "Contains"}],
+			}
+		)
+		feed_source.insert()
+
+		try:
+			connector = get_connector(feed_source.name)
+
+			self.assertEqual(connector.url, feed_source.url)
+			self.assertEqual(connector._kw_contains, ["audit"])
+			self.assertEqual(connector._allowed_doc_types, frozenset({"rule"}))
+		finally:
+			frappe.db.rollback()
+
 	def test_invalid_feed_type_raises_error(self):
 		"""Test that invalid feed type raises error."""
 		from advanced_compliance.advanced_compliance.regulatory_feeds.connectors import get_connector
@@ -642,6 +850,209 @@ class TestConnectorFactory(unittest.TestCase):
 			get_connector(feed_source)
 
 
+
+class TestConnectorSync(unittest.TestCase):
+	"""Tests for BaseConnector.sync."""
+
+	def _get_connector(self, keywords=None, document_types="", last_sync=None):
+		from advanced_compliance.advanced_compliance.regulatory_feeds.connectors import get_connector
+
+		feed_source = frappe._dict(
+			{
+				"name": "Test RSS",
+				"source_name": "Test RSS",
+				"feed_type": "RSS",
+				"url": "https://example.com/feed.rss",
+				"last_sync": last_sync,
+				"user_agent": "Test/1.0",
+				"document_types": document_types,
+				"keywords": keywords or [],
+			}
+		)
+		return get_connector(feed_source)
+
+	def test_filter_by_keywords(self):
+		"""Test Contains, Exact and Regex keyword filters."""
+		self.assertTrue(self._get_connector()._filter_by_keywords("Anything"))
+
+		connector = self._get_connector(
+			keywords=[
+				frappe._dict(keyword="Audit", match_type="Contains"),
+				frappe._dict(keyword="Rule 10b-5", match_type="Exact"),
+				frappe._dict(keyword=r"AS \d{4}", match_type="Regex"),
+			]
+		)
+
+		self.assertTrue(connector._filter_by_keywords("New AUDIT standard"))
+		self.assertTrue(connector._filter_by_keywords("rule 10b-5"))
+		self.assertTrue(connector._filter_by_keywords("Amendments to as 2201"))
+		self.assertFalse(connector._filter_by_keywords("Rule 10b-5 amended"))
+
+	def test_filter_by_document_types(self):
+		"""Test document type filter is case-insensitive and ignores blanks."""
+		self.assertTrue(self._get_connector()._filter_by_document_types("Anything"))
+
+		connector = self._get_connector(document_types="Final Rule, Proposed Rule,")
+
+		self.assertTrue(connector._filter_by_document_types("final rule"))
+		self.assertTrue(connector._filter_by_document_types("Proposed Rule"))
+		self.assertFalse(connector._filter_by_document_types("Press Release"))
+		self.assertFalse(connector._filter_by_document_types(""))
+
+	def test_classify_document_type_rule_order(self):
+		"""Test the earliest matching title rule wins, wherever it appears."""
+		connector = self._get_connector()
+
+		self.assertEqual(
+			connector._classify_document_type({"title": "Guidance on the Proposed Rule"}), "Proposed Rule"
+		)
+		self.assertEqual(
+			connector._classify_document_type({"title": "Staff Interpretation", "tags": []}), "Interpretation"
+		)
+		self.assertEqual(
+			connector._classify_document_type({"title": "Final Rule", "tags": [{"term": "Enforcement"}]}),
+			"Enforcement",
+		)
+		self.assertEqual(connector._classify_document_type({"title": "Weekly digest"}), "Release")
+
+	def test_parse_item_skips_synced_entries_early(self):
+		"""Test entries older than the last sync are dropped before HTML cleaning."""
+		connector = self._get_connector(last_sync="2025-06-01 10:00:00")
+		old_entry = frappe._dict(title="Old release", published_parsed=(2025, 5, 31, 0, 0, 0))
+		new_entry = frappe._dict(title="New release", published_parsed=(2025, 6, 1, 0, 0, 0))
+
+		with patch.object(connector, "_extract_content", return_value="Body") as extract_content:
+			self.assertIsNone(connector.parse_item(old_entry))
+			extract_content.assert_not_called()
+
+			self.assertEqual(connector.parse_item(new_entry)["publication_date"], getdate("2025-06-01"))
+
+	def test_sync_skips_existing_and_repeated_urls(self):
+		"""Test sync creates each new URL once and skips stored ones."""
+		connector = self._get_connector()
+		updates = [
+			{"title": "Stored", "original_url": "https://example.com/stored"},
+			{"title": "New", "original_url": "https://example.com/new"},
+			{"title": "New again", "original_url": "https://example.com/new"},
+			None,
+		]
+
+		with (
+			patch.object(connector, "fetch_updates", return_value=updates),
+			patch.object(connector, "_get_existing_urls", return_value={"https://example.com/stored"}),
+			patch.object(connector, "_create_updates_bulk", side_effect=len) as create_updates,
+			patch.object(connector, "_update_last_sync"),
+		):
+			count = connector.sync()
+
+		self.assertEqual(count, 1)
+		create_updates.assert_called_once_with([updates[1]])
+
+	def test_bulk_insert_failure_rolls_back_to_savepoints(self):
+		"""Test a failed batch only rolls back its own savepoints, not the transaction."""
+		connector = self._get_connector()
+		batch = [{"title": "Good"}, {"title": "Bad"}]
+
+		def create_update(update_data):
+			if update_data["title"] == "Bad":
+				raise frappe.ValidationError("bad row")
+
+		with (
+			patch.object(connector, "_build_update", return_value=frappe._dict()),
+			patch.object(frappe.db, "bulk_insert", side_effect=Exception("bad batch")),
+			patch.object(connector, "_create_update", side_effect=create_update),
+			patch.object(frappe.db, "savepoint"),
+			patch.object(frappe.db, "rollback") as rollback,
+			patch("frappe.log_error"),
+		):
+			count = connector._create_updates_bulk(batch)
+
+		self.assertEqual(count, 1)
+		for call in rollback.call_args_list:
+			self.assertIn("save_point", call.kwargs)
+		self.assertEqual(
+			[call.kwargs["save_point"] for call in rollback.call_args_list],
+			["regulatory_updates_bulk", "regulatory_update_row"],
+		)
+
+	def test_bulk_insert_rejects_invalid_rows(self):
+		"""Test rows failing Select/mandatory checks are logged, not bulk inserted."""
+		connector = self._get_connector()
+		batch = [
+			{"title": "Valid update", "original_url": "https://example.com/valid", "document_type": "Rule"},
+			{"title": "News item", "original_url": "https://example.com/news", "document_type": "News"},
+			{"title": "", "original_url": "https://example.com/untitled", "document_type": "Rule"},
+		]
+
+		try:
+			with patch.object(frappe.db, "commit"), patch("frappe.log_error") as log_error:
+				count = connector._create_updates_bulk(batch)
+
+			self.assertEqual(count, 1)
+			self.assertEqual(log_error.call_count, 2)
+			self.assertTrue(
+				frappe.db.exists("Regulatory Update", {"original_url": "https://example.com/valid"})
+			)
+			self.assertFalse(
+				frappe.db.exists("Regulatory Update", {"original_url": "https://example.com/news"})
+			)
+			self.assertFalse(
+				frappe.db.exists("Regulatory Update", {"original_url": "https://example.com/untitled"})
+			)
+		finally:
+			frappe.db.rollback()
+
+	def test_fetch_feed_conditional_get(self):
+		"""Test the source feed is fetched with stored validators and 304 keeps them."""
+		from advanced_compliance.advanced_compliance.regulatory_feeds.connectors import base_connector
+
+		connector = self._get_connector()
+		connector.etag = '"abc"'
+		connector.last_modified = "Wed, 14 Oct 2026 10:00:00 GMT"
+		feedparser = Mock(FeedParserDict=frappe._dict)
+		session = Mock()
+
+		with patch.object(base_connector, "get_http_session", return_value=session):
+			session.get.return_value = Mock(status_code=304, headers={})
+			feed = connector._fetch_feed(feedparser, connector.url)
+
+			self.assertEqual(feed.entries, [])
+			self.assertEqual(session.get.call_args.kwargs["headers"]["If-None-Match"], '"abc"')
+			feedparser.parse.assert_not_called()
+			self.assertEqual(connector._cache_validators, {})
+
+			session.get.return_value = Mock(status_code=200, content=b"<rss/>", headers={"ETag": '"def"'})
+			feedparser.parse.return_value = frappe._dict(bozo=False, entries=[])
+			connector._fetch_feed(feedparser, connector.url)
+
+		self.assertEqual(feedparser.parse.call_args.args, (b"<rss/>",))
+		self.assertEqual(connector._cache_validators, {"etag": '"def"', "last_modified": None})
+
+	def test_pcaob_fetches_every_feed(self):
+		"""Test PCAOB downloads all feeds and keeps going when one fails."""
+		from advanced_compliance.advanced_compliance.regulatory_feeds.connectors.pcaob import PCAOBConnector
+
+		connector = PCAOBConnector(frappe._dict(url=None, last_sync=None, user_agent="Test/1.0"))
+		feed_urls = list(PCAOBConnector.PCAOB_FEEDS.values())
+
+		def download(feedparser, url):
+			if url == feed_urls[0]:
+				raise OSError("timeout")
+			return frappe._dict(bozo=False, entries=[url])
+
+		with (
+			patch.object(connector, "_import_feedparser"),
+			patch.object(connector, "_download_feed", side_effect=download) as download_feed,
+			patch.object(connector, "_parse_feed", side_effect=lambda feed: feed.entries),
+			patch("frappe.log_error") as log_error,
+		):
+			updates = connector.fetch_updates()
+
+		self.assertEqual(download_feed.call_count, len(feed_urls))
+		self.assertEqual(updates, feed_urls[1:])
+		log_error.assert_called_once()
+
+
 def run_tests():
 	"""Run all Phase 5 tests."""
 	loader = unittest.TestLoader()
@@ -657,6 +1068,7 @@ def run_tests():
 	suite.addTests(loader.loadTestsFromTestCase(TestImpactMapper))
 	suite.addTests(loader.loadTestsFromTestCase(TestRegulatoryAPI))
 	suite.addTests(loader.loadTestsFromTestCase(TestConnectorFactory))
+	suite.addTests(loader.loadTestsFromTestCase(TestConnectorSync))
 
 	runner = unittest.TextTestRunner(verbosity=2)
 	runner.run(suite)
@@ -8,12 +8,22 @@ Provides Redis-based caching for expensive operations.
 """
 
 import json
+import time
 
 import frappe
 from frappe import _
 
 CACHE_PREFIX = "advanced_compliance:"
 DEFAULT_TTL = 3600  # 1 hour
+GRAPH_VERSION_KEY = "graph_version"
+GRAPH_ENTITY_MAP_KEY = f"{CACHE_PREFIX}graph_entity_map"
+# Under the "dashboard" prefix, so on_regulatory_update_change clears it
+REGULATORY_DASHBOARD_KEY = "dashboard:regulatory"
+# Seconds a worker may serve its own copy of a get_local_cached value
+LOCAL_CACHE_TTL = 30
+
+# Per-process copies for get_local_cached: {(site, key): (version, value, expires_at)}
+_local_cache = {}
 
 
 def get_cached(key, generator_func, ttl=DEFAULT_TTL):
@@ -47,6 +57,42 @@ def get_cached(key, generator_func, ttl=DEFAULT_TTL):
 	return value
 
 
+def get_local_cached(key, generator_func, ttl=DEFAULT_TTL, local_ttl=LOCAL_CACHE_TTL):
+	"""
+	Get a small hot value from a per-process copy, backed by get_cached.
+
+	Each copy is tagged with a version token stored in Redis under
+	"<key>:version". invalidate_cache deletes that token together with the
+	key (it matches the key's prefix), so a hit costs one GET of the short
+	token instead of fetching and decoding the whole value, and every
+	worker drops its copy as soon as the value is invalidated.
+
+	Args:
+		key: Cache key
+		generator_func: Function to generate value if not cached
+		ttl: Time to live in Redis, in seconds
+		local_ttl: Time to live of the per-process copy, in seconds
+
+	Returns:
+		Cached or generated value (shared; do not mutate)
+	"""
+	version_key = f"{CACHE_PREFIX}{key}:version"
+	local_key = (frappe.local.site, key)
+
+	version = frappe.cache().get_value(version_key)
+	entry = _local_cache.get(local_key)
+	if version and entry and entry[0] == version and entry[2] > time.monotonic():
+		return entry[1]
+
+	value = get_cached(key, generator_func, ttl=ttl)
+	if not version:
+		version = frappe.generate_hash(length=12)
+		frappe.cache().set_value(version_key, version, expires_in_sec=ttl)
+
+	_local_cache[local_key] = (version, value, time.monotonic() + local_ttl)
+	return value
+
+
 def invalidate_cache(pattern):
 	"""
 	Invalidate cache keys matching pattern.
@@ -82,6 +128,77 @@ def get_graph_cache_key(entity_type, entity_name):
 	return f"graph:{entity_type}:{entity_name}"
 
 
+def get_graph_version():
+	"""
+	Get the current knowledge graph version token.
+
+	The token changes whenever a graph entity or relationship changes, so
+	caches keyed by it are never served for a stale graph.
+
+	Returns:
+		str: Graph version token
+	"""
+	version = frappe.cache().get_value(f"{CACHE_PREFIX}{GRAPH_VERSION_KEY}")
+	if not version:
+		version = bump_graph_version()
+	return version
+
+
+def bump_graph_version():
+	"""
+	Move the knowledge graph to a new version token.
+
+	Entries keyed by the previous version become unreachable and expire
+	through their TTL, so no key scan is needed on every graph write.
+
+	Returns:
+		str: New graph version token
+	"""
+	version = frappe.generate_hash(length=12)
+	frappe.cache().set_value(f"{CACHE_PREFIX}{GRAPH_VERSION_KEY}", version)
+	return version
+
+
+def get_cached_graph_entity(cache_key):
+	"""
+	Get the active graph entity name stored for a "doctype:name" key.
+
+	Args:
+		cache_key: "<DocType>:<document name>" of the source document
+
+	Returns:
+		str: Entity name, or None if not cached
+	"""
+	return frappe.cache().hget(GRAPH_ENTITY_MAP_KEY, cache_key)
+
+
+def cache_graph_entity(cache_key, entity_name):
+	"""
+	Store a document's graph entity name once the transaction commits.
+
+	Deferring to commit keeps entities from a rolled back transaction out of
+	the shared map. Entries carry no TTL; deletes invalidate them.
+
+	Args:
+		cache_key: "<DocType>:<document name>" of the source document
+		entity_name: Compliance Graph Entity name
+	"""
+	frappe.db.after_commit.add(lambda: frappe.cache().hset(GRAPH_ENTITY_MAP_KEY, cache_key, entity_name))
+
+
+def invalidate_graph_entity(cache_key=None):
+	"""
+	Drop one document's cached graph entity, or the whole map.
+
+	Args:
+		cache_key: "<DocType>:<document name>" to drop; None clears every entry
+	"""
+	if cache_key:
+		frappe.cache().hdel(GRAPH_ENTITY_MAP_KEY, cache_key)
+	else:
+		frappe.cache().delete_value(GRAPH_ENTITY_MAP_KEY)
+
+
 def clear_all_compliance_cache():
 	"""Clear all Advanced Compliance caches."""
 	invalidate_cache("")
@@ -120,6 +237,11 @@ def on_deficiency_change(doc, method):
 		invalidate_cache(f"control_stats:{doc.control}")
 
 
+def on_graph_change(doc, method):
+	"""Bump the graph version when a graph entity or relationship changes."""
+	bump_graph_version()
+
+
 def on_regulatory_update_change(doc, method):
 	"""Invalidate regulatory-related caches on change."""
 	invalidate_cache("dashboard")
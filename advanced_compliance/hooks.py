@@ -87,6 +87,28 @@ doc_events = {
 		"after_insert": "advanced_compliance.advanced_compliance.knowledge_graph.sync.on_test_created",
 		"on_update": "advanced_compliance.advanced_compliance.knowledge_graph.sync.on_test_updated",
 	},
+	# Knowledge graph changes invalidate cached coverage analysis
+	"Compliance Graph Entity": {
+		"on_update": "advanced_compliance.advanced_compliance.utils.cache.on_graph_change",
+		"on_trash": "advanced_compliance.advanced_compliance.utils.cache.on_graph_change",
+	},
+	"Compliance Graph Relationship": {
+		"on_update": "advanced_compliance.advanced_compliance.utils.cache.on_graph_change",
+		"on_trash": "advanced_compliance.advanced_compliance.utils.cache.on_graph_change",
+	},
+	# Regulatory changes invalidate the cached regulatory dashboard
+	"Regulatory Update": {
+		"on_update": "advanced_compliance.advanced_compliance.utils.cache.on_regulatory_update_change",
+		"on_trash": "advanced_compliance.advanced_compliance.utils.cache.on_regulatory_update_change",
+	},
+	"Regulatory Change": {
+		"on_update": "advanced_compliance.advanced_compliance.utils.cache.on_regulatory_update_change",
+		"on_trash": "advanced_compliance.advanced_compliance.utils.cache.on_regulatory_update_change",
+	},
+	"Regulatory Impact Assessment": {
+		"on_update": "advanced_compliance.advanced_compliance.utils.cache.on_regulatory_update_change",
+		"on_trash": "advanced_compliance.advanced_compliance.utils.cache.on_regulatory_update_change",
+	},
 	# Deficiency workflow
 	"Deficiency": {
 		"validate": "advanced_compliance.advanced_compliance.doctype.deficiency.deficiency.validate_deficiency",
@@ -126,6 +148,12 @@ doc_events = {
 # Scheduled Tasks
 # --------------------
 scheduler_events = {
+	"cron": {
+		# Knowledge Graph - Keep coverage analysis snapshots current
+		"*/15 * * * *": [
+			"advanced_compliance.advanced_compliance.knowledge_graph.analysis.refresh_stale_snapshots"
+		],
+	},
 	"hourly": [
 		# Regulatory Feeds - High priority feed sync
 		"advanced_compliance.advanced_compliance.regulatory_feeds.scheduler.sync_high_priority_feeds"
@@ -163,6 +191,9 @@ has_permission = {
 	"Test Execution": "advanced_compliance.advanced_compliance.permissions.test_execution_permission",
 }
 
+# Request-scoped graph sync engine shared by the document event handlers
+after_request = ["advanced_compliance.advanced_compliance.knowledge_graph.sync.reset_sync_engine"]
+
 # User Data Protection (GDPR)
 user_data_fields = [
 	{"doctype": "Control Activity", "filter_by": "control_owner", "redact_fields": [], "partial": True},
@@ -0,0 +1,89 @@
+# Copyright (c) 2025, Noreli North
+# For license information, please see license.txt
+
+"""
+Patch to add covering indexes for knowledge graph traversal.
+
+Traversal reads name, relationship_type, source_entity, target_entity and
+weight for the active relationships of a set of entities. With these
+indexes the whole read is served from the index (name is the primary key,
+which InnoDB stores in every secondary index).
+"""
+
+import frappe
+
+
+def execute():
+	"""Add covering traversal indexes and drop the prefixes they replace."""
+
+	indexes = [
+		# Outgoing expansion: source_entity IN (...) AND is_active = 1
+		(
+			"Compliance Graph Relationship",
+			"idx_graph_rel_source_cover",
+			["source_entity", "is_active", "relationship_type", "target_entity", "weight"],
+		),
+		# Incoming expansion: target_entity IN (...) AND is_active = 1
+		(
+			"Compliance Graph Relationship",
+			"idx_graph_rel_target_cover",
+			["target_entity", "is_active", "relationship_type", "source_entity", "weight"],
+		),
+	]
+
+	# Leading-column prefixes of the covering indexes; only slow down writes now
+	redundant_indexes = [
+		("Compliance Graph Relationship", "idx_graph_rel_source_active"),
+		("Compliance Graph Relationship", "idx_graph_rel_target_active"),
+	]
+
+	for doctype, index_name, columns in indexes:
+		table = f"tab{doctype}"
+		try:
+			# Validate table exists using Frappe's safe method (takes the DocType name)
+			if not frappe.db.table_exists(doctype):
+				frappe.logger().info(f"Table {table} does not exist, skipping index creation")
+				continue
+
+			if not _index_exists(table, index_name):
+				# Use Frappe's safe db.add_index method instead of raw SQL
+				frappe.db.add_index(doctype, columns, index_name)
+				frappe.db.commit()
+				frappe.logger().info(f"Created index {index_name} on {table}({', '.join(columns)})")
+
+		except Exception as e:
+			# Log but don't fail - index might already exist or column might not exist
+			frappe.log_error(
+				message=f"Failed to create index {index_name} on {table}: {str(e)}\n{frappe.get_traceback()}",
+				title="Performance Index Creation Error",
+			)
+
+	for doctype, index_name in redundant_indexes:
+		table = f"tab{doctype}"
+		try:
+			if frappe.db.table_exists(doctype) and _index_exists(table, index_name):
+				# Identifiers come from the constant list above, not user input
+				frappe.db.sql_ddl(f"ALTER TABLE `{table}` DROP INDEX `{index_name}`")
+				frappe.logger().info(f"Dropped redundant index {index_name} on {table}")
+
+		except Exception as e:
+			frappe.log_error(
+				message=f"Failed to drop index {index_name} on {table}: {str(e)}\n{frappe.get_traceback()}",
+				title="Performance Index Creation Error",
+			)
+
+
+def _index_exists(table, index_name):
+	"""Check if an index exists using a parameterized query."""
+	return bool(
+		frappe.db.sql(
+			"""
+			SELECT DISTINCT INDEX_NAME
+			FROM INFORMATION_SCHEMA.STATISTICS
+			WHERE TABLE_SCHEMA = DATABASE()
+			AND TABLE_NAME = %s
+			AND INDEX_NAME = %s
+		""",
+			(table, index_name),
+		)
+	)
@@ -0,0 +1,69 @@
+# Copyright (c) 2025, Noreli North
+# For license information, please see license.txt
+
+"""
+Patch to add composite indexes for the graph sync lookups.
+
+Graph sync resolves a document's entity by (entity_doctype, entity_id,
+is_active) and checks for an existing relationship by (relationship_type,
+source_entity, target_entity, is_active). Both run for every synced
+document, so each gets an index whose columns match the lookup exactly.
+"""
+
+import frappe
+
+
+def execute():
+	"""Add the graph sync lookup indexes."""
+
+	indexes = [
+		# _get_entity_for_doc and get_or_create: entity of a source document
+		(
+			"Compliance Graph Entity",
+			"idx_graph_entity_doc_active",
+			["entity_doctype", "entity_id", "is_active"],
+		),
+		# _create_relationship_if_not_exists: exact relationship lookup
+		(
+			"Compliance Graph Relationship",
+			"idx_graph_rel_type_source_target_active",
+			["relationship_type", "source_entity", "target_entity", "is_active"],
+		),
+	]
+
+	for doctype, index_name, columns in indexes:
+		table = f"tab{doctype}"
+		try:
+			# Validate table exists using Frappe's safe method (takes the DocType name)
+			if not frappe.db.table_exists(doctype):
+				frappe.logger().info(f"Table {table} does not exist, skipping index creation")
+				continue
+
+			if not _index_exists(table, index_name):
+				# Use Frappe's safe db.add_index method instead of raw SQL
+				frappe.db.add_index(doctype, columns, index_name)
+				frappe.db.commit()
+				frappe.logger().info(f"Created index {index_name} on {table}({', '.join(columns)})")
+
+		except Exception as e:
+			# Log but don't fail - index might already exist or column might not exist
+			frappe.log_error(
+				message=f"Failed to create index {index_name} on {table}: {str(e)}\n{frappe.get_traceback()}",
+				title="Performance Index Creation Error",
+			)
+
+
+def _index_exists(table, index_name):
+	"""Check if an index exists using a parameterized query."""
+	return bool(
+		frappe.db.sql(
+			"""
+			SELECT DISTINCT INDEX_NAME
+			FROM INFORMATION_SCHEMA.STATISTICS
+			WHERE TABLE_SCHEMA = DATABASE()
+			AND TABLE_NAME = %s
+			AND INDEX_NAME = %s
+		""",
+			(table, index_name),
+		)
+	)
@@ -0,0 +1,51 @@
+# Copyright (c) 2025, Noreli North
+# For license information, please see license.txt
+
+"""
+Patch to add the target-side active index used by relationship counts and traversal.
+"""
+
+import frappe
+
+
+def execute():
+	"""Add (target_entity, is_active) index to the graph relationship table."""
+
+	indexes = [
+		# Incoming lookups: active relationships pointing at an entity
+		("Compliance Graph Relationship", "idx_graph_rel_target_active", ["target_entity", "is_active"]),
+	]
+
+	for doctype, index_name, columns in indexes:
+		table = f"tab{doctype}"
+		try:
+			# Validate table exists using Frappe's safe method (takes the DocType name)
+			if not frappe.db.table_exists(doctype):
+				frappe.logger().info(f"Table {table} does not exist, skipping index creation")
+				continue
+
+			# Check if index already exists using parameterized query
+			existing_indexes = frappe.db.sql(
+				"""
+				SELECT DISTINCT INDEX_NAME
+				FROM INFORMATION_SCHEMA.STATISTICS
+				WHERE TABLE_SCHEMA = DATABASE()
+				AND TABLE_NAME = %s
+				AND INDEX_NAME = %s
+			""",
+				(table, index_name),
+				as_dict=True,
+			)
+
+			if not existing_indexes:
+				# Use Frappe's safe db.add_index method instead of raw SQL
+				frappe.db.add_index(doctype, columns, index_name)
+				frappe.db.commit()
+				frappe.logger().info(f"Created index {index_name} on {table}({', '.join(columns)})")
+
+		except Exception as e:
+			# Log but don't fail - index might already exist or column might not exist
+			frappe.log_error(
+				message=f"Failed to create index {index_name} on {table}: {str(e)}\n{frappe.get_traceback()}",
+				title="Performance Index Creation Error",
+			)
@@ -0,0 +1,74 @@
+# Copyright (c) 2025, Noreli North
+# For license information, please see license.txt
+
+"""
+Patch to add composite indexes for the regulatory feed queries.
+
+The regulatory dashboard and deadline checks filter Regulatory Update by
+status and effective_date, the feed status page counts updates per
+source, and pending actions filter assessments by assignee and status
+before ordering by priority and due date. original_url is already
+unique, so the sync existence check needs no new index.
+"""
+
+import frappe
+
+
+def execute():
+	"""Add the regulatory feed query indexes."""
+
+	indexes = [
+		# Dashboard counts and upcoming deadlines
+		("Regulatory Update", "idx_regupdate_status_effective", ["status", "effective_date"]),
+		# get_feed_status: updates per feed source
+		("Regulatory Update", "idx_regupdate_source", ["source"]),
+		# get_pending_actions: assignee's open assessments
+		(
+			"Regulatory Impact Assessment",
+			"idx_regimpact_assigned_status",
+			["assigned_to", "status", "priority", "due_date"],
+		),
+		# ImpactMapper: existing assessment per change and control
+		(
+			"Regulatory Impact Assessment",
+			"idx_regimpact_change_control",
+			["regulatory_change", "control_activity"],
+		),
+	]
+
+	for doctype, index_name, columns in indexes:
+		table = f"tab{doctype}"
+		try:
+			# Validate table exists using Frappe's safe method (takes the DocType name)
+			if not frappe.db.table_exists(doctype):
+				frappe.logger().info(f"Table {table} does not exist, skipping index creation")
+				continue
+
+			if not _index_exists(table, index_name):
+				# Use Frappe's safe db.add_index method instead of raw SQL
+				frappe.db.add_index(doctype, columns, index_name)
+				frappe.db.commit()
+				frappe.logger().info(f"Created index {index_name} on {table}({', '.join(columns)})")
+
+		except Exception as e:
+			# Log but don't fail - index might already exist or column might not exist
+			frappe.log_error(
+				message=f"Failed to create index {index_name} on {table}: {str(e)}\n{frappe.get_traceback()}",
+				title="Performance Index Creation Error",
+			)
+
+
+def _index_exists(table, index_name):
+	"""Check if an index exists using a parameterized query."""
+	return bool(
+		frappe.db.sql(
+			"""
+			SELECT DISTINCT INDEX_NAME
+			FROM INFORMATION_SCHEMA.STATISTICS
+			WHERE TABLE_SCHEMA = DATABASE()
+			AND TABLE_NAME = %s
+			AND INDEX_NAME = %s
+		""",
+			(table, index_name),
+		)
+	)